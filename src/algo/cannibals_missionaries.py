@@ -17,17 +17,15 @@ Goal:
 - Move all 3 missionaries and 3 cannibals safely to the other side
   of the river without violating the rules above.
 """
-import copy
-
-from typing import NamedTuple, List, Tuple
+from typing import NamedTuple, List, Optional, Set, Tuple
 from enum import Enum
 from dataclasses import dataclass
 class BoatSide(Enum):
     LEFT = 0
     RIGHT = 1
 
-@dataclass
-class Side:
+# immutable, a move builds new sides instead of deep copying the old ones
+class Side(NamedTuple):
     missionaries:int
     cannibals:int
 
@@ -38,30 +36,26 @@ class State:
     boat_side: BoatSide
 
 def move(l: Side, r: Side, cannibals: int, missionary: int, side: BoatSide, path: List[Tuple[Side, Side, BoatSide]]) -> Tuple[Side, Side, BoatSide]:
-    lcone = copy.deepcopy(l)
-    rclone = copy.deepcopy(r)
-
     # keep math single set, and generic. Easier to add more properties
     # sicne we likely won't add new sides. but that can be changed
     if side == BoatSide.LEFT:
-        source  = lcone
-        destination = rclone
-        side = BoatSide.RIGHT
+        source  = l
+        destination = r
     else:
-        source = rclone
-        destination = lcone
-        side = BoatSide.LEFT
+        source = r
+        destination = l
 
     move_canbibals = min(cannibals, source.cannibals)
-    source.cannibals -= move_canbibals
-    destination.cannibals += move_canbibals
-
     move_missionaries = min(missionary, source.missionaries)
-    source.missionaries -= move_missionaries
-    destination.missionaries += move_missionaries
+    source = Side(missionaries=source.missionaries - move_missionaries,
+                  cannibals=source.cannibals - move_canbibals)
+    destination = Side(missionaries=destination.missionaries + move_missionaries,
+                       cannibals=destination.cannibals + move_canbibals)
 
     # convert back to left and right for easy checking since the state is based on left and right
-    return lcone, rclone, side
+    if side == BoatSide.LEFT:
+        return source, destination, BoatSide.RIGHT
+    return destination, source, BoatSide.LEFT
 
 
 def check_move(l: Side, r: Side, side: BoatSide, path: List[Tuple[Side, Side, BoatSide]]) -> bool:
@@ -74,17 +68,24 @@ def check_move(l: Side, r: Side, side: BoatSide, path: List[Tuple[Side, Side, Bo
     return False
 
 
-def solve(l: Side, r: Side, path: List[Tuple[Side, Side, BoatSide]], side: BoatSide):
-    left_solve = copy.deepcopy(l)
-    right_solve = copy.deepcopy(r)
-    current = copy.deepcopy((left_solve, right_solve, side))
-    side_solve = copy.deepcopy(side)
+def solve(l: Side, r: Side, path: List[Tuple[Side, Side, BoatSide]], side: BoatSide,
+          seen: Optional[Set[Tuple[Side, Side, BoatSide]]] = None):
+    # sides are immutable so nothing needs copying
+    left_solve = l
+    right_solve = r
+    current = (left_solve, right_solve, side)
+    side_solve = side
+
+    # same states as path, as a set so the check below isn't a scan of the list
+    if seen is None:
+        seen = set(path)
 
     #check path to see if we visited this already
-    if current in path:
+    if current in seen:
         return False
 
     path.append(current)
+    seen.add(current)
 
     # on either side cannibals can't be great than missionaries.
     if  (left_solve.cannibals > left_solve.missionaries > 0) or (right_solve.cannibals > right_solve.missionaries > 0):
@@ -95,31 +96,31 @@ def solve(l: Side, r: Side, path: List[Tuple[Side, Side, BoatSide]], side: BoatS
     if check_move(left_after, right_after, next_side, path):
         print("Found result") # todo i can return here if i don't want to see all results
 
-    solve(left_after, right_after, path, next_side)
+    solve(left_after, right_after, path, next_side, seen)
 
     left_after, right_after, next_side = move(left_solve, right_solve, 2, 0, side_solve, path)
     if check_move(left_after, right_after, next_side, path):
         print("Found result") # todo i can return here if i don't want to see all results
 
-    solve(left_after, right_after, path, next_side)
+    solve(left_after, right_after, path, next_side, seen)
 
     left_after, right_after, next_side = move(left_solve, right_solve, 0, 2, side_solve, path)
     if check_move(left_after, right_after, next_side, path):
         print("Found result") # todo i can return here if i don't want to see all results
 
-    solve(left_after, right_after, path, next_side)
+    solve(left_after, right_after, path, next_side, seen)
 
     left_after, right_after, next_side = move(left_solve, right_solve, 1, 0, side_solve, path)
     if check_move(left_after, right_after, next_side, path):
         print("Found result") # todo i can return here if i don't want to see all results
 
-    solve(left_after, right_after, path, next_side)
+    solve(left_after, right_after, path, next_side, seen)
 
     left_after, right_after, next_side = move(left_solve, right_solve, 0, 1, side_solve, path)
     if check_move(left_after, right_after, next_side, path):
         print("Found result") # todo i can return here if i don't want to see all results
 
-    solve(left_after, right_after, path, next_side)
+    solve(left_after, right_after, path, next_side, seen)
 
     return False
 
@@ -16,127 +16,132 @@ Goal:
 - Move all 3 missionaries and 3 cannibals safely to the other side
   of the river without violating the rules above.
 """
-from dataclasses import dataclass
 from enum import Enum
-from typing import List, Tuple, Optional, NamedTuple
-
-from libs.decorator import pass_by_value
+from typing import Iterator, List, Set, Tuple, Optional, NamedTuple
 
 max_capacity: int = 2
 min_capacity: int = 1
 
+# debug output for every rejected move. set to False when timing, the
+# solutions are still printed.
+TRACE = True
+
 class BoatSide(Enum):
     LEFT = "left"
     RIGHT = "right"
 
-class Side:
+# states are immutable, a move builds new ones instead of deep copying the
+# old ones, and everything that didn't change is shared.
+class Side(NamedTuple):
     cannibals: int
     missionaries: int
-    def __init__(self, cannibals: int, missionaries: int):
-        self.cannibals = cannibals
-        self.missionaries = missionaries
 
-class GameState:
+Step = Tuple[Side, Side, BoatSide]
+
+# one step of the current branch linked back to the step before it, so
+# extending the path is O(1) and sibling branches share their prefix.
+class PathNode(NamedTuple):
+    step: Step
+    parent: Optional["PathNode"]
+
+def iter_path(node: Optional[PathNode]) -> Iterator[Step]:
+    # newest step first
+    while node is not None:
+        yield node.step
+        node = node.parent
+
+class GameState(NamedTuple):
     left: Side
     right: Side
     boat_side: BoatSide
     total_cannibals: int
     total_missionaries: int
-    path = List[Tuple[Side, Side, BoatSide]]
-    has_more = True
-    def __init__(self, left: Side, right: Side, boat_side: BoatSide, total_cannibals: int, total_missionaries: int):
-        self.left = left
-        self.right = right
-        self.boat_side = boat_side
-        self.total_cannibals = total_cannibals
-        self.total_missionaries = total_missionaries
-        self.path = []
-
-class BoatContents:
+    path_node: Optional[PathNode] = None
+    has_more: bool = True
+
+    @property
+    def path(self) -> List[Step]:
+        # only built when printing a solution
+        path = list(iter_path(self.path_node))
+        path.reverse()
+        return path
+
+class BoatContents(NamedTuple):
     cannibals: int
     missionaries: int
-    def __init__(self, cannibals: int, missionaries: int):
-        self.cannibals = cannibals
-        self.missionaries = missionaries
 
-@pass_by_value
-def move(state: GameState,  boatContents: BoatContents) -> GameState:
+def move(state: GameState,  boatContents: BoatContents, on_path: Optional[Set[Step]] = None) -> GameState:
 
     # make generic concepts of source and destination for move.
     if state.boat_side == BoatSide.RIGHT:
-        state.boat_side = BoatSide.LEFT #boat needs to move boat directions each way it takes boat contents.
-        state.has_more = calculate_edges(state.right, state.left, state, boatContents) # todo remove variables, debugging
+        boat_side = BoatSide.LEFT #boat needs to move boat directions each way it takes boat contents.
+        right, left, has_more = calculate_edges(state.right, state.left, state, boatContents)
     else: #left
-        state.boat_side = BoatSide.RIGHT #boat needs to move boat directions each way it takes boat contents.
-        state.has_more = calculate_edges(state.left, state.right, state, boatContents) # todo remove variables, debugging
-
-
-
-    current = StateSnapshot(state.left.cannibals, state.left.missionaries, state.right.cannibals,
-                            state.right.missionaries, state.boat_side)
-
-    path_flattened = [StateSnapshot(l.cannibals,
-                                    l.missionaries,
-                                    r.cannibals,
-                                    r.missionaries,
-                                    b)
-                      for l, r, b in state.path]
-
-    # we visited this
-    if current in path_flattened:
-        print("avoiding cycle")
-        state.has_more = False
-
-    state.path.append((state.left, state.right, state.boat_side))
-    return state
+        boat_side = BoatSide.RIGHT #boat needs to move boat directions each way it takes boat contents.
+        left, right, has_more = calculate_edges(state.left, state.right, state, boatContents)
+
+    # steps are tuples of NamedTuples so they compare by value directly
+    current = (left, right, boat_side)
+
+    # we visited this. on_path holds the same steps as state.path_node when
+    # solve passes it, otherwise walk the chain
+    visited = current in on_path if on_path is not None else current in iter_path(state.path_node)
+    if visited:
+        if TRACE:
+            print("avoiding cycle")
+        has_more = False
+
+    return state._replace(left=left, right=right, boat_side=boat_side, has_more=has_more,
+                          path_node=PathNode(current, state.path_node))
  
-# pass by reference, returns should continue.
+# returns the new source and destination, and whether this branch should continue.
 def calculate_edges(source: Side,
                     destination: Side,
                     state: GameState,
-                    boat_contents: BoatContents, ) -> bool:
-    state.has_more = True
+                    boat_contents: BoatContents, ) -> Tuple[Side, Side, bool]:
 
     # this case is a dead end for this sub tree.
     if source.cannibals < boat_contents.cannibals:
-        state.has_more = False
-        print(f"INVALID MOVE - Not enough cannibals on source:")
-        print(f"  Trying to move: {boat_contents.cannibals} cannibals")
-        print(f"  Available on source: {source.cannibals} cannibals")
-        print(f"  Shortfall: {boat_contents.cannibals - source.cannibals}")
-        return False
+        if TRACE:
+            print(f"INVALID MOVE - Not enough cannibals on source:")
+            print(f"  Trying to move: {boat_contents.cannibals} cannibals")
+            print(f"  Available on source: {source.cannibals} cannibals")
+            print(f"  Shortfall: {boat_contents.cannibals - source.cannibals}")
+        return source, destination, False
 
     # this case is a dead end for this sub tree.
     if source.missionaries < boat_contents.missionaries:
-        state.has_more = False
-        print(f"INVALID MOVE - Not enough missionaries on source:")
-        print(f"  Trying to move: {boat_contents.missionaries} missionaries")
-        print(f"  Available on source: {source.missionaries} missionaries")
-        print(f"  Shortfall: {boat_contents.missionaries - source.missionaries}")
-        return False
-
-    source.cannibals -= boat_contents.cannibals
-    destination.cannibals += boat_contents.cannibals
-    source.missionaries -= boat_contents.missionaries
-    destination.missionaries += boat_contents.missionaries
+        if TRACE:
+            print(f"INVALID MOVE - Not enough missionaries on source:")
+            print(f"  Trying to move: {boat_contents.missionaries} missionaries")
+            print(f"  Available on source: {source.missionaries} missionaries")
+            print(f"  Shortfall: {boat_contents.missionaries - source.missionaries}")
+        return source, destination, False
+
+    has_more = True
+    source = Side(source.cannibals - boat_contents.cannibals,
+                  source.missionaries - boat_contents.missionaries)
+    destination = Side(destination.cannibals + boat_contents.cannibals,
+                       destination.missionaries + boat_contents.missionaries)
 
     # the cannibals out number missionaries
     if ((source.missionaries > 0 and source.cannibals > source.missionaries) or
             (destination.missionaries > 0 and destination.cannibals > destination.missionaries)):
-        state.has_more = False
-        print(f"Win condition check:")
-        print(f"  source.cannibals == 0: {source.cannibals == 0} (actual: {source.cannibals})")
-        print(f"  destination.cannibals == 0: {destination.cannibals == 0} (actual: {destination.cannibals})")
-        print(
-            f"  destination.missionaries == total: {destination.missionaries == state.total_missionaries} (actual: {destination.missionaries}, expected: {state.total_missionaries})")
-        print(
-            f"  destination.cannibals == total: {destination.cannibals == state.total_cannibals} (actual: {destination.cannibals}, expected: {state.total_cannibals})")
+        has_more = False
+        if TRACE:
+            print(f"Win condition check:")
+            print(f"  source.cannibals == 0: {source.cannibals == 0} (actual: {source.cannibals})")
+            print(f"  destination.cannibals == 0: {destination.cannibals == 0} (actual: {destination.cannibals})")
+            print(
+                f"  destination.missionaries == total: {destination.missionaries == state.total_missionaries} (actual: {destination.missionaries}, expected: {state.total_missionaries})")
+            print(
+                f"  destination.cannibals == total: {destination.cannibals == state.total_cannibals} (actual: {destination.cannibals}, expected: {state.total_cannibals})")
 
     # everyone is moved. we got there w/o violating the above invalid cases.
     if (source.cannibals == 0 and source.missionaries == 0
             and destination.missionaries == state.total_missionaries
             and destination.cannibals == state.total_cannibals):
-        state.has_more = False
+        has_more = False
         print(state.path)
         print("🎉" * 50)
         print("🏆 SOLUTION FOUND! 🏆")
@@ -151,39 +156,35 @@ def calculate_edges(source: Side,
         print("-" * 40)
         print("✅ PUZZLE SOLVED!")
         print()
-        return False
-    return True
+    return source, destination, has_more
 
 def generate_combinations() -> List[BoatContents]:
     boat_possibilities : List[BoatContents] = []
-    for c in range(0, max_capacity):
-        for m in range(0, max_capacity):
+    for c in range(0, max_capacity + 1):
+        for m in range(0, max_capacity + 1):
             if max_capacity >= c + m >= 1:
                 boat_possibilities.append(BoatContents(c, m))
     return boat_possibilities
 
-# i need something flatteded for cycle checking.
-@dataclass(frozen=True)
-class StateSnapshot:
-    left_cannibals: int
-    left_missionaries: int
-    right_cannibals: int
-    right_missionaries: int
-    boat_side: BoatSide
-
-def solve(state: GameState):
+def solve(state: GameState, on_path: Optional[Set[Step]] = None):
     # we need to move 1 or two at a time it's not possible to move zero
     # because who would be running the boat, unless the boat is a drone,
     # but that's not in the instructions above.
 
+    # steps of the current branch, pushed before going down and popped on
+    # the way back so the cycle check in move is a set lookup
+    if on_path is None:
+        on_path = set(iter_path(state.path_node))
+
     boatContents_list = generate_combinations()
     for combination in boatContents_list:
-        game_state = move(state, combination)
-        has_visited :bool = False
-
+        game_state = move(state, combination, on_path)
 
         if game_state.has_more:
-            solve(game_state)
+            step = game_state.path_node.step
+            on_path.add(step)
+            solve(game_state, on_path)
+            on_path.discard(step)
 
 if __name__ == "__main__":
     print("starting")
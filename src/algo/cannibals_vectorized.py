@@ -0,0 +1,122 @@
+"""
+Missionaries and Cannibals, N missionaries / M cannibals / k seat boat,
+solved with a layer-at-a-time BFS in NumPy.
+
+The whole frontier is an (n, 3) array of (left_m, left_c, boat) rows.
+Every boat load is broadcast against it in one go, the bank and safety
+rules are boolean masks, and visited/parent are flat arrays indexed by
+the packed state code. No Python object is built per state.
+"""
+import time
+from dataclasses import dataclass, field
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+
+LEFT = 0
+RIGHT = 1
+
+
+@dataclass
+class VectorizedResult:
+    # None when there is no solution
+    crossings: Optional[int]
+    states: List[Tuple[int, int, int]] = field(default_factory=list)
+    layer_sizes: List[int] = field(default_factory=list)
+
+    @property
+    def found(self) -> bool:
+        return self.crossings is not None
+
+    @property
+    def states_reached(self) -> int:
+        return sum(self.layer_sizes)
+
+
+def boat_loads(boat_capacity: int) -> np.ndarray:
+    """(L, 2) array of every (missionaries, cannibals) load with 1..k people."""
+    return np.array([(m, c)
+                     for m in range(boat_capacity + 1)
+                     for c in range(boat_capacity + 1 - m)
+                     if m + c >= 1], dtype=np.int64).reshape(-1, 2)
+
+
+def solve_vectorized(missionaries: int, cannibals: int, boat_capacity: int) -> VectorizedResult:
+    total_m, total_c = missionaries, cannibals
+    loads = boat_loads(boat_capacity)
+
+    def encode(m, c, boat):
+        return (m * (total_c + 1) + c) * 2 + boat
+
+    def decode(codes):
+        boat = codes & 1
+        mc = codes >> 1
+        return np.stack([mc // (total_c + 1), mc % (total_c + 1), boat], axis=1)
+
+    size = (total_m + 1) * (total_c + 1) * 2
+    visited = np.zeros(size, dtype=bool)
+    parent = np.full(size, -1, dtype=np.int64)
+
+    start = encode(total_m, total_c, LEFT)
+    goal = encode(0, 0, RIGHT)
+    visited[start] = True
+    frontier = np.array([[total_m, total_c, LEFT]], dtype=np.int64)
+    result = VectorizedResult(crossings=0 if start == goal else None, layer_sizes=[1])
+
+    depth = 0
+    while len(frontier) and not visited[goal]:
+        depth += 1
+        # boat on the left takes people away from the left bank, on the right it brings them back
+        sign = np.where(frontier[:, 2] == LEFT, -1, 1)[:, None, None]
+        moved = frontier[:, None, :2] + sign * loads[None, :, :]
+        m, c = moved[..., 0], moved[..., 1]
+        right_m, right_c = total_m - m, total_c - c
+
+        ok = (m >= 0) & (m <= total_m) & (c >= 0) & (c <= total_c)
+        ok &= (m == 0) | (m >= c)
+        ok &= (right_m == 0) | (right_m >= right_c)
+
+        next_boat = np.broadcast_to(1 - frontier[:, 2:3], m.shape)
+        parent_codes = np.broadcast_to(encode(frontier[:, 0:1], frontier[:, 1:2], frontier[:, 2:3]), m.shape)
+        codes = encode(m[ok], c[ok], next_boat[ok])
+        parent_codes = parent_codes[ok]
+
+        fresh = ~visited[codes]
+        codes, first = np.unique(codes[fresh], return_index=True)
+        parent_codes = parent_codes[fresh][first]
+
+        visited[codes] = True
+        parent[codes] = parent_codes
+        frontier = decode(codes)
+        result.layer_sizes.append(len(codes))
+
+    if visited[goal]:
+        result.crossings = depth
+        code = goal
+        while code != -1:
+            m, c, boat = decode(np.array([code]))[0]
+            result.states.append((int(m), int(c), int(boat)))
+            code = parent[code]
+        result.states.reverse()
+    return result
+
+
+def sweep(missionaries: Iterable[int], cannibals: Iterable[int], capacities: Iterable[int]):
+    """Yields (n, m, k, crossings or None) for every combination in the grid."""
+    cannibals = list(cannibals)
+    capacities = list(capacities)
+    for n in missionaries:
+        for m in cannibals:
+            for k in capacities:
+                yield n, m, k, solve_vectorized(n, m, k).crossings
+
+
+if __name__ == "__main__":
+    start = time.perf_counter()
+    rows = list(sweep(range(1, 31), range(1, 31), range(2, 5)))
+    elapsed = time.perf_counter() - start
+    solvable = sum(1 for *_, crossings in rows if crossings is not None)
+    print(f"swept {len(rows)} puzzles in {elapsed:.2f}s, {solvable} solvable")
+    for n, k in [(3, 2), (100, 6), (1000, 10)]:
+        result = solve_vectorized(n, n, k)
+        print(f"{n}/{n} boat {k}: {result.crossings} crossings, {result.states_reached} states reached")
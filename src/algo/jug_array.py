@@ -0,0 +1,128 @@
+"""
+Jug, but millions of them at once.
+
+JugArray keeps capacities and levels in two NumPy arrays and applies
+fill / empty / pour to everything selected by an index array or boolean
+mask in one go. Monte-Carlo runs of a pour policy become a few array ops
+per step for all runs together instead of a Python call per jug.
+
+Same semantics as Jug: pour moves min(source level, room in target).
+"""
+import time
+from typing import Optional
+
+import numpy as np
+
+
+class JugArray:
+    def __init__(self, capacities, levels=None):
+        self.capacities = np.array(capacities, dtype=np.int64)
+        if levels is None:
+            self.levels = np.zeros_like(self.capacities)
+        else:
+            self.levels = np.array(levels, dtype=np.int64)
+            if self.levels.shape != self.capacities.shape:
+                raise ValueError("levels and capacities need the same shape")
+            if ((self.levels < 0) | (self.levels > self.capacities)).any():
+                raise ValueError("levels must be between 0 and the capacity")
+
+    @classmethod
+    def of(cls, count: int, capacity: int) -> "JugArray":
+        """count empty jugs that all hold capacity."""
+        return cls(np.full(count, capacity, dtype=np.int64))
+
+    def __len__(self) -> int:
+        return len(self.capacities)
+
+    @property
+    def room(self) -> np.ndarray:
+        return self.capacities - self.levels
+
+    # where is anything NumPy can index with, an index array, a bool mask,
+    # or None for every jug
+    def fill(self, where=None):
+        where = slice(None) if where is None else where
+        self.levels[where] = self.capacities[where]
+
+    def empty(self, where=None):
+        where = slice(None) if where is None else where
+        self.levels[where] = 0
+
+    def pour_into(self, other: "JugArray", where=None) -> np.ndarray:
+        """
+        Jug i of self pours into jug i of other, for the selected i.
+        Returns how much moved per selected pair.
+        """
+        if other is self:
+            raise ValueError("use pour() to pour between jugs of the same array")
+        if len(other) != len(self):
+            raise ValueError("pour_into needs arrays of the same length")
+        where = slice(None) if where is None else where
+        amount = np.minimum(self.levels[where], other.capacities[where] - other.levels[where])
+        self.levels[where] -= amount
+        other.levels[where] += amount
+        return amount
+
+    def pour(self, sources, targets) -> np.ndarray:
+        """
+        Pours jug sources[i] into jug targets[i] of this array. Every jug may
+        appear at most once across both, pours that share a jug would have
+        to happen one after another.
+        """
+        sources = np.asarray(sources, dtype=np.int64)
+        targets = np.asarray(targets, dtype=np.int64)
+        touched = np.concatenate([sources, targets])
+        if len(np.unique(touched)) != len(touched):
+            raise ValueError("each jug can only be in one pour per call")
+        amount = np.minimum(self.levels[sources], self.room[targets])
+        self.levels[sources] -= amount
+        self.levels[targets] += amount
+        return amount
+
+    def holding(self, volume: int) -> np.ndarray:
+        return self.levels == volume
+
+
+# random policy moves, same order as WaterJugProblem's actions
+FILL_1, FILL_2, EMPTY_1, EMPTY_2, POUR_1_2, POUR_2_1 = range(6)
+
+
+def random_policy(cap1: int, cap2: int, goal: int, runs: int, max_steps: int,
+                  rng: Optional[np.random.Generator] = None) -> np.ndarray:
+    """
+    Plays runs independent games of the two jug puzzle where every step is
+    a uniformly random move. Returns the step each run first had goal in a
+    jug, -1 for runs that didn't within max_steps.
+    """
+    rng = rng or np.random.default_rng()
+    first, second = JugArray.of(runs, cap1), JugArray.of(runs, cap2)
+    hit_at = np.full(runs, -1, dtype=np.int64)
+    hit_at[first.holding(goal) | second.holding(goal)] = 0
+    active = np.flatnonzero(hit_at < 0)
+
+    for step in range(1, max_steps + 1):
+        if not len(active):
+            break
+        moves = rng.integers(0, 6, size=len(active))
+        first.fill(active[moves == FILL_1])
+        second.fill(active[moves == FILL_2])
+        first.empty(active[moves == EMPTY_1])
+        second.empty(active[moves == EMPTY_2])
+        first.pour_into(second, active[moves == POUR_1_2])
+        second.pour_into(first, active[moves == POUR_2_1])
+
+        done = first.levels[active] == goal
+        done |= second.levels[active] == goal
+        hit_at[active[done]] = step
+        active = active[~done]
+    return hit_at
+
+
+if __name__ == "__main__":
+    runs = 1_000_000
+    start = time.perf_counter()
+    hits = random_policy(3, 5, 4, runs, max_steps=100, rng=np.random.default_rng(0))
+    elapsed = time.perf_counter() - start
+    solved = hits[hits >= 0]
+    print(f"{runs} random games in {elapsed:.2f}s, {len(solved)} hit 4 litres, "
+          f"fastest {solved.min()} moves, median {int(np.median(solved))}")
@@ -1,9 +1,394 @@
-
 import copy
-def pass_by_value(func):
-    def wrapper(*args, **kwargs):
-        copied_args = copy.deepcopy(args)
-        copied_kwargs = copy.deepcopy(kwargs)
-        ## my_function = wrapper (the function object)
-        return func(*copied_args, **copied_kwargs)
-    return wrapper
+import functools
+import operator
+import sys
+from collections.abc import ItemsView, KeysView, ValuesView
+from dataclasses import dataclass
+from enum import Enum
+
+# pass_by_value strategies
+DEEPCOPY = "deepcopy"   # copy.deepcopy every argument, the original behaviour
+REGISTRY = "registry"   # per type copiers from register_copier, deepcopy for the rest
+COW = "cow"             # copy on write, only copy an argument the first time it's mutated
+FROZEN = "frozen"       # read only view, mutating an argument raises ReadOnlyError
+
+STRATEGIES = (DEEPCOPY, REGISTRY, COW, FROZEN)
+
+IMMUTABLE_TYPES = (int, float, complex, bool, str, bytes, frozenset, range, type(None), Enum)
+
+MUTATING_METHODS = frozenset([
+    "append", "extend", "insert", "pop", "remove", "clear", "sort", "reverse",
+    "update", "setdefault", "popitem", "add", "discard", "difference_update",
+    "intersection_update", "symmetric_difference_update",
+])
+
+# methods of the builtin containers that never change them. any other method
+# called through a cow/frozen proxy counts as a write, mark methods of your
+# own classes with @read_only to read them without a copy. what a read only
+# method returns is proxied too, it may hold the caller's nested objects
+READ_ONLY_METHODS = frozenset([
+    "copy", "count", "index", "get", "keys", "values", "items", "fromkeys",
+    "union", "intersection", "difference", "symmetric_difference",
+    "issubset", "issuperset", "isdisjoint",
+])
+
+
+class ReadOnlyError(TypeError):
+    pass
+
+
+@dataclass
+class CopyStats:
+    calls: int = 0
+    copies: int = 0
+    # only counted with pass_by_value(count_bytes=True), walking every copy
+    # costs more than making it
+    bytes_copied: int = 0
+    count_bytes: bool = False
+
+    def reset(self):
+        self.calls = self.copies = self.bytes_copied = 0
+
+
+def deep_sizeof(obj, seen=None) -> int:
+    # rough size of everything reachable from obj, shared objects counted once
+    if seen is None:
+        seen = set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, IMMUTABLE_TYPES):
+        return size
+    if isinstance(obj, dict):
+        size += sum(deep_sizeof(k, seen) + deep_sizeof(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set)):
+        size += sum(deep_sizeof(item, seen) for item in obj)
+    if hasattr(obj, "__dict__"):
+        size += deep_sizeof(vars(obj), seen)
+    for slot in getattr(type(obj), "__slots__", ()):
+        if hasattr(obj, slot):
+            size += deep_sizeof(getattr(obj, slot), seen)
+    return size
+
+
+def is_immutable(value) -> bool:
+    if isinstance(value, IMMUTABLE_TYPES):
+        return True
+    # tuples (and NamedTuples) are only immutable if everything in them is
+    return isinstance(value, tuple) and all(is_immutable(item) for item in value)
+
+
+# === registry strategy ===
+_copiers = {}
+
+
+def register_copier(cls, copier):
+    """
+    copier(value, memo) -> independent copy, used for exact type matches.
+    memo works like copy.deepcopy's, pass it on to fast_copy for anything
+    nested and put the copy in memo[id(value)] before recursing if value
+    can contain itself.
+    """
+    _copiers[cls] = copier
+
+
+def fast_copy(value, memo=None):
+    if is_immutable(value):
+        return value
+    if memo is None:
+        memo = {}
+    copied = memo.get(id(value))
+    if copied is not None:
+        return copied
+    copier = _copiers.get(type(value))
+    if copier is None:
+        return copy.deepcopy(value, memo)
+    copied = memo[id(value)] = copier(value, memo)
+    return copied
+
+
+def _copy_list(value, memo):
+    copied = memo[id(value)] = []
+    copied.extend(fast_copy(item, memo) for item in value)
+    return copied
+
+
+def _copy_dict(value, memo):
+    copied = memo[id(value)] = {}
+    for key, item in value.items():
+        copied[key] = fast_copy(item, memo)
+    return copied
+
+
+register_copier(list, _copy_list)
+register_copier(dict, _copy_dict)
+register_copier(set, lambda value, memo: set(value))
+
+
+# === copy on write / frozen proxies ===
+def read_only(method):
+    """Marks a method as safe to call through a cow/frozen proxy."""
+    method.__pass_by_value_read_only__ = True
+    return method
+
+
+def _is_read_only(name, method) -> bool:
+    return name in READ_ONLY_METHODS or getattr(method, "__pass_by_value_read_only__", False)
+
+
+def _inplace(op):
+    # x op= y on the proxy, putting the result back if op made a new object
+    def method(self, other):
+        self._before_write()
+        target = self._resolve()
+        result = op(target, _unwrap(other))
+        if result is not target:
+            self._replace(result)
+        return self
+    return method
+
+
+def _binary(op, reflected=False):
+    def method(self, other):
+        if reflected:
+            return op(_unwrap(other), self._resolve())
+        return op(self._resolve(), _unwrap(other))
+    return method
+
+
+class _Proxy:
+    """
+    Stands in for an argument. Reads go straight to the caller's object.
+    A write either copies the root argument first (cow) or raises (frozen).
+    Attributes and items read through the proxy come back as child proxies
+    so nested writes like state.left.cannibals -= 1 are caught too.
+    """
+    __slots__ = ("_target", "_parent", "_key", "_owned", "_frozen", "_stats")
+
+    def __init__(self, target, frozen, stats, parent=None, key=None):
+        object.__setattr__(self, "_target", target)
+        object.__setattr__(self, "_parent", parent)
+        object.__setattr__(self, "_key", key)
+        object.__setattr__(self, "_owned", False)
+        object.__setattr__(self, "_frozen", frozen)
+        object.__setattr__(self, "_stats", stats)
+
+    def _resolve(self):
+        parent = object.__getattribute__(self, "_parent")
+        if parent is None:
+            return object.__getattribute__(self, "_target")
+        kind, key = object.__getattribute__(self, "_key")
+        container = parent._resolve()
+        return getattr(container, key) if kind == "attr" else container[key]
+
+    def _before_write(self):
+        if object.__getattribute__(self, "_frozen"):
+            raise ReadOnlyError("argument passed by value is read only")
+        parent = object.__getattribute__(self, "_parent")
+        if parent is not None:
+            parent._before_write()
+        elif not object.__getattribute__(self, "_owned"):
+            target = copy.deepcopy(object.__getattribute__(self, "_target"))
+            stats = object.__getattribute__(self, "_stats")
+            stats.copies += 1
+            if stats.count_bytes:
+                stats.bytes_copied += deep_sizeof(target)
+            object.__setattr__(self, "_target", target)
+            object.__setattr__(self, "_owned", True)
+
+    def _replace(self, value):
+        # only called after _before_write, so the root is already ours
+        parent = object.__getattribute__(self, "_parent")
+        if parent is None:
+            object.__setattr__(self, "_target", value)
+            return
+        kind, key = object.__getattribute__(self, "_key")
+        container = parent._resolve()
+        if kind == "attr":
+            setattr(container, key, value)
+        else:
+            container[key] = value
+
+    def _wrap(self, value, key):
+        if is_immutable(value) or callable(value):
+            return value
+        return _Proxy(value, object.__getattribute__(self, "_frozen"),
+                      object.__getattribute__(self, "_stats"), parent=self, key=key)
+
+    def _detach(self, value):
+        # something read out of the argument with no path back to it, e.g.
+        # what values() or copy() returned. it becomes a proxy of its own, a
+        # write copies it (nested objects included) or raises
+        if is_immutable(value):
+            return value
+        if isinstance(value, (KeysView, ValuesView, ItemsView)):
+            # views can't be deep copied, they come back as lists
+            value = list(value)
+        return _proxy(value, object.__getattribute__(self, "_frozen"), object.__getattribute__(self, "_stats"))
+
+    def _get(self, key, default=None):
+        # dict.get, but the value comes back as a child like d[key] would
+        if key in self._resolve():
+            return self[key]
+        return default
+
+    def _read_only_call(self, name):
+        def call(*args, **kwargs):
+            args = tuple(_unwrap(arg) for arg in args)
+            kwargs = {key: _unwrap(value) for key, value in kwargs.items()}
+            return self._detach(getattr(self._resolve(), name)(*args, **kwargs))
+        return call
+
+    def __getattr__(self, name):
+        target = self._resolve()
+        value = getattr(target, name)
+        if name not in MUTATING_METHODS and getattr(value, "__self__", None) is not target:
+            return self._wrap(value, ("attr", name))
+        if name not in MUTATING_METHODS and _is_read_only(name, value):
+            if name == "get" and isinstance(target, dict):
+                return self._get
+            return self._read_only_call(name)
+        # a method bound to the caller's object could change it, copy (or
+        # refuse) first and hand out the method of the copy
+        self._before_write()
+        return getattr(self._resolve(), name)
+
+    def __setattr__(self, name, value):
+        self._before_write()
+        setattr(self._resolve(), name, _unwrap(value))
+
+    def __delattr__(self, name):
+        self._before_write()
+        delattr(self._resolve(), name)
+
+    def __getitem__(self, key):
+        return self._wrap(self._resolve()[key], ("item", key))
+
+    def __setitem__(self, key, value):
+        self._before_write()
+        self._resolve()[key] = _unwrap(value)
+
+    def __delitem__(self, key):
+        self._before_write()
+        del self._resolve()[key]
+
+    __iadd__ = _inplace(operator.iadd)
+    __isub__ = _inplace(operator.isub)
+    __imul__ = _inplace(operator.imul)
+    __ior__ = _inplace(operator.ior)
+    __iand__ = _inplace(operator.iand)
+    __ixor__ = _inplace(operator.ixor)
+
+    __add__ = _binary(operator.add)
+    __radd__ = _binary(operator.add, reflected=True)
+    __sub__ = _binary(operator.sub)
+    __rsub__ = _binary(operator.sub, reflected=True)
+    __mul__ = _binary(operator.mul)
+    __rmul__ = _binary(operator.mul, reflected=True)
+    __or__ = _binary(operator.or_)
+    __ror__ = _binary(operator.or_, reflected=True)
+    __and__ = _binary(operator.and_)
+    __rand__ = _binary(operator.and_, reflected=True)
+    __xor__ = _binary(operator.xor)
+    __rxor__ = _binary(operator.xor, reflected=True)
+    __lt__ = _binary(operator.lt)
+    __le__ = _binary(operator.le)
+    __gt__ = _binary(operator.gt)
+    __ge__ = _binary(operator.ge)
+
+    def __hash__(self):
+        return hash(self._resolve())
+
+    def __bool__(self):
+        return bool(self._resolve())
+
+    def __iter__(self):
+        target = self._resolve()
+        if isinstance(target, (list, tuple)):
+            return (self[i] for i in range(len(target)))
+        return (self._detach(item) for item in target)
+
+    def __len__(self):
+        return len(self._resolve())
+
+    def __contains__(self, item):
+        return item in self._resolve()
+
+    def __eq__(self, other):
+        if isinstance(other, _Proxy):
+            other = other._resolve()
+        return self._resolve() == other
+
+    def __repr__(self):
+        return repr(self._resolve())
+
+
+def _unwrap(value):
+    return value._resolve() if isinstance(value, _Proxy) else value
+
+
+def _proxy(value, frozen, stats):
+    if is_immutable(value):
+        return value
+    return _Proxy(value, frozen, stats)
+
+
+def pass_by_value(func=None, *, strategy=DEEPCOPY, count_bytes=False):
+    """
+    Call func with copies of its arguments so it can't change the caller's.
+    Use as @pass_by_value or @pass_by_value(strategy=COW). The wrapper has a
+    copy_stats attribute counting calls and copies made, and with
+    count_bytes=True also the bytes copied.
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(f"unknown pass_by_value strategy {strategy!r}, expected one of {STRATEGIES}")
+
+    def decorate(func):
+        stats = CopyStats(count_bytes=count_bytes)
+
+        if strategy in (COW, FROZEN):
+            frozen = strategy == FROZEN
+
+            def convert(value):
+                return _proxy(value, frozen, stats)
+        elif strategy == REGISTRY:
+            def convert(value, memo):
+                if is_immutable(value):
+                    return value
+                copied = fast_copy(value, memo)
+                stats.copies += 1
+                if count_bytes:
+                    stats.bytes_copied += deep_sizeof(copied)
+                return copied
+        else:
+            def convert(value, memo):
+                if is_immutable(value):
+                    return value
+                copied = copy.deepcopy(value, memo)
+                stats.copies += 1
+                if count_bytes:
+                    stats.bytes_copied += deep_sizeof(copied)
+                return copied
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            stats.calls += 1
+            if strategy in (DEEPCOPY, REGISTRY):
+                # one memo per call so arguments that alias each other still
+                # alias each other afterwards, like deepcopy(args) did, and
+                # nothing from this call is kept alive after it
+                call_convert = functools.partial(convert, memo={})
+            else:
+                call_convert = convert
+            copied_args = tuple(call_convert(arg) for arg in args)
+            copied_kwargs = {key: call_convert(value) for key, value in kwargs.items()}
+            ## my_function = wrapper (the function object)
+            return func(*copied_args, **copied_kwargs)
+
+        wrapper.copy_stats = stats
+        return wrapper
+
+    if func is None:
+        return decorate
+    return decorate(func)
@@ -0,0 +1,114 @@
+"""
+Missionaries and Cannibals as a SearchProblem
+---------------------------------------------
+
+Same rules as cannibals_missionaries.py but with any number of
+missionaries, cannibals and boat seats. A state is the tuple
+(left_missionaries, left_cannibals, boat) where boat is LEFT or RIGHT,
+the right bank is whatever isn't on the left.
+"""
+from src.core.search import astar, bfs, bidirectional_bfs, greedy_best_first
+from src.core.search_problem import SearchProblem
+from src.core.state_codec import CannibalsCodec
+
+LEFT = 0
+RIGHT = 1
+
+
+class MissionariesCannibalsProblem(SearchProblem):
+    def __init__(self, missionaries=3, cannibals=3, boat_capacity=2):
+        self.missionaries = missionaries
+        self.cannibals = cannibals
+        self.boat_capacity = boat_capacity
+        # every (m, c) boat load with 1..capacity people in it
+        self.loads = [(m, c)
+                      for m in range(boat_capacity + 1)
+                      for c in range(boat_capacity + 1 - m)
+                      if m + c >= 1]
+
+    def initial_state(self):
+        return self.missionaries, self.cannibals, LEFT
+
+    def is_goal(self, state):
+        return state == (0, 0, RIGHT)
+
+    def hashable_state(self, state):
+        return state
+
+    # packs (m, c, boat) into one int for packed_bfs
+    def codec(self):
+        return CannibalsCodec(self.missionaries, self.cannibals)
+
+    def is_safe(self, m, c):
+        # a bank is fine if there are no missionaries or they aren't outnumbered
+        return m == 0 or m >= c
+
+    def banks_safe(self, state):
+        left_m, left_c, _ = state
+        return (self.is_safe(left_m, left_c)
+                and self.is_safe(self.missionaries - left_m, self.cannibals - left_c))
+
+    def _crossings(self, state):
+        # every load the boat could take from here, safe or not
+        left_m, left_c, boat = state
+        for m, c in self.loads:
+            if boat == LEFT:
+                new_m, new_c = left_m - m, left_c - c
+            else:
+                new_m, new_c = left_m + m, left_c + c
+            if 0 <= new_m <= self.missionaries and 0 <= new_c <= self.cannibals:
+                yield (new_m, new_c, 1 - boat), (m, c)
+
+    def successors(self, state):
+        return [(new_state, load) for new_state, load in self._crossings(state)
+                if self.banks_safe(new_state)]
+
+    def goal_states(self):
+        # with more cannibals than missionaries the goal bank is never safe
+        # and nothing can reach it
+        goal = (0, 0, RIGHT)
+        return [goal] if self.banks_safe(goal) else []
+
+    def predecessors(self, state):
+        # rowing the same load back undoes a crossing, but that's only a real
+        # move if the state we came from was safe (the start may not be)
+        return [(prev, load) for prev, load in self._crossings(state)
+                if (state, load) in self.successors(prev)]
+
+    # swapping the banks and the boat side turns the start into the goal and
+    # every crossing into the same crossing made backwards
+    def mirror_state(self, state):
+        left_m, left_c, boat = state
+        return self.missionaries - left_m, self.cannibals - left_c, 1 - boat
+
+    def heuristic(self, state):
+        # lower bound on crossings. every trip over carries at most k people
+        # and every trip back brings at least one home, so a round trip
+        # moves at most k - 1 people net.
+        left_m, left_c, boat = state
+        people = left_m + left_c
+        if people == 0:
+            return 0
+        k = self.boat_capacity
+        if boat == RIGHT:
+            # someone has to row back first
+            people += 1
+        if k == 1:
+            return 1 if boat == LEFT else 2
+        round_trips = -(-max(people - k, 0) // (k - 1))
+        return 2 * round_trips + 1 + (1 if boat == RIGHT else 0)
+
+
+if __name__ == "__main__":
+    for n, k in [(3, 2), (20, 4), (100, 6)]:
+        problem = MissionariesCannibalsProblem(n, n, k)
+        plain = bfs(problem)
+        informed = astar(problem)
+        greedy = greedy_best_first(problem)
+        print(f"{n}/{n} boat {k}: {informed.depth} crossings, expanded "
+              f"bfs {plain.nodes_expanded}, a* {informed.nodes_expanded}, "
+              f"greedy {greedy.nodes_expanded} ({greedy.depth} crossings)")
+        both = bidirectional_bfs(problem)
+        print(f"  bidirectional expanded {both.forward_expanded} forward / "
+              f"{both.backward_expanded} backward, frontier peaks "
+              f"{both.forward_frontier_peak} / {both.backward_frontier_peak}")
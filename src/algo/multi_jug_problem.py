@@ -0,0 +1,98 @@
+"""
+Water jugs with any number of jugs.
+
+States are a single packed int (see PrepackedCodec), one bit field per
+jug, so a move is an add or subtract of `amount << shift` on that int
+rather than building a new tuple. Works with every generic solver, and
+codec() makes it usable with packed_bfs, external_bfs and compile_graph
+as is. Use levels() to turn a state back into a tuple of jug levels.
+"""
+from typing import Optional, Sequence, Tuple
+
+from src.core.search import SearchResult, bfs
+from src.core.search_problem import SearchProblem
+from src.core.state_codec import PrepackedCodec
+
+
+class MultiJugProblem(SearchProblem):
+    def __init__(self, capacities: Sequence[int], goal: Optional[int]):
+        if not capacities:
+            raise ValueError("need at least one jug")
+        self.capacities = tuple(capacities)
+        self.goal = goal
+        self._codec = PrepackedCodec(self.capacities)
+        self._shifts = tuple(self._codec.shifts)
+        self._masks = tuple(self._codec.masks)
+        count = len(self.capacities)
+        # everything per move that doesn't depend on the state, worked out once
+        self._jugs = tuple(zip(range(count), self.capacities, self._shifts,
+                               (f"fill {i + 1}" for i in range(count)),
+                               (f"empty {i + 1}" for i in range(count))))
+        self._pours = tuple(tuple((j, self._shifts[j], f"pour {i + 1}->{j + 1}")
+                                  for j in range(count) if j != i)
+                            for i in range(count))
+        # jugs of the same size are interchangeable, see canonical_state
+        groups = {}
+        for i, cap in enumerate(self.capacities):
+            groups.setdefault(cap, []).append(i)
+        self._swappable = [group for group in groups.values() if len(group) > 1]
+
+    def codec(self) -> PrepackedCodec:
+        return self._codec
+
+    def levels(self, state: int) -> Tuple[int, ...]:
+        return self._codec.unpack(state)
+
+    def state_of(self, levels: Sequence[int]) -> int:
+        return self._codec.pack(levels)
+
+    def initial_state(self):
+        return 0
+
+    def is_goal(self, state):
+        goal = self.goal
+        for shift, mask in zip(self._shifts, self._masks):
+            if (state >> shift) & mask == goal:
+                return True
+        return False
+
+    def heuristic(self, state):
+        return 0 if self.is_goal(state) else 1
+
+    def hashable_state(self, state):
+        return state
+
+    def canonical_state(self, state):
+        if not self._swappable:
+            return state
+        levels = list(self.levels(state))
+        for group in self._swappable:
+            for i, level in zip(group, sorted(levels[i] for i in group)):
+                levels[i] = level
+        return self.state_of(levels)
+
+    def successors(self, state):
+        levels = [(state >> shift) & mask for shift, mask in zip(self._shifts, self._masks)]
+        caps = self.capacities
+        result = []
+        for i, cap, shift, fill, empty in self._jugs:
+            level = levels[i]
+            if level != cap:
+                result.append((state + ((cap - level) << shift), fill))
+            if not level:
+                continue
+            result.append((state - (level << shift), empty))
+            for j, to_shift, pour in self._pours[i]:
+                room = caps[j] - levels[j]
+                if room:
+                    amount = level if level < room else room
+                    result.append((state - (amount << shift) + (amount << to_shift), pour))
+        return result
+
+
+def solve_multi_jug(capacities: Sequence[int], goal: int, solver=bfs) -> SearchResult:
+    """Runs solver on the N-jug puzzle and hands back states as tuples of levels."""
+    problem = MultiJugProblem(capacities, goal)
+    result = solver(problem)
+    result.states = [problem.levels(state) for state in result.states]
+    return result
@@ -0,0 +1,184 @@
+"""
+Batch water jug solver.
+
+Reads (cap1, cap2, goal) instances as CSV or JSONL, groups the ones with
+the same capacities so they share one ReachabilityTable, fans the groups
+out over a process pool and streams one JSON line per instance as groups
+finish. A row that can't be read or solved gets an {"id", "error"}
+line instead, the rest of the batch carries on.
+
+    python -m src.main batch < instances.csv > answers.jsonl
+    python -m src.algo.water_jug_batch --ordered --workers 8 < instances.jsonl
+"""
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from src.algo.water_jug_tables import ReachabilityTable, SwappedTable
+
+# (index in the input, the input record, cap1, cap2, goal). a row that
+# couldn't be read has None for all three numbers and its error answer as
+# the record
+Instance = Tuple[int, dict, Optional[int], Optional[int], Optional[int]]
+
+
+def error_answer(index: int, record, error: Exception) -> dict:
+    record = record if isinstance(record, dict) else {}
+    return {"id": record.get("id", index), "error": f"{type(error).__name__}: {error}"}
+
+
+def _instance(index: int, record) -> Instance:
+    try:
+        cap1, cap2, goal = int(record["cap1"]), int(record["cap2"]), int(record["goal"])
+        if cap1 < 0 or cap2 < 0:
+            raise ValueError(f"capacities can't be negative, got {cap1} and {cap2}")
+    except (KeyError, TypeError, ValueError) as e:
+        return index, error_answer(index, record, e), None, None, None
+    return index, record, cap1, cap2, goal
+
+
+def read_instances(stream: Iterable[str]) -> Iterator[Instance]:
+    """
+    JSONL lines need cap1, cap2 and goal keys. CSV rows are either
+    cap1,cap2,goal or have a header naming those columns. Bad rows are
+    yielded too, as error instances, so their answer keeps its place.
+    """
+    lines = iter(stream)
+    first = next((line for line in lines if line.strip()), None)
+    if first is None:
+        return
+    if first.lstrip().startswith("{"):
+        index = 0
+        for line in _chain(first, lines):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                yield index, error_answer(index, None, e), None, None, None
+            else:
+                yield _instance(index, record)
+            index += 1
+        return
+
+    reader = csv.reader(_chain(first, lines))
+    header = next(reader)
+    if all(cell.strip().lstrip("-").isdigit() for cell in header):
+        columns = ["cap1", "cap2", "goal"]
+        rows = _chain(header, reader)
+    else:
+        columns = [cell.strip() for cell in header]
+        rows = reader
+    index = 0
+    for row in rows:
+        if not row:
+            continue
+        yield _instance(index, dict(zip(columns, (cell.strip() for cell in row))))
+        index += 1
+
+
+def _chain(first, rest):
+    yield first
+    yield from rest
+
+
+def solve_group(cap1: int, cap2: int, instances: List[Instance]) -> List[Tuple[int, dict]]:
+    """
+    Answers every instance for one capacity pair from a single table.
+    (a, b) and (b, a) instances share it, the swapped ones get mirrored answers.
+    """
+    try:
+        table = ReachabilityTable.build(cap1, cap2)
+    except Exception as e:
+        return [(index, error_answer(index, record, e)) for index, record, *_ in instances]
+    swapped = SwappedTable(table)
+    answers = []
+    for index, record, instance_cap1, instance_cap2, goal in instances:
+        try:
+            result = (table if instance_cap1 == cap1 else swapped).solve(goal)
+        except Exception as e:
+            answers.append((index, error_answer(index, record, e)))
+            continue
+        answer = dict(record)
+        answer.update(cap1=instance_cap1, cap2=instance_cap2, goal=goal, solvable=result.found,
+                      moves=result.depth if result.found else None,
+                      states=[list(state) for state in result.states],
+                      actions=result.actions)
+        answers.append((index, answer))
+    return answers
+
+
+def group_instances(instances: Iterable[Instance]
+                    ) -> Tuple[Dict[Tuple[int, int], List[Instance]], List[Tuple[int, dict]]]:
+    """
+    (groups, errors). Groups are keyed by (smaller, larger) capacity so
+    mirrored instances share one, errors are the answers of unreadable rows.
+    """
+    groups = defaultdict(list)
+    errors = []
+    for instance in instances:
+        index, record, cap1, cap2, _ = instance
+        if cap1 is None:
+            errors.append((index, record))
+            continue
+        groups[(min(cap1, cap2), max(cap1, cap2))].append(instance)
+    return groups, errors
+
+
+def solve_batch(instances: Iterable[Instance], workers: int = None, ordered: bool = False) -> Iterator[dict]:
+    """
+    Yields one answer per instance. Unordered answers come out as soon as
+    their group is done, ordered ones are held back until every earlier
+    instance has been yielded. workers=1 runs in process.
+    """
+    groups, errors = group_instances(instances)
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1:
+        finished = (solve_group(cap1, cap2, group) for (cap1, cap2), group in groups.items())
+        yield from _emit(_chain(errors, finished), ordered)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(solve_group, cap1, cap2, group) for (cap1, cap2), group in groups.items()]
+        yield from _emit(_chain(errors, (future.result() for future in as_completed(futures))), ordered)
+
+
+def _emit(finished: Iterable[List[Tuple[int, dict]]], ordered: bool) -> Iterator[dict]:
+    if not ordered:
+        for answers in finished:
+            for _, answer in answers:
+                yield answer
+        return
+
+    pending = {}
+    next_index = 0
+    for answers in finished:
+        pending.update(answers)
+        while next_index in pending:
+            yield pending.pop(next_index)
+            next_index += 1
+
+
+def main(argv=None, stdin=None, stdout=None) -> int:
+    parser = argparse.ArgumentParser(description="Solve many water jug puzzles from CSV or JSONL on stdin.")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes, default all cores")
+    parser.add_argument("--ordered", action="store_true", help="write answers in input order")
+    args = parser.parse_args(argv)
+
+    stdin = stdin or io.TextIOWrapper(sys.stdin.buffer, encoding="utf-8")
+    stdout = stdout or sys.stdout
+    for answer in solve_batch(read_instances(stdin), workers=args.workers, ordered=args.ordered):
+        stdout.write(json.dumps(answer) + "\n")
+    stdout.flush()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,134 @@
+"""
+Two-jug puzzle without search.
+
+Goal g is reachable iff g <= max(a, b) and gcd(a, b) divides g. Every
+shortest solution is one of two fixed strategies: keep filling jug 1 and
+pouring it into jug 2 (emptying jug 2 whenever it fills), or the same with
+the jugs swapped. For one strategy, let t be the total amount poured so far.
+The goal turns up either in jug 2 when t = k*a with k*a = g (mod b), or in
+jug 1 when t = m*b with m*b = -g (mod a). Both k and m come from a modular
+inverse, i.e. the Bezout coefficients from extended_gcd. The move count
+then follows from how many fills, empties and pours happen before t, so
+min_moves is O(log min(a, b)) whatever the capacities. Writing out the
+moves is linear in their number but never branches.
+"""
+from typing import Iterator, Optional, Tuple
+
+from src.algo.water_jug_problem import WaterJugProblem
+from src.core.search import SearchResult, bfs
+
+# (moves, source jug, t), source 1 means fill 1 / pour 1->2
+Plan = Tuple[int, int, int]
+
+
+def extended_gcd(a: int, b: int) -> Tuple[int, int, int]:
+    """(g, x, y) with a*x + b*y == g == gcd(a, b)."""
+    x0, y0, x1, y1 = 1, 0, 0, 1
+    while b:
+        q, a, b = a // b, b, a % b
+        x0, x1 = x1, x0 - q * x1
+        y0, y1 = y1, y0 - q * y1
+    return a, x0, y0
+
+
+def _inverse(value: int, modulus: int) -> int:
+    _, x, _ = extended_gcd(value % modulus, modulus)
+    return x % modulus
+
+
+def is_solvable(cap1: int, cap2: int, goal: int) -> bool:
+    if goal in (0, cap1, cap2):
+        return True
+    if goal < 0 or goal > max(cap1, cap2) or cap1 == 0 or cap2 == 0:
+        return False
+    return goal % extended_gcd(cap1, cap2)[0] == 0
+
+
+def _plan_one_way(a: int, b: int, goal: int, d: int) -> Optional[Tuple[int, int]]:
+    """(moves, t) for the fill a / pour into b strategy, None if it never shows goal."""
+    best = None
+    # goal lands in the jug being poured into, right after a pour emptied the source
+    if goal < b and b // d > 1:
+        k = (goal // d) * _inverse(a // d, b // d) % (b // d)
+        if k:
+            t = k * a
+            best = (2 * k + 2 * (t // b), t)
+    # goal is what's left in the source after the target fills up
+    if goal < a and a // d > 1:
+        m = (-(goal // d)) * _inverse(b // d, a // d) % (a // d)
+        if m:
+            t = m * b
+            moves = 2 * (t // a) + 2 * m
+            if best is None or moves < best[0]:
+                best = (moves, t)
+    return best
+
+
+def _plan(cap1: int, cap2: int, goal: int) -> Optional[Plan]:
+    if goal == 0:
+        return 0, 1, 0
+    if goal == cap1:
+        return 1, 1, 0
+    if goal == cap2:
+        return 1, 2, 0
+    if not is_solvable(cap1, cap2, goal):
+        return None
+    d = extended_gcd(cap1, cap2)[0]
+    forward = _plan_one_way(cap1, cap2, goal, d)
+    backward = _plan_one_way(cap2, cap1, goal, d)
+    if backward is not None and (forward is None or backward[0] < forward[0]):
+        return backward[0], 2, backward[1]
+    return forward[0], 1, forward[1]
+
+
+def min_moves(cap1: int, cap2: int, goal: int) -> Optional[int]:
+    """Fewest moves until some jug holds goal, None if it never can."""
+    plan = _plan(cap1, cap2, goal)
+    return None if plan is None else plan[0]
+
+
+def iter_moves(cap1: int, cap2: int, goal: int) -> Iterator[Tuple[str, Tuple[int, int]]]:
+    """Yields (action, state after it) along a shortest solution."""
+    plan = _plan(cap1, cap2, goal)
+    if plan is None or plan[0] == 0:
+        return
+    moves, source, _ = plan
+    if moves == 1:
+        yield (f"fill {source}", (cap1, 0) if source == 1 else (0, cap2))
+        return
+
+    # run the strategy with the source jug as "s" and the other as "o"
+    s_cap, o_cap = (cap1, cap2) if source == 1 else (cap2, cap1)
+    other = 3 - source
+    s = o = 0
+    for _ in range(moves):
+        if s == 0:
+            s, action = s_cap, f"fill {source}"
+        elif o == o_cap:
+            o, action = 0, f"empty {other}"
+        else:
+            amount = min(s, o_cap - o)
+            s, o, action = s - amount, o + amount, f"pour {source}->{other}"
+        yield action, ((s, o) if source == 1 else (o, s))
+
+
+def solve_closed_form(cap1: int, cap2: int, goal: int) -> SearchResult:
+    """Same shape as bfs(WaterJugProblem(cap1, cap2, goal)), nothing expanded."""
+    result = SearchResult()
+    if not is_solvable(cap1, cap2, goal):
+        return result
+    result.states.append((0, 0))
+    for action, state in iter_moves(cap1, cap2, goal):
+        result.actions.append(action)
+        result.states.append(state)
+    result.cost = len(result.actions)
+    return result
+
+
+def cross_check(cap1: int, cap2: int, goal: int, solver=bfs) -> bool:
+    """True when solver on WaterJugProblem agrees on solvability and length."""
+    searched = solver(WaterJugProblem(cap1, cap2, goal))
+    expected = min_moves(cap1, cap2, goal)
+    if not searched.found:
+        return expected is None
+    return expected == searched.depth
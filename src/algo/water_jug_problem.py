@@ -1,5 +1,15 @@
+from src.core.search import bfs
+from src.core.search_problem import SearchProblem
+from src.core.state_codec import JugCodec
+
+
+# set to False to skip the per-node trace, e.g. when timing
+TRACE = True
+
+
 def solve(x, y, jug_a, jug_b, goal, path):
-    print (f"visiting ({x}, {y})")
+    if TRACE:
+        print (f"visiting ({x}, {y})")
 
     if x == goal or y == goal:
         print("GOAL REACHED!")
@@ -40,6 +50,67 @@ def solve(x, y, jug_a, jug_b, goal, path):
     return False
 
 
+class WaterJugProblem(SearchProblem):
+    def __init__(self, cap1, cap2, goal):
+        self.cap1 = cap1
+        self.cap2 = cap2
+        self.goal = goal
+
+    def initial_state(self):
+        return 0, 0
+
+    def is_goal(self, state):
+        return self.goal in state
+
+    # a goal that isn't sitting in a jug is at least one move away
+    def heuristic(self, state):
+        return 0 if self.goal in state else 1
+
+    # this allow the value to be stuck in has table
+    def hashable_state(self, state):
+        return tuple(state)
+
+    # two jugs of the same size are interchangeable, (x, y) is (y, x)
+    def canonical_state(self, state):
+        if self.cap1 == self.cap2:
+            return tuple(sorted(state))
+        return tuple(state)
+
+    # packs (x, y) into one int for packed_bfs
+    def codec(self):
+        return JugCodec(self.cap1, self.cap2)
+
+    # this is like advance, returns (next_state, action) pairs
+    def successors(self, state):
+        x,y = state
+        cap1 = self.cap1
+        cap2 = self.cap2
+        result = []
+
+        def add(new_x, new_y, action):
+            # moves that don't change anything are just self loops
+            if (new_x, new_y) != (x, y):
+                result.append(((new_x, new_y), action))
+
+        add(cap1, y, "fill 1")
+        add(x, cap2, "fill 2")
+        add(0, y, "empty 1")
+        add(x, 0, "empty 2")
+
+        transfer = min(x, cap2 - y)
+        add(x - transfer, y + transfer, "pour 1->2")
+
+        transfer = min(y, cap1 - x)
+        add(x + transfer, y - transfer, "pour 2->1")
+        return result
+
+
+def solve_water_jug(cap1, cap2, goal):
+    """Shortest list of (x, y) states to the goal, or None if unreachable."""
+    result = bfs(WaterJugProblem(cap1, cap2, goal))
+    return result.states if result.found else None
+
+
 if __name__ == "__main__":
     jug_a = 4
     jug_b = 3
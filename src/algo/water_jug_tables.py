@@ -0,0 +1,227 @@
+"""
+Precomputed water jug answers.
+
+One BFS from (0, 0) per (cap1, cap2) records the distance and parent of
+every reachable (x, y). Any goal volume for those jugs is then a table
+lookup plus walking the parent chain. Tables are flat arrays indexed by
+x * (cap2 + 1) + y and can be persisted in an on-disk cache that evicts
+the least recently used file once it holds too many.
+"""
+import os
+import struct
+from array import array
+from collections import OrderedDict, deque
+from typing import Optional
+
+from src.algo.water_jug_problem import WaterJugProblem
+from src.core.search import SearchResult
+
+ACTIONS = ["fill 1", "fill 2", "empty 1", "empty 2", "pour 1->2", "pour 2->1"]
+ACTION_CODES = {action: code for code, action in enumerate(ACTIONS)}
+
+UNREACHABLE = -1
+
+_MAGIC = b"JUGT"
+_HEADER = struct.Struct("<4sII")
+
+
+class ReachabilityTable:
+    def __init__(self, cap1, cap2, distance, parent, action):
+        self.cap1 = cap1
+        self.cap2 = cap2
+        self.distance = distance
+        self.parent = parent
+        self.action = action
+        self._best_for_volume = None
+
+    @classmethod
+    def build(cls, cap1, cap2) -> "ReachabilityTable":
+        problem = WaterJugProblem(cap1, cap2, goal=None)
+        size = (cap1 + 1) * (cap2 + 1)
+        distance = array("i", [UNREACHABLE]) * size
+        parent = array("i", [UNREACHABLE]) * size
+        action = array("b", [UNREACHABLE]) * size
+        width = cap2 + 1
+
+        distance[0] = 0
+        frontier = deque([(0, 0)])
+        while frontier:
+            state = frontier.popleft()
+            index = state[0] * width + state[1]
+            for (x, y), move in problem.successors(state):
+                next_index = x * width + y
+                if distance[next_index] != UNREACHABLE:
+                    continue
+                distance[next_index] = distance[index] + 1
+                parent[next_index] = index
+                action[next_index] = ACTION_CODES[move]
+                frontier.append((x, y))
+        return cls(cap1, cap2, distance, parent, action)
+
+    def state_at(self, index):
+        return divmod(index, self.cap2 + 1)
+
+    def best_for_volume(self):
+        # closest reachable state holding each volume in either jug
+        if self._best_for_volume is None:
+            best = array("i", [UNREACHABLE]) * (max(self.cap1, self.cap2) + 1)
+            for index, dist in enumerate(self.distance):
+                if dist == UNREACHABLE:
+                    continue
+                for volume in self.state_at(index):
+                    current = best[volume]
+                    if current == UNREACHABLE or dist < self.distance[current]:
+                        best[volume] = index
+            self._best_for_volume = best
+        return self._best_for_volume
+
+    def distance_to(self, goal) -> Optional[int]:
+        """Fewest moves until some jug holds goal, None if it never can."""
+        if not 0 <= goal <= max(self.cap1, self.cap2):
+            return None
+        index = self.best_for_volume()[goal]
+        return None if index == UNREACHABLE else self.distance[index]
+
+    def solve(self, goal) -> SearchResult:
+        result = SearchResult()
+        if not 0 <= goal <= max(self.cap1, self.cap2):
+            return result
+        index = self.best_for_volume()[goal]
+        while index != UNREACHABLE:
+            result.states.append(self.state_at(index))
+            if self.parent[index] != UNREACHABLE:
+                result.actions.append(ACTIONS[self.action[index]])
+            index = self.parent[index]
+        result.states.reverse()
+        result.actions.reverse()
+        return result
+
+    def to_bytes(self) -> bytes:
+        return (_HEADER.pack(_MAGIC, self.cap1, self.cap2)
+                + self.distance.tobytes() + self.parent.tobytes() + self.action.tobytes())
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "ReachabilityTable":
+        magic, cap1, cap2 = _HEADER.unpack_from(data)
+        if magic != _MAGIC:
+            raise ValueError("not a water jug table")
+        size = (cap1 + 1) * (cap2 + 1)
+        offset = _HEADER.size
+        distance = array("i")
+        distance.frombytes(data[offset:offset + size * distance.itemsize])
+        offset += size * distance.itemsize
+        parent = array("i")
+        parent.frombytes(data[offset:offset + size * parent.itemsize])
+        offset += size * parent.itemsize
+        action = array("b")
+        action.frombytes(data[offset:offset + size])
+        if len(action) != size:
+            raise ValueError("truncated water jug table")
+        return cls(cap1, cap2, distance, parent, action)
+
+
+class SwappedTable:
+    """
+    A (cap2, cap1) table answering for (cap1, cap2). The puzzles mirror
+    each other with the jugs swapped, so only one orientation is ever built.
+    """
+    SWAP = {"fill 1": "fill 2", "fill 2": "fill 1", "empty 1": "empty 2", "empty 2": "empty 1",
+            "pour 1->2": "pour 2->1", "pour 2->1": "pour 1->2"}
+
+    def __init__(self, table: ReachabilityTable):
+        self.table = table
+        self.cap1 = table.cap2
+        self.cap2 = table.cap1
+
+    def distance_to(self, goal) -> Optional[int]:
+        return self.table.distance_to(goal)
+
+    def solve(self, goal) -> SearchResult:
+        result = self.table.solve(goal)
+        result.states = [(y, x) for x, y in result.states]
+        result.actions = [self.SWAP[action] for action in result.actions]
+        return result
+
+
+class TableCache:
+    """
+    Tables keyed by capacities, kept in memory and optionally on disk.
+    Both levels evict the least recently used table past their limit,
+    on disk "used" is the file's mtime which every load touches.
+    """
+    def __init__(self, directory: Optional[str] = None, max_files: int = 64, max_in_memory: int = 8):
+        self.directory = directory
+        self.max_files = max_files
+        self.max_in_memory = max_in_memory
+        self._memory = OrderedDict()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def _path(self, cap1, cap2):
+        return os.path.join(self.directory, f"jug_{cap1}_{cap2}.bin")
+
+    def get(self, cap1, cap2) -> ReachabilityTable:
+        if cap1 > cap2:
+            # stored once, with the smaller jug first
+            return SwappedTable(self.get(cap2, cap1))
+        key = (cap1, cap2)
+        table = self._memory.get(key)
+        if table is not None:
+            self._memory.move_to_end(key)
+            self.hits += 1
+            return table
+
+        table = self._load(cap1, cap2)
+        if table is not None:
+            self.disk_hits += 1
+        else:
+            self.misses += 1
+            table = ReachabilityTable.build(cap1, cap2)
+            self._save(table)
+
+        self._memory[key] = table
+        while len(self._memory) > self.max_in_memory:
+            self._memory.popitem(last=False)
+        return table
+
+    def _load(self, cap1, cap2) -> Optional[ReachabilityTable]:
+        if self.directory is None:
+            return None
+        path = self._path(cap1, cap2)
+        try:
+            with open(path, "rb") as f:
+                table = ReachabilityTable.from_bytes(f.read())
+        except (FileNotFoundError, ValueError, struct.error):
+            return None
+        os.utime(path)
+        return table
+
+    def _save(self, table: ReachabilityTable):
+        if self.directory is None:
+            return
+        path = self._path(table.cap1, table.cap2)
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(table.to_bytes())
+        os.replace(tmp, path)
+        self._evict()
+
+    def _evict(self):
+        files = [os.path.join(self.directory, name) for name in os.listdir(self.directory)
+                 if name.startswith("jug_") and name.endswith(".bin")]
+        if len(files) <= self.max_files:
+            return
+        files.sort(key=os.path.getmtime)
+        for path in files[:len(files) - self.max_files]:
+            os.remove(path)
+
+
+_default_cache = TableCache()
+
+
+def solve_water_jug_cached(cap1, cap2, goal, cache: Optional[TableCache] = None) -> SearchResult:
+    """Same answer as bfs(WaterJugProblem(cap1, cap2, goal)) but from a shared table."""
+    return (cache or _default_cache).get(cap1, cap2).solve(goal)
@@ -0,0 +1,189 @@
+"""
+Anytime A* with node / time / memory budgets.
+
+When a budget runs out the search stops and hands back the closest state
+it has seen (lowest heuristic, then lowest cost) with the path to it, plus
+a Checkpoint holding the open heap, parents, g scores and closed set.
+Passing that checkpoint back in carries on exactly where it stopped
+instead of starting over from initial_state().
+"""
+import heapq
+import pickle
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from src.core.search import Parents, SearchResult, reconstruct
+from src.core.search_problem import SearchProblem
+
+# time and memory are only looked at every this many expansions
+CHECK_EVERY = 256
+
+NODES = "nodes"
+TIME = "time"
+MEMORY = "memory"
+
+
+@dataclass
+class SearchBudget:
+    max_nodes: Optional[int] = None
+    max_seconds: Optional[float] = None
+    max_memory_bytes: Optional[int] = None
+
+
+@dataclass
+class Checkpoint:
+    heap: List[Tuple] = field(default_factory=list)
+    parents: Parents = field(default_factory=dict)
+    g_score: Dict[Any, float] = field(default_factory=dict)
+    closed: Set[Any] = field(default_factory=set)
+    tie: int = 0
+    # (h, g, key) of the closest state so far
+    best: Optional[Tuple[float, float, Any]] = None
+    nodes_expanded: int = 0
+    nodes_generated: int = 0
+
+    def memory_bytes(self) -> int:
+        """
+        Rough size of the search structures. The containers are measured and
+        the entries are counted at the size of a sampled one, so this is O(1)
+        and includes everything restored from a saved checkpoint.
+        """
+        size = sum(sys.getsizeof(part) for part in (self.heap, self.parents, self.g_score, self.closed))
+        if not self.parents:
+            return size
+        key, entry = next(iter(self.parents.items()))
+        state = entry[2]
+        per_state = sys.getsizeof(entry) + _rough_size(state) + sys.getsizeof(0.0)
+        if key is not state:
+            per_state += _rough_size(key)
+        size += len(self.parents) * per_state
+        if self.heap:
+            # key and state in a heap entry are shared with parents
+            sample = self.heap[0]
+            size += len(self.heap) * (sys.getsizeof(sample) + sum(sys.getsizeof(v) for v in sample[:4]))
+        return size
+
+    def dumps(self) -> bytes:
+        return pickle.dumps(self)
+
+    @classmethod
+    def loads(cls, data: bytes) -> "Checkpoint":
+        checkpoint = pickle.loads(data)
+        if not isinstance(checkpoint, cls):
+            raise TypeError(f"expected a Checkpoint, got {type(checkpoint).__name__}")
+        return checkpoint
+
+    def save(self, path: str):
+        with open(path, "wb") as f:
+            f.write(self.dumps())
+
+    @classmethod
+    def load(cls, path: str) -> "Checkpoint":
+        with open(path, "rb") as f:
+            return cls.loads(f.read())
+
+
+def _rough_size(obj) -> int:
+    size = sys.getsizeof(obj)
+    if isinstance(obj, (tuple, list, set, frozenset)):
+        size += sum(sys.getsizeof(item) for item in obj)
+    return size
+
+
+@dataclass
+class AnytimeResult(SearchResult):
+    # which budget ran out, None if the search finished
+    exhausted: Optional[str] = None
+    partial_states: List[Any] = field(default_factory=list)
+    partial_actions: List[Any] = field(default_factory=list)
+    best_heuristic: Optional[float] = None
+    checkpoint: Optional[Checkpoint] = None
+
+    @property
+    def complete(self) -> bool:
+        return self.exhausted is None
+
+
+def _start(problem: SearchProblem) -> Checkpoint:
+    start = problem.initial_state()
+    key = problem.hashable_state(start)
+    h = problem.heuristic(start)
+    checkpoint = Checkpoint()
+    checkpoint.parents[key] = (None, None, start)
+    checkpoint.g_score[key] = 0
+    checkpoint.heap.append((h, h, 0, 0, key, start))
+    checkpoint.tie = 1
+    checkpoint.best = (h, 0, key)
+    return checkpoint
+
+
+def anytime_astar(problem: SearchProblem, budget: Optional[SearchBudget] = None,
+                  checkpoint: Optional[Checkpoint] = None) -> AnytimeResult:
+    """
+    A* that stops when budget runs out. Node and time budgets count from
+    this call, so resuming with the returned checkpoint gets a fresh
+    allowance. The memory budget is for the whole search, what the
+    checkpoint already holds counts too.
+    """
+    budget = budget or SearchBudget()
+    cp = checkpoint or _start(problem)
+    result = AnytimeResult()
+    heap, parents, g_score, closed = cp.heap, cp.parents, cp.g_score, cp.closed
+
+    deadline = None if budget.max_seconds is None else time.perf_counter() + budget.max_seconds
+    expanded_here = 0
+
+    while heap:
+        if budget.max_nodes is not None and expanded_here >= budget.max_nodes:
+            result.exhausted = NODES
+            break
+        if expanded_here % CHECK_EVERY == 0 and expanded_here:
+            if deadline is not None and time.perf_counter() >= deadline:
+                result.exhausted = TIME
+                break
+            # the whole frontier and closed set, resumed ones included
+            if budget.max_memory_bytes is not None and cp.memory_bytes() >= budget.max_memory_bytes:
+                result.exhausted = MEMORY
+                break
+
+        if len(heap) > result.frontier_peak:
+            result.frontier_peak = len(heap)
+        _, h, _, g, key, state = heapq.heappop(heap)
+        if key in closed or g > g_score[key]:
+            continue
+        if problem.is_goal(state):
+            result.states, result.actions = reconstruct(parents, key)
+            result.cost = g
+            cp.best = (0, g, key)
+            break
+        closed.add(key)
+        cp.nodes_expanded += 1
+        expanded_here += 1
+        for next_state, action in problem.successors(state):
+            cp.nodes_generated += 1
+            next_key = problem.hashable_state(next_state)
+            if next_key in closed:
+                result.duplicates_pruned += 1
+                continue
+            next_g = g + problem.step_cost(state, action)
+            if next_g >= g_score.get(next_key, float("inf")):
+                result.duplicates_pruned += 1
+                continue
+            g_score[next_key] = next_g
+            parents[next_key] = (key, action, next_state)
+            next_h = problem.heuristic(next_state)
+            if (next_h, next_g) < cp.best[:2]:
+                cp.best = (next_h, next_g, next_key)
+            heapq.heappush(heap, (next_g + next_h, next_h, cp.tie, next_g, next_key, next_state))
+            cp.tie += 1
+
+    result.nodes_expanded = cp.nodes_expanded
+    result.nodes_generated = cp.nodes_generated
+    result.visited_count = len(g_score)
+    result.best_heuristic, _, best_key = cp.best
+    result.partial_states, result.partial_actions = reconstruct(parents, best_key)
+    if result.exhausted is not None:
+        result.checkpoint = cp
+    return result
@@ -0,0 +1,253 @@
+"""
+External-memory BFS for state spaces too big for a Python set.
+
+States are packed ints from a BitPackedCodec. The visited bitmap lives in
+an mmap'd file so the OS pages it in and out, and every BFS layer is
+written to disk as sorted runs of uint64 codes. The only thing held in
+RAM is the buffer of the layer being generated, which is spilled as a
+run once it reaches the memory budget. Reading a layer back merges at
+most MERGE_FAN_IN runs at a time, so open files and read buffers don't
+grow with the number of runs.
+
+There are no parent pointers. The path is rebuilt at the end by walking
+the saved layers backwards and finding a state in each one with a move
+to the state after it.
+"""
+import heapq
+import mmap
+import os
+import shutil
+import tempfile
+from array import array
+from dataclasses import dataclass
+from typing import Iterator, List, Optional
+
+from src.core.search import SearchResult
+from src.core.search_problem import SearchProblem
+from src.core.state_codec import BitPackedCodec
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+DEFAULT_MEMORY_BUDGET = 64 * 1024 * 1024
+# what one buffered code costs at its peak, while its run is spilled. numpy
+# sorts the uint64 buffer in place, without it sorted() needs a list slot
+# and an int object per code plus the sorted array
+BYTES_PER_CODE = 8 if np is not None else 8 + 8 + 32 + 8
+_READ_CHUNK = 64 * 1024
+# runs open at once while merging a layer, each with a _READ_CHUNK buffer
+MERGE_FAN_IN = 16
+
+
+class MmapBitmap:
+    """BitmapVisited backed by a file instead of a bytearray."""
+    def __init__(self, path: str, size: int):
+        self.nbytes = max(1, (size + 7) >> 3)
+        self._file = open(path, "w+b")
+        self._file.truncate(self.nbytes)
+        self.bits = mmap.mmap(self._file.fileno(), self.nbytes)
+        self.count = 0
+
+    def __contains__(self, code: int) -> bool:
+        return bool(self.bits[code >> 3] & (1 << (code & 7)))
+
+    def add(self, code: int) -> bool:
+        index, bit = code >> 3, 1 << (code & 7)
+        byte = self.bits[index]
+        if byte & bit:
+            return False
+        self.bits[index] = byte | bit
+        self.count += 1
+        return True
+
+    def __len__(self) -> int:
+        return self.count
+
+    def close(self):
+        self.bits.close()
+        self._file.close()
+
+
+class Layer:
+    """One BFS depth on disk, a list of sorted run files."""
+    def __init__(self, runs: List[str], count: int, fan_in: int = MERGE_FAN_IN):
+        self.runs = runs
+        self.count = count
+        self.fan_in = max(2, fan_in)
+
+    def codes(self) -> Iterator[int]:
+        # runs are sorted, merging keeps the whole layer in code order
+        self._compact()
+        return heapq.merge(*(_read_run(path) for path in self.runs))
+
+    def _compact(self):
+        # merge passes over groups of fan_in runs until few enough are left to
+        # merge in one go. the merged runs replace the old ones, so the walk
+        # back at the end doesn't pay for this again
+        generation = 0
+        while len(self.runs) > self.fan_in:
+            merged = []
+            for start in range(0, len(self.runs), self.fan_in):
+                group = self.runs[start:start + self.fan_in]
+                if len(group) == 1:
+                    merged.append(group[0])
+                    continue
+                path = f"{os.path.splitext(group[0])[0]}_merge_{generation}.bin"
+                _write_run(path, heapq.merge(*(_read_run(run) for run in group)))
+                for run in group:
+                    os.remove(run)
+                merged.append(path)
+            self.runs = merged
+            generation += 1
+
+
+def _read_run(path: str) -> Iterator[int]:
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(_READ_CHUNK)
+            if not chunk:
+                return
+            codes = array("Q")
+            codes.frombytes(chunk)
+            yield from codes
+
+
+def _write_run(path: str, codes: Iterator[int]):
+    chunk_items = _READ_CHUNK // array("Q").itemsize
+    with open(path, "wb") as f:
+        buffer = array("Q")
+        for code in codes:
+            buffer.append(code)
+            if len(buffer) >= chunk_items:
+                buffer.tofile(f)
+                buffer = array("Q")
+        buffer.tofile(f)
+
+
+class LayerWriter:
+    def __init__(self, directory: str, depth: int, max_buffered: int):
+        self.directory = directory
+        self.depth = depth
+        self.max_buffered = max(1, max_buffered)
+        self.buffer = array("Q")
+        self.runs: List[str] = []
+        self.count = 0
+        self.bytes_written = 0
+
+    def add(self, code: int):
+        self.buffer.append(code)
+        self.count += 1
+        if len(self.buffer) >= self.max_buffered:
+            self._spill()
+
+    def _spill(self):
+        if not self.buffer:
+            return
+        path = os.path.join(self.directory, f"layer_{self.depth:06d}_run_{len(self.runs):06d}.bin")
+        if np is not None:
+            np.frombuffer(self.buffer, dtype=np.uint64).sort()
+            ordered = self.buffer
+        else:
+            ordered = array("Q", sorted(self.buffer))
+        with open(path, "wb") as f:
+            ordered.tofile(f)
+        self.bytes_written += len(self.buffer) * self.buffer.itemsize
+        self.runs.append(path)
+        self.buffer = array("Q")
+
+    def close(self) -> Layer:
+        self._spill()
+        return Layer(self.runs, self.count)
+
+
+@dataclass
+class ExternalResult(SearchResult):
+    layers: int = 0
+    runs_spilled: int = 0
+    bytes_spilled: int = 0
+    bitmap_bytes: int = 0
+
+
+def external_bfs(problem: SearchProblem, codec: Optional[BitPackedCodec] = None,
+                 memory_budget: int = DEFAULT_MEMORY_BUDGET, work_dir: Optional[str] = None) -> ExternalResult:
+    """
+    BFS with the visited set and frontier on disk. codec defaults to
+    problem.codec(). memory_budget (bytes) caps the in-memory layer buffer,
+    the bitmap is paged by the OS. Files go in a temp dir under work_dir
+    and are removed when the search is done.
+    """
+    codec = codec or problem.codec()
+    encode, decode = codec.encode, codec.decode
+    max_buffered = memory_budget // BYTES_PER_CODE
+    directory = tempfile.mkdtemp(prefix="external_bfs_", dir=work_dir)
+    visited = MmapBitmap(os.path.join(directory, "visited.bin"), codec.size)
+    result = ExternalResult(bitmap_bytes=visited.nbytes)
+
+    try:
+        start = problem.initial_state()
+        start_code = encode(start)
+        visited.add(start_code)
+        if problem.is_goal(start):
+            result.states, result.actions = [start], []
+            result.visited_count = 1
+            return result
+
+        writer = LayerWriter(directory, 0, max_buffered)
+        writer.add(start_code)
+        layers = [writer.close()]
+        result.runs_spilled += len(writer.runs)
+        result.bytes_spilled += writer.bytes_written
+
+        goal_code = None
+        while goal_code is None and layers[-1].count:
+            writer = LayerWriter(directory, len(layers), max_buffered)
+            result.frontier_peak = max(result.frontier_peak, layers[-1].count)
+            for code in layers[-1].codes():
+                result.nodes_expanded += 1
+                for next_state, _ in problem.successors(decode(code)):
+                    result.nodes_generated += 1
+                    next_code = encode(next_state)
+                    if not visited.add(next_code):
+                        result.duplicates_pruned += 1
+                        continue
+                    if problem.is_goal(next_state):
+                        goal_code = next_code
+                        break
+                    writer.add(next_code)
+                if goal_code is not None:
+                    break
+            layer = writer.close()
+            result.runs_spilled += len(writer.runs)
+            result.bytes_spilled += writer.bytes_written
+            if goal_code is None:
+                layers.append(layer)
+
+        result.layers = len(layers)
+        result.visited_count = len(visited)
+        if goal_code is not None:
+            result.states, result.actions = _walk_back(problem, codec, layers, goal_code)
+        return result
+    finally:
+        visited.close()
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def _walk_back(problem: SearchProblem, codec: BitPackedCodec, layers: List[Layer], goal_code: int):
+    encode, decode = codec.encode, codec.decode
+    states = [decode(goal_code)]
+    actions = []
+    target = goal_code
+    for layer in reversed(layers):
+        for code in layer.codes():
+            move = next((action for next_state, action in problem.successors(decode(code))
+                         if encode(next_state) == target), None)
+            if move is not None:
+                states.append(decode(code))
+                actions.append(move)
+                target = code
+                break
+    states.reverse()
+    actions.reverse()
+    return states, actions
@@ -0,0 +1,553 @@
+"""
+Generic search over SearchProblem.
+
+All solvers keep a visited set keyed by problem.hashable_state() and a
+parent pointer per state, so the path is only rebuilt once at the goal
+instead of copying a path list on every edge.
+"""
+import heapq
+from collections import deque
+from itertools import count
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+from src.core.search_problem import SearchProblem
+from src.core.state_codec import BitmapVisited, BitPackedCodec
+
+if TYPE_CHECKING:
+    from src.core.search_stats import SearchStats
+
+# key -> (parent key, action that led here, state)
+Parents = Dict[Hashable, Tuple[Optional[Hashable], Any, Any]]
+
+
+@dataclass
+class SearchResult:
+    states: List[Any] = field(default_factory=list)
+    actions: List[Any] = field(default_factory=list)
+    nodes_expanded: int = 0
+    nodes_generated: int = 0
+    # generated states thrown away because they were already seen
+    duplicates_pruned: int = 0
+    frontier_peak: int = 0
+    visited_count: int = 0
+    # timing and memory, only filled in by search_stats.profile_search
+    stats: Optional["SearchStats"] = None
+    # path cost under problem.step_cost, only filled in by the best-first solvers
+    cost: Optional[float] = None
+
+    @property
+    def found(self) -> bool:
+        return bool(self.states)
+
+    @property
+    def depth(self) -> int:
+        return len(self.actions)
+
+
+def reconstruct(parents: Parents, key: Hashable) -> Tuple[List[Any], List[Any]]:
+    states, actions = [], []
+    while key is not None:
+        parent_key, action, state = parents[key]
+        states.append(state)
+        if parent_key is not None:
+            actions.append(action)
+        key = parent_key
+    states.reverse()
+    actions.reverse()
+    return states, actions
+
+
+def bfs(problem: SearchProblem) -> SearchResult:
+    start = problem.initial_state()
+    start_key = problem.hashable_state(start)
+    parents: Parents = {start_key: (None, None, start)}
+    result = SearchResult()
+
+    if problem.is_goal(start):
+        result.states, result.actions = [start], []
+        result.visited_count = 1
+        return result
+
+    frontier = deque([(start_key, start)])
+    try:
+        while frontier:
+            if len(frontier) > result.frontier_peak:
+                result.frontier_peak = len(frontier)
+            key, state = frontier.popleft()
+            result.nodes_expanded += 1
+            for next_state, action in problem.successors(state):
+                result.nodes_generated += 1
+                next_key = problem.hashable_state(next_state)
+                if next_key in parents:
+                    result.duplicates_pruned += 1
+                    continue
+                parents[next_key] = (key, action, next_state)
+                # goal test on generation, BFS already has the shortest path here
+                if problem.is_goal(next_state):
+                    result.states, result.actions = reconstruct(parents, next_key)
+                    return result
+                frontier.append((next_key, next_state))
+        return result
+    finally:
+        result.visited_count = len(parents)
+
+
+def packed_bfs(problem: SearchProblem, codec: BitPackedCodec) -> SearchResult:
+    """
+    BFS that tracks states as codec-packed ints. Visited is a bitmap sized
+    by the codec and parents only hold ints, so memory is a few bytes per
+    reached state instead of a tuple + dict entry.
+    """
+    encode, decode = codec.encode, codec.decode
+    start = problem.initial_state()
+    start_code = encode(start)
+    visited = BitmapVisited(codec.size)
+    visited.add(start_code)
+    # code -> (parent code, action), states are decoded again at the end
+    parents = {start_code: (None, None)}
+    result = SearchResult()
+
+    goal_code = start_code if problem.is_goal(start) else None
+    # the frontier is ints too, states only exist while being expanded
+    frontier = deque([start_code]) if goal_code is None else deque()
+    while frontier:
+        if len(frontier) > result.frontier_peak:
+            result.frontier_peak = len(frontier)
+        code = frontier.popleft()
+        state = decode(code)
+        result.nodes_expanded += 1
+        for next_state, action in problem.successors(state):
+            result.nodes_generated += 1
+            next_code = encode(next_state)
+            if not visited.add(next_code):
+                result.duplicates_pruned += 1
+                continue
+            parents[next_code] = (code, action)
+            if problem.is_goal(next_state):
+                goal_code = next_code
+                frontier.clear()
+                break
+            frontier.append(next_code)
+    result.visited_count = len(visited)
+
+    code = goal_code
+    while code is not None:
+        result.states.append(decode(code))
+        parent, action = parents[code]
+        if parent is not None:
+            result.actions.append(action)
+        code = parent
+    result.states.reverse()
+    result.actions.reverse()
+    return result
+
+
+def dfs(problem: SearchProblem, max_depth: Optional[int] = None) -> SearchResult:
+    start = problem.initial_state()
+    start_key = problem.hashable_state(start)
+    parents: Parents = {start_key: (None, None, start)}
+    result = SearchResult()
+
+    # explicit stack so deep puzzles don't hit the recursion limit
+    stack = [(start_key, start, 0)]
+    try:
+        while stack:
+            if len(stack) > result.frontier_peak:
+                result.frontier_peak = len(stack)
+            key, state, depth = stack.pop()
+            if problem.is_goal(state):
+                result.states, result.actions = reconstruct(parents, key)
+                return result
+            if max_depth is not None and depth >= max_depth:
+                continue
+            result.nodes_expanded += 1
+            for next_state, action in problem.successors(state):
+                result.nodes_generated += 1
+                next_key = problem.hashable_state(next_state)
+                if next_key in parents:
+                    result.duplicates_pruned += 1
+                    continue
+                parents[next_key] = (key, action, next_state)
+                stack.append((next_key, next_state, depth + 1))
+        return result
+    finally:
+        result.visited_count = len(parents)
+
+
+def _depth_limited(problem: SearchProblem, limit: int, result: SearchResult) -> Tuple[bool, bool]:
+    """Returns (found, cutoff). cutoff means some node was pruned by the limit."""
+    start = problem.initial_state()
+    start_key = problem.hashable_state(start)
+    parents: Parents = {start_key: (None, None, start)}
+    # shallowest depth each state was reached at in this iteration, a state
+    # is only re-expanded when we find a shorter way to it
+    best_depth = {start_key: 0}
+    cutoff = False
+
+    stack = [(start_key, start, 0)]
+    try:
+        while stack:
+            if len(stack) > result.frontier_peak:
+                result.frontier_peak = len(stack)
+            key, state, depth = stack.pop()
+            if depth > best_depth[key]:
+                continue
+            if problem.is_goal(state):
+                result.states, result.actions = reconstruct(parents, key)
+                return True, cutoff
+            if depth >= limit:
+                cutoff = True
+                continue
+            result.nodes_expanded += 1
+            for next_state, action in problem.successors(state):
+                result.nodes_generated += 1
+                next_key = problem.hashable_state(next_state)
+                if best_depth.get(next_key, depth + 2) <= depth + 1:
+                    result.duplicates_pruned += 1
+                    continue
+                best_depth[next_key] = depth + 1
+                parents[next_key] = (key, action, next_state)
+                stack.append((next_key, next_state, depth + 1))
+        return False, cutoff
+    finally:
+        result.visited_count = max(result.visited_count, len(best_depth))
+
+
+def iterative_deepening(problem: SearchProblem, max_depth: int = 1000) -> SearchResult:
+    result = SearchResult()
+    for limit in range(max_depth + 1):
+        found, cutoff = _depth_limited(problem, limit, result)
+        # nothing was cut off, so a deeper limit can't find anything new
+        if found or not cutoff:
+            break
+    return result
+
+
+def _best_first(problem: SearchProblem, priority: Callable[[float, float], float]) -> SearchResult:
+    start = problem.initial_state()
+    start_key = problem.hashable_state(start)
+    parents: Parents = {start_key: (None, None, start)}
+    g_score = {start_key: 0}
+    closed = set()
+    result = SearchResult()
+
+    # ties on priority go to the state closer to the goal, then the counter
+    # breaks any remaining ties so states themselves never get compared
+    tie = count()
+    h = problem.heuristic(start)
+    heap = [(priority(0, h), h, next(tie), 0, start_key, start)]
+    try:
+        while heap:
+            if len(heap) > result.frontier_peak:
+                result.frontier_peak = len(heap)
+            _, _, _, g, key, state = heapq.heappop(heap)
+            if key in closed or g > g_score[key]:
+                continue
+            if problem.is_goal(state):
+                result.states, result.actions = reconstruct(parents, key)
+                result.cost = g
+                return result
+            closed.add(key)
+            result.nodes_expanded += 1
+            for next_state, action in problem.successors(state):
+                result.nodes_generated += 1
+                next_key = problem.hashable_state(next_state)
+                if next_key in closed:
+                    result.duplicates_pruned += 1
+                    continue
+                next_g = g + problem.step_cost(state, action)
+                if next_g >= g_score.get(next_key, float("inf")):
+                    result.duplicates_pruned += 1
+                    continue
+                g_score[next_key] = next_g
+                parents[next_key] = (key, action, next_state)
+                h = problem.heuristic(next_state)
+                heapq.heappush(heap, (priority(next_g, h), h, next(tie), next_g, next_key, next_state))
+        return result
+    finally:
+        result.visited_count = len(g_score)
+
+
+def astar(problem: SearchProblem) -> SearchResult:
+    """Optimal as long as problem.heuristic never overestimates."""
+    return _best_first(problem, lambda g, h: g + h)
+
+
+def greedy_best_first(problem: SearchProblem) -> SearchResult:
+    """Follows the heuristic only, fast but the path is not guaranteed shortest."""
+    return _best_first(problem, lambda g, h: h)
+
+
+@dataclass
+class BidirectionalResult(SearchResult):
+    forward_expanded: int = 0
+    backward_expanded: int = 0
+    forward_frontier_peak: int = 0
+    backward_frontier_peak: int = 0
+
+
+def _expand_layer(problem, frontier, parents, other_parents, neighbours, result):
+    """Expands one whole BFS layer, returns (next frontier, best meeting key)."""
+    next_frontier = []
+    meet, meet_len = None, None
+    for key, state in frontier:
+        for next_state, action in neighbours(state):
+            result.nodes_generated += 1
+            next_key = problem.hashable_state(next_state)
+            if next_key in parents:
+                result.duplicates_pruned += 1
+                continue
+            parents[next_key] = (key, action, next_state)
+            next_frontier.append((next_key, next_state))
+            if next_key in other_parents:
+                # shortest meeting has to be picked over the whole layer,
+                # the first hit isn't necessarily it
+                length = _chain_length(parents, next_key) + _chain_length(other_parents, next_key)
+                if meet_len is None or length < meet_len:
+                    meet, meet_len = next_key, length
+    return next_frontier, meet
+
+
+def _chain_length(parents: Parents, key: Hashable) -> int:
+    length = 0
+    while parents[key][0] is not None:
+        key = parents[key][0]
+        length += 1
+    return length
+
+
+def bidirectional_bfs(problem: SearchProblem) -> BidirectionalResult:
+    """
+    BFS from initial_state() and from every goal_states() at once, always
+    growing the smaller side. Needs problem.predecessors().
+    """
+    result = BidirectionalResult()
+    start = problem.initial_state()
+    start_key = problem.hashable_state(start)
+    forward: Parents = {start_key: (None, None, start)}
+    # backward parents point towards the goal: key -> (next key, action, state)
+    backward: Parents = {}
+    for goal in problem.goal_states():
+        backward[problem.hashable_state(goal)] = (None, None, goal)
+
+    forward_frontier = [(start_key, start)]
+    backward_frontier = [(key, state) for key, (_, _, state) in backward.items()]
+    result.forward_frontier_peak = 1
+    result.backward_frontier_peak = len(backward_frontier)
+
+    meet = start_key if start_key in backward else None
+    while meet is None and forward_frontier and backward_frontier:
+        if len(forward_frontier) <= len(backward_frontier):
+            result.forward_expanded += len(forward_frontier)
+            forward_frontier, meet = _expand_layer(
+                problem, forward_frontier, forward, backward, problem.successors, result)
+            result.forward_frontier_peak = max(result.forward_frontier_peak, len(forward_frontier))
+        else:
+            result.backward_expanded += len(backward_frontier)
+            backward_frontier, meet = _expand_layer(
+                problem, backward_frontier, backward, forward, problem.predecessors, result)
+            result.backward_frontier_peak = max(result.backward_frontier_peak, len(backward_frontier))
+    result.nodes_expanded = result.forward_expanded + result.backward_expanded
+    result.frontier_peak = result.forward_frontier_peak + result.backward_frontier_peak
+    result.visited_count = len(forward) + len(backward)
+
+    if meet is None:
+        return result
+
+    result.states, result.actions = reconstruct(forward, meet)
+    key = meet
+    while backward[key][0] is not None:
+        next_key, action, _ = backward[key]
+        result.actions.append(action)
+        result.states.append(backward[next_key][2])
+        key = next_key
+    return result
+
+
+class TranspositionTable:
+    """
+    Visited states keyed by a canonical form. Each entry keeps the first
+    concrete state seen for that key, its parent key and the action from
+    the parent, so the chain of stored states is a real sequence of moves.
+    """
+    def __init__(self):
+        self.parents: Parents = {}
+        self.depths: Dict[Hashable, int] = {}
+
+    def __contains__(self, key) -> bool:
+        return key in self.parents
+
+    def __len__(self) -> int:
+        return len(self.parents)
+
+    def add(self, key, parent_key, action, state, depth):
+        self.parents[key] = (parent_key, action, state)
+        self.depths[key] = depth
+
+    def state(self, key):
+        return self.parents[key][2]
+
+    def path(self, key) -> Tuple[List[Any], List[Any]]:
+        return reconstruct(self.parents, key)
+
+
+@dataclass
+class SymmetryResult(SearchResult):
+    # generated states dropped because an equivalent (not identical) state was already stored
+    symmetric_pruned: int = 0
+
+
+def symmetry_reduced_bfs(problem: SearchProblem) -> SymmetryResult:
+    """BFS over problem.canonical_state() classes instead of raw states."""
+    result = SymmetryResult()
+    table = TranspositionTable()
+    start = problem.initial_state()
+    start_key = problem.canonical_state(start)
+    table.add(start_key, None, None, start, 0)
+    result.visited_count = 1
+
+    if problem.is_goal(start):
+        result.states, result.actions = [start], []
+        return result
+
+    frontier = deque([start_key])
+    while frontier:
+        if len(frontier) > result.frontier_peak:
+            result.frontier_peak = len(frontier)
+        key = frontier.popleft()
+        # always expand the stored concrete state, so the path stays concrete
+        state = table.state(key)
+        depth = table.depths[key]
+        result.nodes_expanded += 1
+        for next_state, action in problem.successors(state):
+            result.nodes_generated += 1
+            next_key = problem.canonical_state(next_state)
+            if next_key in table:
+                result.duplicates_pruned += 1
+                if problem.hashable_state(table.state(next_key)) != problem.hashable_state(next_state):
+                    result.symmetric_pruned += 1
+                continue
+            table.add(next_key, key, action, next_state, depth + 1)
+            result.visited_count += 1
+            if problem.is_goal(next_state):
+                result.states, result.actions = table.path(next_key)
+                return result
+            frontier.append(next_key)
+    return result
+
+
+def _mirror_key(problem: SearchProblem, state) -> Hashable:
+    return frozenset((problem.hashable_state(state), problem.hashable_state(problem.mirror_state(state))))
+
+
+def mirror_bfs(problem: SearchProblem) -> SymmetryResult:
+    """
+    BFS from initial_state() that treats a state and its mirror image as one.
+    Reaching s at depth d when mirror(s) is stored at depth e means
+    start -> s followed by the mirror of (start -> mirror(s)) backwards is a
+    solution of d + e moves, so the search stops about half way down.
+    """
+    result = SymmetryResult()
+    table = TranspositionTable()
+    start = problem.initial_state()
+    start_key = _mirror_key(problem, start)
+    table.add(start_key, None, None, start, 0)
+    result.visited_count = 1
+
+    if problem.is_goal(start):
+        result.states, result.actions = [start], []
+        return result
+
+    # the search only works if mirror(start) is a goal. a problem that lists
+    # its goals can tell up front, e.g. cannibals with an unsafe start has an
+    # unsafe (so unlisted and unreachable) goal bank and nothing to find
+    goals = _listed_goals(problem)
+    if goals is not None:
+        if not goals:
+            return result
+        if problem.hashable_state(problem.mirror_state(start)) not in goals:
+            return _plain_fallback(problem, result)
+
+    # (length, near, far key): near is the state on our side, either a stored
+    # key or a fresh (parent key, action, state), far is its stored mirror partner
+    best = None
+
+    frontier = [start_key]
+    while frontier and best is None:
+        next_frontier = []
+        result.frontier_peak = max(result.frontier_peak, len(frontier))
+        for key in frontier:
+            state = table.state(key)
+            depth = table.depths[key]
+            result.nodes_expanded += 1
+            for next_state, action in problem.successors(state):
+                result.nodes_generated += 1
+                next_key = _mirror_key(problem, next_state)
+                if next_key not in table:
+                    table.add(next_key, key, action, next_state, depth + 1)
+                    result.visited_count += 1
+                    next_frontier.append(next_key)
+                    if problem.hashable_state(problem.mirror_state(next_state)) == problem.hashable_state(next_state):
+                        # its own mirror, the second half is this path mirrored
+                        if best is None or 2 * (depth + 1) < best[0]:
+                            best = (2 * (depth + 1), next_key, next_key)
+                    continue
+                result.duplicates_pruned += 1
+                stored = table.state(next_key)
+                if problem.hashable_state(stored) == problem.hashable_state(next_state):
+                    continue
+                # stored is our mirror image, keep the shortest meeting in this layer
+                result.symmetric_pruned += 1
+                length = depth + 1 + table.depths[next_key]
+                if best is None or length < best[0]:
+                    best = (length, (key, action, next_state), next_key)
+        frontier = next_frontier
+
+    if best is None:
+        return result
+
+    _, near, far = best
+    if isinstance(near, tuple):
+        parent_key, action, near_state = near
+        result.states, result.actions = table.path(parent_key)
+        result.states.append(near_state)
+        result.actions.append(action)
+    else:
+        result.states, result.actions = table.path(near)
+    # walk the far path backwards, mirrored. each step is a legal move, look
+    # up which action it was instead of asking the problem to mirror actions
+    far_states, _ = table.path(far)
+    for mirrored in (problem.mirror_state(s) for s in reversed(far_states[:-1])):
+        current = result.states[-1]
+        target = problem.hashable_state(mirrored)
+        action = next((a for s, a in problem.successors(current) if problem.hashable_state(s) == target), None)
+        if action is None:
+            # the mirrored step isn't a move here, so mirror_state isn't a
+            # real symmetry of this instance and nothing found this way can
+            # be trusted. only reachable for problems without goal_states()
+            return _plain_fallback(problem, result)
+        result.states.append(mirrored)
+        result.actions.append(action)
+    return result
+
+
+def _listed_goals(problem: SearchProblem) -> Optional[set]:
+    """hashable goal_states(), or None if the problem doesn't list them."""
+    try:
+        return {problem.hashable_state(goal) for goal in problem.goal_states()}
+    except NotImplementedError:
+        return None
+
+
+def _plain_fallback(problem: SearchProblem, wasted: SearchResult) -> SymmetryResult:
+    """Plain bfs() as a SymmetryResult, counting the work already thrown away."""
+    plain = bfs(problem)
+    return SymmetryResult(
+        states=plain.states, actions=plain.actions,
+        nodes_expanded=wasted.nodes_expanded + plain.nodes_expanded,
+        nodes_generated=wasted.nodes_generated + plain.nodes_generated,
+        duplicates_pruned=wasted.duplicates_pruned + plain.duplicates_pruned,
+        frontier_peak=max(wasted.frontier_peak, plain.frontier_peak),
+        visited_count=wasted.visited_count + plain.visited_count,
+        symmetric_pruned=wasted.symmetric_pruned)
@@ -11,4 +11,34 @@ class SearchProblem(ABC):
     def successors(self, state): pass
 
     @abstractmethod
-    def hashable_state(self, state): pass
\ No newline at end of file
+    def hashable_state(self, state): pass
+
+    # optional hooks for informed search, the defaults turn A* into
+    # uniform cost search with unit steps.
+    def heuristic(self, state):
+        return 0
+
+    def step_cost(self, state, action):
+        return 1
+
+    # optional reverse contract for bidirectional search. predecessors
+    # returns (previous_state, action) pairs where action takes
+    # previous_state to state.
+    def goal_states(self):
+        raise NotImplementedError(f"{type(self).__name__} has no explicit goal states")
+
+    def predecessors(self, state):
+        raise NotImplementedError(f"{type(self).__name__} can't be searched backwards")
+
+    # optional symmetry hooks.
+    # canonical_state maps every state to a key shared by all states that are
+    # interchangeable under a symmetry that also preserves is_goal (e.g. two
+    # jugs of the same size). symmetry_reduced_bfs dedups on it.
+    def canonical_state(self, state):
+        return self.hashable_state(state)
+
+    # mirror_state is an involution that swaps initial_state with the goal and
+    # turns every move into a move backwards (e.g. left/right bank with the
+    # boat flipped). mirror_bfs uses it to stop half way.
+    def mirror_state(self, state):
+        raise NotImplementedError(f"{type(self).__name__} has no mirror symmetry")
@@ -0,0 +1,176 @@
+"""
+Instrumentation for the search engine.
+
+The solvers count expansions, duplicates, frontier peak and visited size
+themselves since that's just integer bumps. Anything that costs real time
+(timing every successors()/is_goal() call, tracemalloc, printing a trace)
+lives in InstrumentedProblem, which only exists when you ask for it, so a
+plain bfs(problem) pays nothing for it.
+"""
+import json
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from typing import Callable, Optional
+
+from src.core.search import SearchResult
+from src.core.search_problem import SearchProblem
+
+
+@dataclass
+class SearchStats:
+    solver: str = ""
+    found: bool = False
+    depth: Optional[int] = None
+    nodes_expanded: int = 0
+    nodes_generated: int = 0
+    duplicates_pruned: int = 0
+    frontier_peak: int = 0
+    visited_peak: int = 0
+    successor_calls: int = 0
+    goal_tests: int = 0
+    successor_time_s: float = 0.0
+    goal_test_time_s: float = 0.0
+    wall_time_s: float = 0.0
+    # None when memory tracking was off
+    memory_peak_bytes: Optional[int] = None
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    def to_json(self, **kwargs) -> str:
+        return json.dumps(self.to_dict(), **kwargs)
+
+    def dump(self, path: str):
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+
+class SearchObserver:
+    """Hooks called by InstrumentedProblem, override what you need."""
+    def on_expand(self, state): pass
+
+    def on_generate(self, state, next_state, action): pass
+
+    def on_goal(self, state): pass
+
+
+class PrintTracer(SearchObserver):
+    """The old print() debugging, now only when tracing is asked for."""
+    def on_expand(self, state):
+        print(f"visiting {state}")
+
+    def on_generate(self, state, next_state, action):
+        print(f"Generating: {next_state} via {action}")
+
+    def on_goal(self, state):
+        print(f"GOAL REACHED! {state}")
+
+
+class InstrumentedProblem(SearchProblem):
+    """Wraps a problem and times every successors()/is_goal() call."""
+    def __init__(self, problem: SearchProblem, observer: Optional[SearchObserver] = None):
+        self.problem = problem
+        self.observer = observer
+        self.successor_calls = 0
+        self.goal_tests = 0
+        self.successor_time = 0.0
+        self.goal_test_time = 0.0
+
+    def initial_state(self):
+        return self.problem.initial_state()
+
+    def hashable_state(self, state):
+        return self.problem.hashable_state(state)
+
+    def successors(self, state):
+        start = time.perf_counter()
+        result = list(self.problem.successors(state))
+        self.successor_time += time.perf_counter() - start
+        self.successor_calls += 1
+        if self.observer is not None:
+            self.observer.on_expand(state)
+            for next_state, action in result:
+                self.observer.on_generate(state, next_state, action)
+        return result
+
+    def is_goal(self, state):
+        start = time.perf_counter()
+        goal = self.problem.is_goal(state)
+        self.goal_test_time += time.perf_counter() - start
+        self.goal_tests += 1
+        if goal and self.observer is not None:
+            self.observer.on_goal(state)
+        return goal
+
+    def heuristic(self, state):
+        return self.problem.heuristic(state)
+
+    def step_cost(self, state, action):
+        return self.problem.step_cost(state, action)
+
+    def goal_states(self):
+        return self.problem.goal_states()
+
+    def predecessors(self, state):
+        start = time.perf_counter()
+        result = list(self.problem.predecessors(state))
+        self.successor_time += time.perf_counter() - start
+        self.successor_calls += 1
+        return result
+
+    # SearchProblem has defaults for the symmetry hooks, so __getattr__ would
+    # never reach the wrapped problem's versions
+    def canonical_state(self, state):
+        return self.problem.canonical_state(state)
+
+    def mirror_state(self, state):
+        return self.problem.mirror_state(state)
+
+    def __getattr__(self, name):
+        # anything problem specific, e.g. codec()
+        return getattr(self.problem, name)
+
+
+def profile_search(solver: Callable[..., SearchResult], problem: SearchProblem, *args,
+                   trace: bool = False, observer: Optional[SearchObserver] = None,
+                   track_memory: bool = True, **kwargs) -> SearchResult:
+    """
+    Runs solver(problem, *args, **kwargs) under instrumentation and attaches
+    a SearchStats to result.stats. trace=True prints every expansion.
+    """
+    if trace and observer is None:
+        observer = PrintTracer()
+    instrumented = InstrumentedProblem(problem, observer)
+
+    started_tracing = track_memory and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    if track_memory:
+        tracemalloc.reset_peak()
+    start = time.perf_counter()
+    try:
+        result = solver(instrumented, *args, **kwargs)
+    finally:
+        wall = time.perf_counter() - start
+        memory_peak = tracemalloc.get_traced_memory()[1] if track_memory else None
+        if started_tracing:
+            tracemalloc.stop()
+
+    result.stats = SearchStats(
+        solver=getattr(solver, "__name__", str(solver)),
+        found=result.found,
+        depth=result.depth if result.found else None,
+        nodes_expanded=result.nodes_expanded,
+        nodes_generated=result.nodes_generated,
+        duplicates_pruned=result.duplicates_pruned,
+        frontier_peak=result.frontier_peak,
+        visited_peak=result.visited_count,
+        successor_calls=instrumented.successor_calls,
+        goal_tests=instrumented.goal_tests,
+        successor_time_s=instrumented.successor_time,
+        goal_test_time_s=instrumented.goal_test_time,
+        wall_time_s=wall,
+        memory_peak_bytes=memory_peak,
+    )
+    return result
@@ -0,0 +1,101 @@
+"""
+Every solution of a puzzle, one at a time.
+
+iter_solutions is a generator over all simple paths (no state repeated)
+from initial_state() to a goal. Nothing is explored past the solution the
+caller is currently holding, so taking the first k and stopping never walks
+the rest of the tree. A path ends at the first goal it reaches.
+
+The states on the current path are kept in a set next to the stack and
+pushed / popped with it, so the cycle check on every edge is O(1) instead
+of a scan of the path.
+
+    for result in iter_solutions(MissionariesCannibalsProblem(), max_count=3):
+        print(result.depth, result.actions)
+"""
+from itertools import count, islice
+from typing import Iterator, List, Optional
+
+from src.core.search import SearchResult
+from src.core.search_problem import SearchProblem
+
+
+class _Walk:
+    """State shared out of one depth-first pass, cutoff is set if the limit pruned a branch."""
+    def __init__(self):
+        self.cutoff = False
+
+
+def _paths(problem: SearchProblem, limit: Optional[int], exact: bool, walk: _Walk) -> Iterator[SearchResult]:
+    """
+    Simple paths to a goal with at most limit moves (exactly limit when
+    exact is set), depth first in successor order.
+    """
+    start = problem.initial_state()
+    if problem.is_goal(start):
+        if not exact or limit == 0:
+            yield SearchResult(states=[start])
+        return
+
+    states: List = [start]
+    actions: List = []
+    keys: List = [problem.hashable_state(start)]
+    on_path = set(keys)
+    # one successor iterator per state on the current path
+    stack = [iter(problem.successors(start))]
+    while stack:
+        step = next(stack[-1], None)
+        if step is None:
+            stack.pop()
+            states.pop()
+            on_path.discard(keys.pop())
+            if actions:
+                actions.pop()
+            continue
+
+        next_state, action = step
+        next_key = problem.hashable_state(next_state)
+        if next_key in on_path:
+            continue
+        depth = len(actions) + 1
+        if problem.is_goal(next_state):
+            if not exact or depth == limit:
+                yield SearchResult(states=states + [next_state], actions=actions + [action])
+            continue
+        if limit is not None and depth >= limit:
+            walk.cutoff = True
+            continue
+        states.append(next_state)
+        actions.append(action)
+        keys.append(next_key)
+        on_path.add(next_key)
+        stack.append(iter(problem.successors(next_state)))
+
+
+def _shortest_first(problem: SearchProblem, max_length: Optional[int]) -> Iterator[SearchResult]:
+    # iterative deepening, pass L only yields the paths of exactly L moves
+    for limit in count():
+        if max_length is not None and limit > max_length:
+            return
+        walk = _Walk()
+        yield from _paths(problem, limit, True, walk)
+        # nothing was cut off, so no simple path is any longer than this
+        if not walk.cutoff:
+            return
+
+
+def iter_solutions(problem: SearchProblem, max_length: Optional[int] = None, max_count: Optional[int] = None,
+                   shortest_first: bool = False) -> Iterator[SearchResult]:
+    """
+    Yields a SearchResult (states and actions only) per distinct solution.
+    max_length caps the number of moves, max_count the number of solutions.
+    shortest_first yields in order of length, re-walking the shallow part
+    of the tree once per length like iterative_deepening does.
+    """
+    if shortest_first:
+        solutions = _shortest_first(problem, max_length)
+    else:
+        solutions = _paths(problem, max_length, False, _Walk())
+    if max_count is not None:
+        solutions = islice(solutions, max_count)
+    return solutions
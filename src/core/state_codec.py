@@ -0,0 +1,104 @@
+"""
+Pack small puzzle states into a single int.
+
+Each field gets just enough bits for its max value, so a state is one
+Python int (hashed in C, no dataclass or tuple per state) and doubles as
+an index into a BitmapVisited bytearray. 500/500 cannibals is
+9 + 9 + 1 = 19 bits -> 64 KB of bitmap, 4000 x 4000 litre jugs is
+12 + 12 bits -> 2 MB.
+"""
+from typing import Sequence, Tuple
+
+
+class BitPackedCodec:
+    def __init__(self, field_maxes: Sequence[int]):
+        self.widths = [max(1, int(m).bit_length()) for m in field_maxes]
+        # shift for each field, the last field sits in the low bits
+        self.shifts = []
+        shift = 0
+        for width in reversed(self.widths):
+            self.shifts.append(shift)
+            shift += width
+        self.shifts.reverse()
+        self.masks = [(1 << w) - 1 for w in self.widths]
+        self.bits = shift
+
+    @property
+    def size(self) -> int:
+        """Number of distinct codes, i.e. how big a visited bitmap needs to be."""
+        return 1 << self.bits
+
+    def encode(self, state: Sequence[int]) -> int:
+        code = 0
+        for value, shift in zip(state, self.shifts):
+            code |= int(value) << shift
+        return code
+
+    def decode(self, code: int) -> Tuple[int, ...]:
+        return tuple((code >> shift) & mask for shift, mask in zip(self.shifts, self.masks))
+
+
+class JugCodec(BitPackedCodec):
+    """(x, y) jug levels."""
+    def __init__(self, cap1: int, cap2: int):
+        super().__init__([cap1, cap2])
+        self.y_bits = self.widths[1]
+        self.y_mask = self.masks[1]
+
+    # two field fast paths, these sit in the hot loop
+    def encode(self, state: Sequence[int]) -> int:
+        x, y = state
+        return (x << self.y_bits) | y
+
+    def decode(self, code: int) -> Tuple[int, int]:
+        return code >> self.y_bits, code & self.y_mask
+
+
+class CannibalsCodec(BitPackedCodec):
+    """(left_missionaries, left_cannibals, boat side)."""
+    def __init__(self, missionaries: int, cannibals: int):
+        super().__init__([missionaries, cannibals, 1])
+
+
+class PrepackedCodec(BitPackedCodec):
+    """
+    For problems whose states already are packed ints (e.g. MultiJugProblem).
+    encode/decode pass the int through, pack/unpack convert to and from tuples.
+    """
+    def encode(self, state: int) -> int:
+        return state
+
+    def decode(self, code: int) -> int:
+        return code
+
+    def pack(self, fields: Sequence[int]) -> int:
+        return super().encode(fields)
+
+    def unpack(self, code: int) -> Tuple[int, ...]:
+        return super().decode(code)
+
+
+class BitmapVisited:
+    """Visited set over packed int states, one bit per possible code."""
+    def __init__(self, size: int):
+        self.bits = bytearray((size + 7) >> 3)
+        self.count = 0
+
+    def __contains__(self, code: int) -> bool:
+        return bool(self.bits[code >> 3] & (1 << (code & 7)))
+
+    def add(self, code: int) -> bool:
+        """Marks code as visited, returns False if it already was."""
+        index, bit = code >> 3, 1 << (code & 7)
+        if self.bits[index] & bit:
+            return False
+        self.bits[index] |= bit
+        self.count += 1
+        return True
+
+    def __len__(self) -> int:
+        return self.count
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.bits)
@@ -0,0 +1,225 @@
+"""
+Compile a puzzle's state graph to CSR arrays and query it with NumPy.
+
+For fixed parameters (jug capacities, N/M/k) the state graph never
+changes, so enumerate it once: every reachable state gets a dense id,
+edges are indptr/indices arrays plus an action code per edge, and the
+whole thing saves to a .npz. After that a goal query is one vectorized
+multi-source BFS over the reversed edges, and every state's distance and
+next move toward the goal is an array lookup.
+"""
+from collections import deque
+from typing import Any, Callable, List, Optional, Sequence
+
+import numpy as np
+
+from src.core.search import SearchResult
+from src.core.search_problem import SearchProblem
+from src.core.state_codec import BitPackedCodec
+
+UNREACHABLE = -1
+
+
+class StateGraph:
+    def __init__(self, codes: np.ndarray, indptr: np.ndarray, indices: np.ndarray, actions: np.ndarray,
+                 action_labels: Sequence[Any], shifts: Sequence[int], masks: Sequence[int],
+                 codec: Optional[BitPackedCodec] = None):
+        self.codes = codes
+        self.indptr = indptr
+        self.indices = indices
+        self.actions = actions
+        self.action_labels = list(action_labels)
+        self.shifts = np.asarray(shifts, dtype=np.int64)
+        self.masks = np.asarray(masks, dtype=np.int64)
+        # the problem's codec, so state() gives back the problem's own state
+        # type (e.g. packed ints for MultiJugProblem). a loaded graph has none
+        # unless one is passed to load()
+        self.codec = codec
+        self._id_of = None
+        self._reverse = None
+
+    @property
+    def num_states(self) -> int:
+        return len(self.codes)
+
+    @property
+    def num_edges(self) -> int:
+        return len(self.indices)
+
+    def decoded(self) -> np.ndarray:
+        """(num_states, fields) array of the states, e.g. (x, y) per row for jugs."""
+        return (self.codes[:, None] >> self.shifts[None, :]) & self.masks[None, :]
+
+    def state(self, node: int):
+        if self.codec is not None:
+            return self.codec.decode(int(self.codes[node]))
+        return tuple(int(v) for v in (int(self.codes[node]) >> self.shifts) & self.masks)
+
+    def node_of(self, code: int) -> int:
+        if self._id_of is None:
+            self._id_of = {int(c): i for i, c in enumerate(self.codes)}
+        return self._id_of.get(int(code), UNREACHABLE)
+
+    def reverse(self):
+        """(indptr, sources, actions) with edges grouped by their target."""
+        if self._reverse is None:
+            sources = np.repeat(np.arange(self.num_states, dtype=np.int64), np.diff(self.indptr))
+            order = np.argsort(self.indices, kind="stable")
+            counts = np.bincount(self.indices, minlength=self.num_states)
+            indptr = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+            self._reverse = (indptr, sources[order], self.actions[order])
+        return self._reverse
+
+    def save(self, path: str):
+        # labels are stored as strings, a loaded graph reports str(label)
+        np.savez_compressed(path, codes=self.codes, indptr=self.indptr, indices=self.indices,
+                            actions=self.actions, action_labels=np.array([str(l) for l in self.action_labels]),
+                            shifts=self.shifts, masks=self.masks)
+
+    @classmethod
+    def load(cls, path: str, codec: Optional[BitPackedCodec] = None) -> "StateGraph":
+        with np.load(path) as data:
+            return cls(data["codes"], data["indptr"], data["indices"], data["actions"],
+                       data["action_labels"].tolist(), data["shifts"], data["masks"], codec)
+
+
+def compile_graph(problem: SearchProblem, codec: Optional[BitPackedCodec] = None) -> StateGraph:
+    """Enumerates everything reachable from problem.initial_state(), node 0 is the start."""
+    codec = codec or problem.codec()
+    encode = codec.encode
+    start = problem.initial_state()
+    ids = {encode(start): 0}
+    codes = [encode(start)]
+    label_ids = {}
+    labels: List[Any] = []
+    indptr = [0]
+    indices: List[int] = []
+    actions: List[int] = []
+
+    frontier = deque([start])
+    while frontier:
+        state = frontier.popleft()
+        for next_state, action in problem.successors(state):
+            code = encode(next_state)
+            node = ids.get(code)
+            if node is None:
+                node = ids[code] = len(codes)
+                codes.append(code)
+                frontier.append(next_state)
+            if action not in label_ids:
+                label_ids[action] = len(labels)
+                labels.append(action)
+            indices.append(node)
+            actions.append(label_ids[action])
+        indptr.append(len(indices))
+
+    return StateGraph(np.array(codes, dtype=np.int64), np.array(indptr, dtype=np.int64),
+                      np.array(indices, dtype=np.int64), np.array(actions, dtype=np.int16),
+                      labels, codec.shifts, codec.masks, codec)
+
+
+def _neighbours(indptr: np.ndarray, frontier: np.ndarray):
+    """All edges out of the frontier as (edge positions, source of each edge)."""
+    starts = indptr[frontier]
+    counts = indptr[frontier + 1] - starts
+    total = int(counts.sum())
+    if total == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    sources = np.repeat(frontier, counts)
+    # position of every edge: start of its source's row plus its offset in the row
+    offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+    return np.repeat(starts, counts) + offsets, sources
+
+
+def bfs_distances(graph: StateGraph, sources, reverse: bool = False):
+    """
+    Multi-source BFS, a whole layer per step. Returns (distance, via) where
+    via[v] is the node v was reached from (its parent going forward, its
+    next hop toward a source when reverse=True), UNREACHABLE where unset.
+    """
+    if reverse:
+        indptr, targets, _ = graph.reverse()
+    else:
+        indptr, targets = graph.indptr, graph.indices
+    distance = np.full(graph.num_states, UNREACHABLE, dtype=np.int64)
+    via = np.full(graph.num_states, UNREACHABLE, dtype=np.int64)
+    frontier = np.unique(np.asarray(sources, dtype=np.int64))
+    distance[frontier] = 0
+    depth = 0
+    while len(frontier):
+        depth += 1
+        edges, edge_sources = _neighbours(indptr, frontier)
+        reached = targets[edges]
+        fresh = distance[reached] == UNREACHABLE
+        reached, edge_sources = reached[fresh], edge_sources[fresh]
+        reached, first = np.unique(reached, return_index=True)
+        distance[reached] = depth
+        via[reached] = edge_sources[first]
+        frontier = reached
+    return distance, via
+
+
+def all_pairs_distances(graph: StateGraph) -> np.ndarray:
+    """
+    (n, n) int32 matrix, [i, j] is the fewest moves from i to j or -1.
+    Every source is searched at once: the frontier is a flat array of
+    (source, node) pairs, so a BFS layer is a few array ops however many
+    sources are still going.
+    """
+    n = graph.num_states
+    result = np.full((n, n), UNREACHABLE, dtype=np.int32)
+    flat = result.reshape(-1)
+    sources = np.arange(n, dtype=np.int64)
+    nodes = sources.copy()
+    flat[sources * n + nodes] = 0
+    out_degree = np.diff(graph.indptr)
+    depth = 0
+    while len(nodes):
+        depth += 1
+        edges, _ = _neighbours(graph.indptr, nodes)
+        cells = np.repeat(sources, out_degree[nodes]) * n + graph.indices[edges]
+        cells = np.unique(cells[flat[cells] == UNREACHABLE])
+        flat[cells] = depth
+        sources, nodes = np.divmod(cells, n)
+    return result
+
+
+class GoalIndex:
+    """Distance and next move toward the nearest goal, for every state at once."""
+    def __init__(self, graph: StateGraph, goal_mask: np.ndarray):
+        self.graph = graph
+        self.goal_mask = np.asarray(goal_mask, dtype=bool)
+        self.distance, self.next_hop = bfs_distances(graph, np.flatnonzero(self.goal_mask), reverse=True)
+
+    @classmethod
+    def for_problem(cls, graph: StateGraph, problem: SearchProblem) -> "GoalIndex":
+        codec = graph.codec
+        if codec is None and hasattr(problem, "codec"):
+            codec = problem.codec()
+        if codec is None:
+            states = (graph.state(i) for i in range(graph.num_states))
+        else:
+            states = (codec.decode(int(code)) for code in graph.codes)
+        return cls(graph, np.array([problem.is_goal(state) for state in states], dtype=bool))
+
+    @classmethod
+    def where(cls, graph: StateGraph, predicate: Callable[[np.ndarray], np.ndarray]) -> "GoalIndex":
+        """predicate gets graph.decoded() and returns the goal mask, e.g. (s == 4).any(axis=1)."""
+        return cls(graph, predicate(graph.decoded()))
+
+    def distance_from(self, nodes) -> np.ndarray:
+        return self.distance[np.asarray(nodes, dtype=np.int64)]
+
+    def path(self, node: int = 0) -> SearchResult:
+        result = SearchResult()
+        if self.distance[node] == UNREACHABLE:
+            return result
+        result.states.append(self.graph.state(node))
+        while not self.goal_mask[node]:
+            next_node = int(self.next_hop[node])
+            row = slice(self.graph.indptr[node], self.graph.indptr[node + 1])
+            edge = np.flatnonzero(self.graph.indices[row] == next_node)[0]
+            result.actions.append(self.graph.action_labels[self.graph.actions[row][edge]])
+            result.states.append(self.graph.state(next_node))
+            node = next_node
+        return result
@@ -1,4 +1,10 @@
+import sys
+
 from src.algo.__water_jug_problem import solve_water_jug
+from src.algo.water_jug_batch import main as batch_main
 
 if __name__ == "__main__":
-    solve_water_jug(3, 5, 4)
\ No newline at end of file
+    # python -m src.main batch [--workers N] [--ordered] < instances.csv
+    if sys.argv[1:2] == ["batch"]:
+        sys.exit(batch_main(sys.argv[2:]))
+    print(solve_water_jug(3, 5, 4))
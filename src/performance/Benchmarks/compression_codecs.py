@@ -0,0 +1,175 @@
+"""
+Codec registry for the compression benchmarks.
+
+Every codec declares its name, CSV label, level range and how to
+compress, decompress and stream. The benchmark scripts loop over
+available_codecs() instead of hardcoding gzip and brotli, so adding a
+codec here adds it to every benchmark.
+
+brotli and zstd are optional. zstd comes from compression.zstd (Python
+3.14+) or the zstandard package, whichever imports.
+"""
+import bz2, gzip, lzma, zlib
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    from compression import zstd
+except ImportError:
+    zstd = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+class StreamCompressor:
+    """
+    Incremental compressor used by the streaming benchmarks.
+    compress() buffers, flush() pushes out everything fed so far as
+    decodable bytes without ending the stream, finish() ends it.
+    """
+    def compress(self, chunk: bytes) -> bytes: ...
+
+    def flush(self) -> bytes: ...
+
+    def finish(self) -> bytes: ...
+
+
+class ZlibStream(StreamCompressor):
+    def __init__(self, level, wbits, zdict=None):
+        if zdict is None:
+            self.obj = zlib.compressobj(level, zlib.DEFLATED, wbits)
+        else:
+            self.obj = zlib.compressobj(level, zlib.DEFLATED, wbits, zdict=zdict)
+
+    def compress(self, chunk):
+        return self.obj.compress(chunk)
+
+    def flush(self):
+        return self.obj.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        return self.obj.flush(zlib.Z_FINISH)
+
+
+class BrotliStream(StreamCompressor):
+    def __init__(self, level):
+        self.obj = brotli.Compressor(quality=level)
+
+    def compress(self, chunk):
+        return self.obj.process(chunk)
+
+    def flush(self):
+        return self.obj.flush()
+
+    def finish(self):
+        return self.obj.finish()
+
+
+class ZstdStream(StreamCompressor):
+    def __init__(self, level, zdict=None):
+        if zstd is not None:
+            self.obj = zstd.ZstdCompressor(level=level, zstd_dict=zdict)
+            self.block = zstd.ZstdCompressor.FLUSH_BLOCK
+            self.end = zstd.ZstdCompressor.FLUSH_FRAME
+        else:
+            self.obj = zstandard.ZstdCompressor(level=level, dict_data=zdict).compressobj()
+            self.block = zstandard.COMPRESSOBJ_FLUSH_BLOCK
+            self.end = zstandard.COMPRESSOBJ_FLUSH_FINISH
+
+    def compress(self, chunk):
+        return self.obj.compress(chunk)
+
+    def flush(self):
+        return self.obj.flush(self.block)
+
+    def finish(self):
+        return self.obj.flush(self.end)
+
+
+@dataclass(frozen=True)
+class Codec:
+    name: str
+    label: str
+    levels: Sequence[int]
+    compress: Callable[[bytes, int], bytes]
+    decompress: Callable[[bytes], bytes]
+    # None when the codec can't flush mid stream (bz2, lzma)
+    stream: Optional[Callable[[int], StreamCompressor]] = None
+
+
+def _zstd_codec() -> Optional[Codec]:
+    if zstd is not None:
+        return Codec("zstd", "Zstd", range(1, 20),
+                     lambda d, level: zstd.compress(d, level=level),
+                     zstd.decompress,
+                     ZstdStream)
+    if zstandard is not None:
+        return Codec("zstd", "Zstd", range(1, 20),
+                     lambda d, level: zstandard.ZstdCompressor(level=level).compress(d),
+                     # decompressobj also takes frames without a content size, e.g. streamed ones
+                     lambda d: zstandard.ZstdDecompressor().decompressobj().decompress(d),
+                     ZstdStream)
+    return None
+
+
+def _build_registry() -> Dict[str, Codec]:
+    codecs = [
+        Codec("gzip", "Gzip", range(1, 10),
+              lambda d, level: gzip.compress(d, compresslevel=level),
+              gzip.decompress,
+              lambda level: ZlibStream(level, 16 + zlib.MAX_WBITS)),
+        # raw deflate, no zlib or gzip header, what Content-Encoding: deflate
+        # usually ends up being in practice
+        Codec("deflate", "Deflate", range(1, 10),
+              lambda d, level: _raw_deflate(d, level),
+              lambda d: zlib.decompress(d, -zlib.MAX_WBITS),
+              lambda level: ZlibStream(level, -zlib.MAX_WBITS)),
+    ]
+    if brotli is not None:
+        codecs.append(Codec("brotli", "Brotli", range(1, 10),
+                            lambda d, level: brotli.compress(d, quality=level),
+                            brotli.decompress,
+                            BrotliStream))
+    codecs += [
+        Codec("lzma", "LZMA", range(0, 10),
+              lambda d, level: lzma.compress(d, preset=level),
+              lzma.decompress),
+        Codec("bz2", "BZ2", range(1, 10),
+              lambda d, level: bz2.compress(d, compresslevel=level),
+              bz2.decompress),
+    ]
+    zstd_codec = _zstd_codec()
+    if zstd_codec is not None:
+        codecs.append(zstd_codec)
+    return {codec.name: codec for codec in codecs}
+
+
+def _raw_deflate(data, level):
+    obj = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS)
+    return obj.compress(data) + obj.flush()
+
+
+CODECS: Dict[str, Codec] = _build_registry()
+
+
+def available_codecs(names: Optional[Sequence[str]] = None) -> List[Codec]:
+    """Registered codecs in registry order, or just the named ones."""
+    if not names:
+        return list(CODECS.values())
+    missing = [name for name in names if name not in CODECS]
+    if missing:
+        raise KeyError(f"unknown or unavailable codec(s): {', '.join(missing)} "
+                       f"(have {', '.join(CODECS)})")
+    return [CODECS[name] for name in names]
+
+
+def get_codec(name: str) -> Codec:
+    return available_codecs([name])[0]
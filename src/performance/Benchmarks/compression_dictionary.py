@@ -0,0 +1,179 @@
+"""
+Shared-dictionary compression for the payload corpus.
+
+Every GraphQL response starts with the same field names, and a small
+payload is over before the compressor has seen them twice. Priming the
+compressor with a dictionary built from other payloads fixes that. This
+splits payloads/*.json into a training and a held-out set, builds a
+dictionary from the training set and compares dictionary-primed
+compression of the held-out payloads against plain compression with the
+same codec and level, grouped by payload size.
+
+  deflate  zlib zdict, at most 32 KB. Built from the JSON string tokens
+           (mostly keys) that save the most bytes, best ones last since
+           deflate reaches the end of the window cheapest.
+  zstd     zstd's own trainer, when compression.zstd or zstandard imports.
+"""
+import random
+import re
+import time
+import zlib
+from collections import Counter
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Sequence, Tuple
+
+from compression_codecs import get_codec, zstandard, zstd
+
+ZLIB_DICT_SIZE = 32 * 1024
+ZSTD_DICT_SIZE = 64 * 1024
+# training payloads are cut into samples this big, zstd's trainer wants many
+SAMPLE_SIZE = 4096
+RUNS_PER_PAYLOAD = 20
+
+# (upper bound in bytes, label), the last bucket catches everything else
+SIZE_BUCKETS = [(4 * 1024, "<4KB"), (16 * 1024, "4-16KB"), (64 * 1024, "16-64KB"),
+                (256 * 1024, "64-256KB"), (float("inf"), ">=256KB")]
+
+_TOKEN = re.compile(rb'"(?:[^"\\]|\\.){1,64}"\s*:?')
+
+
+@dataclass
+class DictCodec:
+    name: str
+    level: int
+    train: Callable[[List[bytes]], object]
+    compress: Callable[[bytes, object], bytes]
+    decompress: Callable[[bytes, object], bytes]
+
+
+def size_bucket(size: int) -> str:
+    for limit, label in SIZE_BUCKETS:
+        if size < limit:
+            return label
+    return SIZE_BUCKETS[-1][1]
+
+
+def split_corpus(paths: Sequence, train_fraction: float = 0.5, seed: int = 0) -> Tuple[list, list]:
+    """(train, held_out), at least one payload in each."""
+    paths = sorted(paths)
+    random.Random(seed).shuffle(paths)
+    cut = min(max(1, int(len(paths) * train_fraction)), len(paths) - 1)
+    return sorted(paths[:cut]), sorted(paths[cut:])
+
+
+def samples_of(payloads: Sequence[bytes], sample_size: int = SAMPLE_SIZE) -> List[bytes]:
+    return [data[i:i + sample_size] for data in payloads for i in range(0, len(data), sample_size)]
+
+
+def train_zlib_dict(samples: Sequence[bytes], size: int = ZLIB_DICT_SIZE) -> bytes:
+    counts = Counter(token for sample in samples for token in _TOKEN.findall(sample))
+    # bytes saved if every repeat became a back reference
+    ranked = sorted((token for token, n in counts.items() if n > 1),
+                    key=lambda token: counts[token] * len(token), reverse=True)
+    picked, used = [], 0
+    for token in ranked:
+        if used + len(token) > size:
+            continue
+        picked.append(token)
+        used += len(token)
+    picked.reverse()
+    return b"".join(picked)
+
+
+def _deflate_with_dict(level):
+    def compress(data, zdict):
+        obj = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS, zdict=zdict)
+        return obj.compress(data) + obj.flush()
+
+    def decompress(data, zdict):
+        return zlib.decompressobj(-zlib.MAX_WBITS, zdict=zdict).decompress(data)
+
+    return DictCodec("deflate", level, train_zlib_dict, compress, decompress)
+
+
+def _zstd_with_dict(level):
+    if zstd is not None:
+        return DictCodec("zstd", level,
+                         lambda samples: zstd.train_dict(samples, ZSTD_DICT_SIZE),
+                         lambda data, d: zstd.compress(data, level=level, zstd_dict=d),
+                         lambda data, d: zstd.decompress(data, zstd_dict=d))
+    return DictCodec("zstd", level,
+                     lambda samples: zstandard.train_dictionary(ZSTD_DICT_SIZE, samples),
+                     lambda data, d: zstandard.ZstdCompressor(level=level, dict_data=d).compress(data),
+                     lambda data, d: zstandard.ZstdDecompressor(dict_data=d).decompress(data))
+
+
+def dictionary_codecs(deflate_level: int = 6, zstd_level: int = 3) -> List[DictCodec]:
+    codecs = [_deflate_with_dict(deflate_level)]
+    if zstd is not None or zstandard is not None:
+        codecs.append(_zstd_with_dict(zstd_level))
+    return codecs
+
+
+def _cpu_ms(fn, runs):
+    start = time.process_time()
+    for _ in range(runs):
+        result = fn()
+    return (time.process_time() - start) / runs * 1000, result
+
+
+def compare_payload(codec: DictCodec, dictionary, name: str, data: bytes, runs: int = RUNS_PER_PAYLOAD) -> dict:
+    plain = get_codec(codec.name)
+    plain_ms, plain_out = _cpu_ms(lambda: plain.compress(data, codec.level), runs)
+    dict_ms, dict_out = _cpu_ms(lambda: codec.compress(data, dictionary), runs)
+
+    integrity = "PASS"
+    try:
+        if codec.decompress(dict_out, dictionary) != data:
+            integrity = "FAIL"
+    except Exception as e:
+        integrity = f"ERROR ({str(e)})"
+
+    return {
+        "payload_name": name,
+        "size_bucket": size_bucket(len(data)),
+        "algo": codec.name,
+        "level": codec.level,
+        "orig_size_bytes": len(data),
+        "plain_bytes": len(plain_out),
+        "dict_bytes": len(dict_out),
+        "plain_ratio": round(len(data) / len(plain_out), 2),
+        "dict_ratio": round(len(data) / len(dict_out), 2),
+        "ratio_gain_pct": round((len(plain_out) - len(dict_out)) / len(plain_out) * 100, 2),
+        "plain_cpu_ms": round(plain_ms, 3),
+        "dict_cpu_ms": round(dict_ms, 3),
+        "cpu_gain_pct": round((plain_ms - dict_ms) / plain_ms * 100, 2) if plain_ms else 0.0,
+        "integrity": integrity,
+    }
+
+
+def run_dictionary_stage(train: Dict[str, bytes], held_out: Dict[str, bytes],
+                         codecs: Sequence[DictCodec] = None, runs: int = RUNS_PER_PAYLOAD) -> List[dict]:
+    """One row per (codec, held-out payload)."""
+    samples = samples_of(list(train.values()))
+    rows = []
+    for codec in codecs or dictionary_codecs():
+        dictionary = codec.train(samples)
+        for name, data in held_out.items():
+            rows.append(compare_payload(codec, dictionary, name, data, runs))
+    return rows
+
+
+def summarize_by_bucket(rows: Sequence[dict]) -> List[dict]:
+    """Mean ratio and CPU gains per (codec, size bucket), in bucket order."""
+    order = {label: index for index, (_, label) in enumerate(SIZE_BUCKETS)}
+    groups: Dict[Tuple[str, str], List[dict]] = {}
+    for row in rows:
+        groups.setdefault((row["algo"], row["size_bucket"]), []).append(row)
+    summary = []
+    for (algo, bucket), group in sorted(groups.items(), key=lambda item: (item[0][0], order[item[0][1]])):
+        summary.append({
+            "algo": algo,
+            "size_bucket": bucket,
+            "payloads": len(group),
+            "plain_bytes": sum(r["plain_bytes"] for r in group),
+            "dict_bytes": sum(r["dict_bytes"] for r in group),
+            "mean_ratio_gain_pct": round(sum(r["ratio_gain_pct"] for r in group) / len(group), 2),
+            "mean_cpu_gain_pct": round(sum(r["cpu_gain_pct"] for r in group) / len(group), 2),
+        })
+    return summary
@@ -1,11 +1,14 @@
-import gzip, brotli, hashlib, time, resource, csv, psutil, os
+import hashlib, csv, psutil, os, argparse
 from pathlib import Path
 from datetime import datetime
 
+from compression_codecs import available_codecs
+from compression_streaming import DEFAULT_CHUNK_SIZES, stream_and_report
+from compression_timing import MAX_RUNS, TARGET_REL_CI, WARMUP_RUNS, measure
+
 # === Settings ===
-RUNS_PER_LEVEL = 20
-GZIP_LEVELS = range(1, 10)
-BROTLI_LEVELS = range(1, 10)
+# runs per level are adaptive, warmup and CI target live in compression_timing
+# levels come from each codec in compression_codecs
 # Simulated network bandwidths in bits per second
 # These are used to estimate network transfer time using:
 #
@@ -31,42 +34,25 @@ def md5(data):
 def get_memory_usage_kb():
     return psutil.Process(os.getpid()).memory_info().rss / 1024
 
-def compress_and_report(label, data, compress_fn):
-    total_time = 0
-    total_user_cpu = 0
-    total_sys_cpu = 0
-    compressed_size = None
+def compress_and_report(codec, level, data, **timing):
+    # timing goes to compression_timing.measure: warmup, min_runs, max_runs, target_rel_ci
+    label = f"{codec.label} Level {level}"
+    stats = measure(lambda: codec.compress(data, level), **timing)
+    compressed = stats.result
+    compressed_size = len(compressed)
     integrity = "PASS"
-
-    for _ in range(RUNS_PER_LEVEL):
-        start = time.perf_counter()
-        ru_start = resource.getrusage(resource.RUSAGE_SELF)
-
-        compressed = compress_fn(data)
-
-        ru_end = resource.getrusage(resource.RUSAGE_SELF)
-        end = time.perf_counter()
-
-        total_time += (end - start)
-        total_user_cpu += (ru_end.ru_utime - ru_start.ru_utime)
-        total_sys_cpu += (ru_end.ru_stime - ru_start.ru_stime)
-
-        if compressed_size is None:
-            compressed_size = len(compressed)
-            try:
-                if label.startswith("Gzip"):
-                    decompressed = gzip.decompress(compressed)
-                else:
-                    decompressed = brotli.decompress(compressed)
-                if md5(decompressed) != md5(data):
-                    integrity = "FAIL"
-            except Exception as e:
-                integrity = f"ERROR ({str(e)})"
+    try:
+        decompressed = codec.decompress(compressed)
+        if md5(decompressed) != md5(data):
+            integrity = "FAIL"
+    except Exception as e:
+        integrity = f"ERROR ({str(e)})"
 
     mem_kb = get_memory_usage_kb()
-    avg_time_ms = (total_time / RUNS_PER_LEVEL) * 1000
-    avg_user_cpu_ms = (total_user_cpu / RUNS_PER_LEVEL) * 1000
-    avg_sys_cpu_ms = (total_sys_cpu / RUNS_PER_LEVEL) * 1000
+    # mean of the runs left after outlier rejection
+    avg_time_ms = stats.mean * 1000
+    avg_user_cpu_ms = stats.user_cpu_s * 1000
+    avg_sys_cpu_ms = stats.sys_cpu_s * 1000
 
     # Network transfer time estimates (ms)
     network_costs = {
@@ -76,12 +62,13 @@ def compress_and_report(label, data, compress_fn):
 
     return {
         "label": label,
-        "algo": "gzip" if "Gzip" in label else "brotli",
-        "level": int(label.split()[-1]),
+        "algo": codec.name,
+        "level": level,
         "orig_size_bytes": len(data),
         "compressed_bytes": compressed_size,
         "compression_ratio": round(len(data) / compressed_size, 2),
         "avg_wall_time_ms": round(avg_time_ms, 2),
+        **stats.to_ms_columns(),
         "avg_user_cpu_ms": round(avg_user_cpu_ms, 2),
         "avg_sys_cpu_ms": round(avg_sys_cpu_ms, 2),
         "mem_kb": round(mem_kb, 2),
@@ -95,22 +82,36 @@ def compress_and_report(label, data, compress_fn):
     }
 
 # === Main Run ===
-def main():
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compress one payload with every registered codec at every level.")
+    parser.add_argument("--codec", action="append", help="only this codec, can be given more than once")
+    parser.add_argument("--stream", action="store_true", help="chunked compression with flushes instead of one-shot")
+    parser.add_argument("--chunk-size", type=int, action="append", help=f"stream chunk size in bytes, default {DEFAULT_CHUNK_SIZES}")
+    parser.add_argument("--flush-every", type=int, default=1, help="flush after this many chunks")
+    parser.add_argument("--warmup", type=int, default=WARMUP_RUNS, help="untimed runs before measuring")
+    parser.add_argument("--target-ci", type=float, default=TARGET_REL_CI, help="stop once the 95%% CI half width is this fraction of the mean")
+    parser.add_argument("--max-runs", type=int, default=MAX_RUNS, help="give up on the CI target after this many runs")
+    args = parser.parse_args(argv)
+    timing = {"warmup": args.warmup, "target_rel_ci": args.target_ci, "max_runs": args.max_runs}
+
     input_path = "response.json"
-    output_prefix = "compression_compare"
+    output_prefix = "compression_stream" if args.stream else "compression_compare"
 
     data = Path(input_path).read_bytes()
     results = []
 
-    for level in GZIP_LEVELS:
-        label = f"Gzip Level {level}"
-        compress_fn = lambda d: gzip.compress(d, compresslevel=level)
-        results.append(compress_and_report(label, data, compress_fn))
-
-    for level in BROTLI_LEVELS:
-        label = f"Brotli Level {level}"
-        compress_fn = lambda d: brotli.compress(d, quality=level)
-        results.append(compress_and_report(label, data, compress_fn))
+    for codec in available_codecs(args.codec):
+        if args.stream and codec.stream is None:
+            print(f"skipping {codec.name}, it can't flush mid stream")
+            continue
+        for level in codec.levels:
+            if not args.stream:
+                results.append(compress_and_report(codec, level, data, **timing))
+                continue
+            for chunk_size in args.chunk_size or DEFAULT_CHUNK_SIZES:
+                result = stream_and_report(codec, level, data, chunk_size, args.flush_every, **timing)
+                results.append(result)
+                print(f"  {result['label']} chunk {chunk_size}: TTFB={result['ttfb_ms']:.3f} ms, Ratio loss={result['ratio_loss_pct']:.2f}%")
 
     # Write results
     timestamp = datetime.now().isoformat(timespec="seconds").replace(":", "-")
@@ -1,11 +1,16 @@
-import gzip, brotli, hashlib, time, resource, csv, psutil, os
+import hashlib, csv, psutil, os, argparse
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 from datetime import datetime
 
+from compression_codecs import available_codecs, get_codec
+from compression_dictionary import run_dictionary_stage, split_corpus, summarize_by_bucket
+from compression_timing import MAX_RUNS, TARGET_REL_CI, WARMUP_RUNS, measure
+
 # === Settings ===
-RUNS_PER_LEVEL = 20
-GZIP_LEVELS = range(1, 10)
-BROTLI_LEVELS = range(1, 10)
+# runs per level are adaptive, warmup and CI target live in compression_timing
+# levels come from each codec in compression_codecs
 
 NETWORK_PROFILES = {
     "3G": 400_000,
@@ -24,45 +29,25 @@ def get_memory_usage_kb():
     # passing it around, or caching it. For now, this is okay.
     return psutil.Process(os.getpid()).memory_info().rss / 1024
 
-def compress_and_report(label, data, compress_fn):
-    total_time = 0
-    total_user_cpu = 0
-    total_sys_cpu = 0
-    compressed_size = None
+def compress_and_report(codec, level, data, **timing):
+    # timing goes to compression_timing.measure: warmup, min_runs, max_runs, target_rel_ci
+    label = f"{codec.label} Level {level}"
+    stats = measure(lambda: codec.compress(data, level), **timing)
+    compressed = stats.result
+    compressed_size = len(compressed)
     integrity = "PASS"
+    try:
+        decompressed = codec.decompress(compressed)
+        if md5(decompressed) != md5(data):
+            integrity = "FAIL"
+    except Exception as e:
+        integrity = f"ERROR ({str(e)})"
 
-    for _ in range(RUNS_PER_LEVEL):
-        start = time.perf_counter()
-        ru_start = resource.getrusage(resource.RUSAGE_SELF)
-
-        compressed = compress_fn(data)
-
-        ru_end = resource.getrusage(resource.RUSAGE_SELF)
-        end = time.perf_counter()
-
-        total_time += (end - start)
-        #amount of time the CPU spent actively executing instructions in user mode
-        total_user_cpu += (ru_end.ru_utime - ru_start.ru_utime)
-        #measures the amount of time the CPU spent executing instructions in kernel
-        total_sys_cpu += (ru_end.ru_stime - ru_start.ru_stime)
-
-        if compressed_size is None:
-            compressed_size = len(compressed)
-            try:
-                if label.startswith("Gzip"):
-                    decompressed = gzip.decompress(compressed)
-                else:
-                    decompressed = brotli.decompress(compressed)
-                if md5(decompressed) != md5(data):
-                    integrity = "FAIL"
-            except Exception as e:
-                integrity = f"ERROR ({str(e)})"
-
-    # Memory usage is captured once per label/level test, which is fine
     mem_kb = get_memory_usage_kb()
-    avg_time_ms = (total_time / RUNS_PER_LEVEL) * 1000
-    avg_user_cpu_ms = (total_user_cpu / RUNS_PER_LEVEL) * 1000
-    avg_sys_cpu_ms = (total_sys_cpu / RUNS_PER_LEVEL) * 1000
+    # mean of the runs left after outlier rejection
+    avg_time_ms = stats.mean * 1000
+    avg_user_cpu_ms = stats.user_cpu_s * 1000
+    avg_sys_cpu_ms = stats.sys_cpu_s * 1000
 
     # Network transfer time estimates (ms)
     network_costs = {
@@ -72,12 +57,13 @@ def compress_and_report(label, data, compress_fn):
 
     return {
         "label": label,
-        "algo": "gzip" if "Gzip" in label else "brotli",
-        "level": int(label.split()[-1]),
+        "algo": codec.name,
+        "level": level,
         "orig_size_bytes": len(data),
         "compressed_bytes": compressed_size,
         "compression_ratio": round(len(data) / compressed_size, 2),
         "avg_wall_time_ms": round(avg_time_ms, 2),
+        **stats.to_ms_columns(),
         "avg_user_cpu_ms": round(avg_user_cpu_ms, 2),
         "avg_sys_cpu_ms": round(avg_sys_cpu_ms, 2),
         "mem_kb": round(mem_kb, 2),
@@ -90,21 +76,102 @@ def compress_and_report(label, data, compress_fn):
         "integrity": integrity
     }
 
+# === Cells ===
+# One cell is one (payload, codec, level) combination. Cells are independent,
+# so the parallel runner can hand them to any worker and sort them back into
+# the serial order afterwards.
+def build_cells(payload_files, codecs):
+    cells = []
+    for input_path in payload_files:
+        for codec in codecs:
+            for level in codec.levels:
+                cells.append((str(input_path), codec.name, level))
+    return cells
+
+# (path, bytes) of the payload this process read last. cells come in payload
+# order, so a worker mostly reads each payload once, and only ever holds one
+_current_payload = (None, None)
+
+def load_payload(input_path):
+    global _current_payload
+    if _current_payload[0] != input_path:
+        _current_payload = (input_path, Path(input_path).read_bytes())
+    return _current_payload[1]
+
+def run_cell(cell, timing=None):
+    # only the codec name travels to the worker, the registry has the functions
+    input_path, codec_name, level = cell
+    data = load_payload(input_path)
+    result = compress_and_report(get_codec(codec_name), level, data, **(timing or {}))
+    result["payload_name"] = Path(input_path).stem # Add payload identifier
+    return result
+
+def print_result(result):
+    print(f"  {result['payload_name']} {result['label']}: Compressed Size={result['compressed_bytes']} bytes, Wall Time={result['avg_wall_time_ms']:.2f} ms")
+
+# === Serial reference run ===
+# Everything in this process one cell after another, the way the numbers
+# were always taken. Use it to calibrate the parallel ones.
+def run_serial(cells, timing=None):
+    results = []
+    for cell in cells:
+        result = run_cell(cell, timing)
+        print_result(result)
+        results.append(result)
+    return results
+
+# === Parallel run ===
+def usable_cores():
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+def pin_worker(core_queue):
+    # every worker takes its own core so two timings never share one
+    core = core_queue.get()
+    if hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, {core})
+
+def run_parallel(cells, workers=None, timing=None):
+    cores = usable_cores()
+    workers = min(workers or len(cores), len(cores))
+    print(f"⚙️  Running {len(cells)} cells on {workers} pinned workers (cores {cores[:workers]})")
+    order = {cell: index for index, cell in enumerate(cells)}
+    results = [None] * len(cells)
+    with multiprocessing.Manager() as manager:
+        core_queue = manager.Queue()
+        for core in cores[:workers]:
+            core_queue.put(core)
+        with ProcessPoolExecutor(max_workers=workers, initializer=pin_worker, initargs=(core_queue,)) as pool:
+            futures = {pool.submit(run_cell, cell, timing): cell for cell in cells}
+            for future in as_completed(futures):
+                result = future.result()
+                print_result(result)
+                results[order[futures[future]]] = result
+    return results
+
 # === Main Run ===
-def main():
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compress every payload with every registered codec at every level.")
+    parser.add_argument("--codec", action="append", help="only this codec, can be given more than once")
+    parser.add_argument("--serial", action="store_true", help="reference mode, every cell in this process one after another")
+    parser.add_argument("--workers", type=int, default=None, help="parallel workers, default one per usable core")
+    parser.add_argument("--payloads", default="payloads", help="directory of .json payloads")
+    parser.add_argument("--dictionary", action="store_true", help="also run the shared-dictionary stage")
+    parser.add_argument("--train-fraction", type=float, default=0.5, help="share of payloads the dictionary is trained on")
+    parser.add_argument("--warmup", type=int, default=WARMUP_RUNS, help="untimed runs before measuring")
+    parser.add_argument("--target-ci", type=float, default=TARGET_REL_CI, help="stop once the 95%% CI half width is this fraction of the mean")
+    parser.add_argument("--max-runs", type=int, default=MAX_RUNS, help="give up on the CI target after this many runs")
+    args = parser.parse_args(argv)
+    timing = {"warmup": args.warmup, "target_rel_ci": args.target_ci, "max_runs": args.max_runs}
+
     # Define the directory where your payload files are located
-    payloads_dir = Path("payloads") # Assuming a 'payloads' folder in the same directory
+    payloads_dir = Path(args.payloads) # Assuming a 'payloads' folder in the same directory
 
     # Define the output prefix for your CSV files
     output_prefix = "compression_compare"
 
-    # Initialize an empty list to store all results from all payloads
-    all_results = []
-
     # Get a list of all JSON files in the payloads directory
-    # We use .rglob("*.json") to find JSON files recursively in subdirectories too
-    # if you organize them that way, or just .glob("*.json") for just the top level.
-    # For now, let's stick with .glob for simplicity based on our folder structure.
     payload_files = sorted(payloads_dir.glob("*.json")) # Sort for consistent order
 
     if not payload_files:
@@ -113,42 +180,11 @@ def main():
 
     print(f"📊 Starting compression analysis for {len(payload_files)} payloads...")
 
-    # Loop through each payload file
-    for input_path in payload_files:
-        payload_name = input_path.stem # Get filename without extension (e.g., "response_small_group")
-        print(f"\nProcessing payload: {payload_name} ({input_path})")
-
-        # Read the payload data
-        try:
-            data = input_path.read_bytes()
-        except Exception as e:
-            print(f"❗ Error reading {input_path}: {e}")
-            continue # Skip to the next payload
-
-        # Temporary list to store results for the current payload
-        current_payload_results = []
-
-        # Run Gzip tests for the current payload
-        for level in GZIP_LEVELS:
-            label = f"Gzip Level {level}"
-            compress_fn = lambda d: gzip.compress(d, compresslevel=level)
-            result = compress_and_report(label, data, compress_fn)
-            result["payload_name"] = payload_name # Add payload identifier
-            current_payload_results.append(result)
-            print(f"  {label}: Compressed Size={result['compressed_bytes']} bytes, Wall Time={result['avg_wall_time_ms']:.2f} ms")
-
-
-        # Run Brotli tests for the current payload
-        for level in BROTLI_LEVELS:
-            label = f"Brotli Level {level}"
-            compress_fn = lambda d: brotli.compress(d, quality=level)
-            result = compress_and_report(label, data, compress_fn)
-            result["payload_name"] = payload_name # Add payload identifier
-            current_payload_results.append(result)
-            print(f"  {label}: Compressed Size={result['compressed_bytes']} bytes, Wall Time={result['avg_wall_time_ms']:.2f} ms")
-
-        # Add results for the current payload to the master list
-        all_results.extend(current_payload_results)
+    cells = build_cells(payload_files, available_codecs(args.codec))
+    if args.serial:
+        all_results = run_serial(cells, timing)
+    else:
+        all_results = run_parallel(cells, args.workers, timing)
 
     # Write all results to a single CSV file
     timestamp = datetime.now().isoformat(timespec="seconds").replace(":", "-")
@@ -170,5 +206,31 @@ def main():
 
     print(f"\n✅ All results for all payloads written to: {output_file}")
 
+    if args.dictionary:
+        dictionary_stage(payload_files, args.train_fraction, timestamp)
+
+# === Shared-dictionary stage ===
+def write_csv(path, rows):
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=rows[0].keys())
+        writer.writeheader()
+        writer.writerows(rows)
+
+def dictionary_stage(payload_files, train_fraction, timestamp):
+    if len(payload_files) < 2:
+        print("🛑 The dictionary stage needs at least two payloads, one to train on and one to test.")
+        return
+    train_files, test_files = split_corpus(payload_files, train_fraction)
+    print(f"\n📚 Training dictionaries on {[p.stem for p in train_files]}, testing on {[p.stem for p in test_files]}")
+    rows = run_dictionary_stage({p.stem: p.read_bytes() for p in train_files},
+                                {p.stem: p.read_bytes() for p in test_files})
+    summary = summarize_by_bucket(rows)
+    for row in summary:
+        print(f"  {row['algo']} {row['size_bucket']}: ratio gain {row['mean_ratio_gain_pct']:.2f}%, CPU gain {row['mean_cpu_gain_pct']:.2f}% over {row['payloads']} payloads")
+
+    write_csv(f"compression_dictionary_{timestamp}.csv", rows)
+    write_csv(f"compression_dictionary_buckets_{timestamp}.csv", summary)
+    print(f"✅ Dictionary results written to: compression_dictionary_{timestamp}.csv and compression_dictionary_buckets_{timestamp}.csv")
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,122 @@
+"""
+Streaming / chunked compression benchmark.
+
+The one-shot numbers in compression_local_test.py assume the whole
+response is buffered before compressing. A streamed GraphQL response is
+fed to the compressor a chunk at a time and flushed so the client gets
+bytes early, every flush costs some time and some ratio. stream_and_report
+measures that against a one-shot compress of the same data:
+
+  ttfb_ms              start until the first compressed bytes come out
+  avg_flush_ms         time per flush() call
+  flush_overhead_bytes extra output per flush compared with one-shot
+  ratio_loss_pct       how much bigger the streamed output is
+  peak_mem_kb          tracemalloc peak for one streamed run, C allocations
+                       that bypass Python's allocator (brotli) don't show
+
+Streamed runs are timed by compression_timing.measure like the one-shot
+ones, so the rows get the same warmup, adaptive run count and
+CI / percentile columns.
+"""
+import time
+import tracemalloc
+
+from compression_timing import measure
+
+DEFAULT_CHUNK_SIZES = [1024, 4096, 16384, 65536]
+
+
+def stream_once(codec, level, data, chunk_size, flush_every=1):
+    """
+    One streamed compress. Returns (output, ttfb_s, total_s, flushes,
+    flush_s), ttfb_s is None if nothing came out before finish().
+    """
+    stream = codec.stream(level)
+    out = []
+    ttfb = None
+    flushes = 0
+    flush_time = 0.0
+    start = time.perf_counter()
+    for index, offset in enumerate(range(0, len(data), chunk_size), 1):
+        piece = stream.compress(data[offset:offset + chunk_size])
+        if index % flush_every == 0:
+            flush_start = time.perf_counter()
+            piece += stream.flush()
+            flush_time += time.perf_counter() - flush_start
+            flushes += 1
+        if piece:
+            if ttfb is None:
+                ttfb = time.perf_counter() - start
+            out.append(piece)
+    out.append(stream.finish())
+    total = time.perf_counter() - start
+    if ttfb is None:
+        ttfb = total
+    return b"".join(out), ttfb, total, flushes, flush_time
+
+
+def stream_and_report(codec, level, data, chunk_size, flush_every=1, **timing):
+    # timing goes to compression_timing.measure: warmup, min_runs, max_runs, target_rel_ci
+    if codec.stream is None:
+        raise ValueError(f"{codec.name} can't flush mid stream")
+
+    oneshot_size = len(codec.compress(data, level))
+    streamed = []
+
+    def one_stream():
+        run = stream_once(codec, level, data, chunk_size, flush_every)
+        streamed.append(run)
+        return run
+
+    stats = measure(one_stream, **timing)
+    # the first ones were warmup
+    timed = streamed[-stats.runs:]
+    output, _, _, flushes, _ = stats.result
+    runs = len(timed)
+    total_ttfb = sum(run[1] for run in timed)
+    total_flush = sum(run[4] for run in timed)
+
+    integrity = "PASS"
+    try:
+        if codec.decompress(output) != data:
+            integrity = "FAIL"
+    except Exception as e:
+        integrity = f"ERROR ({str(e)})"
+
+    # if the caller is already tracing, leave their peak alone and report how
+    # far this run pushed it (a lower bound, 0 if it stayed under their peak)
+    started_tracing = not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+        peak_before = 0
+    else:
+        peak_before = tracemalloc.get_traced_memory()[1]
+    try:
+        stream_once(codec, level, data, chunk_size, flush_every)
+        peak = tracemalloc.get_traced_memory()[1] - peak_before
+    finally:
+        if started_tracing:
+            tracemalloc.stop()
+
+    streamed_size = len(output)
+    return {
+        "label": f"{codec.label} Level {level}",
+        "algo": codec.name,
+        "level": level,
+        "chunk_size": chunk_size,
+        "flush_every": flush_every,
+        "orig_size_bytes": len(data),
+        "oneshot_bytes": oneshot_size,
+        "streamed_bytes": streamed_size,
+        "oneshot_ratio": round(len(data) / oneshot_size, 2),
+        "streamed_ratio": round(len(data) / streamed_size, 2),
+        "ratio_loss_pct": round((streamed_size - oneshot_size) / oneshot_size * 100, 2),
+        "flushes": flushes,
+        "flush_overhead_bytes": round((streamed_size - oneshot_size) / flushes, 2) if flushes else 0,
+        "avg_flush_ms": round(total_flush / max(flushes * runs, 1) * 1000, 4),
+        "ttfb_ms": round(total_ttfb / runs * 1000, 3),
+        "avg_wall_time_ms": round(stats.mean * 1000, 2),
+        **stats.to_ms_columns(),
+        "peak_mem_kb": round(peak / 1024, 2),
+        "integrity": integrity,
+    }
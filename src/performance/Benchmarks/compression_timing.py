@@ -0,0 +1,137 @@
+"""
+Timing with error bars for the compression benchmarks.
+
+measure() runs a few untimed warmup calls, then keeps timing until the 95%
+confidence interval of the mean is within target_rel_ci of the mean (or it
+hits max_runs / max_seconds). Outliers are dropped with the MAD rule (a
+modified z-score over 3.5, Iglewicz and Hoaglin) before anything is
+computed, so one descheduled run doesn't drag the mean. Besides the mean
+it reports stddev, the CI bounds and p50/p90/p99.
+"""
+import math
+import resource
+import statistics
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, List, Optional, Sequence
+
+WARMUP_RUNS = 3
+MIN_RUNS = 10
+MAX_RUNS = 200
+# stop once the 95% CI half width is within this fraction of the mean
+TARGET_REL_CI = 0.05
+MAD_THRESHOLD = 3.5
+
+# two sided 95% t values by degrees of freedom, 1.96 past the table
+_T95 = [12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+        2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+        2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042]
+
+
+def t95(df: int) -> float:
+    if df < 1:
+        return float("inf")
+    return _T95[df - 1] if df <= len(_T95) else 1.96
+
+
+def percentile(sorted_values: Sequence[float], q: float) -> float:
+    """Linear interpolation between closest ranks, q in [0, 100]."""
+    if not sorted_values:
+        return float("nan")
+    position = (len(sorted_values) - 1) * q / 100
+    low = math.floor(position)
+    high = min(low + 1, len(sorted_values) - 1)
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (position - low)
+
+
+def reject_outliers(values: Sequence[float], threshold: float = MAD_THRESHOLD) -> List[float]:
+    """Drops values whose modified z-score is over threshold. Keeps everything if MAD is 0."""
+    if len(values) < 3:
+        return list(values)
+    median = statistics.median(values)
+    mad = statistics.median(abs(v - median) for v in values)
+    if mad == 0:
+        return list(values)
+    return [v for v in values if 0.6745 * abs(v - median) / mad <= threshold]
+
+
+@dataclass
+class TimingStats:
+    # seconds per call, after outlier rejection
+    samples: List[float] = field(default_factory=list)
+    runs: int = 0
+    outliers_rejected: int = 0
+    user_cpu_s: float = 0.0
+    sys_cpu_s: float = 0.0
+    # whatever the last timed call returned
+    result: Any = None
+
+    @property
+    def mean(self) -> float:
+        return statistics.fmean(self.samples)
+
+    @property
+    def stddev(self) -> float:
+        return statistics.stdev(self.samples) if len(self.samples) > 1 else 0.0
+
+    @property
+    def ci_half_width(self) -> float:
+        if len(self.samples) < 2:
+            return float("inf")
+        return t95(len(self.samples) - 1) * self.stddev / math.sqrt(len(self.samples))
+
+    @property
+    def relative_ci(self) -> float:
+        return self.ci_half_width / self.mean if self.mean else float("inf")
+
+    def percentile(self, q: float) -> float:
+        return percentile(sorted(self.samples), q)
+
+    def to_ms_columns(self) -> dict:
+        """The CSV columns both benchmark scripts add, in ms."""
+        return {
+            "stddev_ms": round(self.stddev * 1000, 4),
+            "ci95_low_ms": round((self.mean - self.ci_half_width) * 1000, 4),
+            "ci95_high_ms": round((self.mean + self.ci_half_width) * 1000, 4),
+            "p50_ms": round(self.percentile(50) * 1000, 4),
+            "p90_ms": round(self.percentile(90) * 1000, 4),
+            "p99_ms": round(self.percentile(99) * 1000, 4),
+            "runs": self.runs,
+            "outliers_rejected": self.outliers_rejected,
+        }
+
+
+def measure(fn: Callable[[], Any], warmup: int = WARMUP_RUNS, min_runs: int = MIN_RUNS,
+            max_runs: int = MAX_RUNS, target_rel_ci: float = TARGET_REL_CI,
+            max_seconds: Optional[float] = None) -> TimingStats:
+    for _ in range(warmup):
+        fn()
+
+    raw: List[float] = []
+    stats = TimingStats()
+    deadline = None if max_seconds is None else time.perf_counter() + max_seconds
+    while len(raw) < max_runs:
+        ru_start = resource.getrusage(resource.RUSAGE_SELF)
+        start = time.perf_counter()
+        stats.result = fn()
+        end = time.perf_counter()
+        ru_end = resource.getrusage(resource.RUSAGE_SELF)
+        raw.append(end - start)
+        stats.user_cpu_s += ru_end.ru_utime - ru_start.ru_utime
+        stats.sys_cpu_s += ru_end.ru_stime - ru_start.ru_stime
+
+        if len(raw) < min_runs:
+            continue
+        stats.samples = reject_outliers(raw)
+        if stats.relative_ci <= target_rel_ci:
+            break
+        if deadline is not None and end >= deadline:
+            break
+
+    stats.samples = reject_outliers(raw)
+    stats.runs = len(raw)
+    stats.outliers_rejected = len(raw) - len(stats.samples)
+    # per call averages
+    stats.user_cpu_s /= len(raw)
+    stats.sys_cpu_s /= len(raw)
+    return stats
@@ -0,0 +1,309 @@
+"""
+Benchmarks for the puzzle solvers.
+
+Every solver variant (the legacy recursive scripts, the SearchProblem
+engines and the special purpose ones) is run over a sweep of sizes, jug
+capacities for the water jug solvers and N/M/k for the cannibals ones.
+Each run records wall time (best of --repeat), nodes expanded where the
+solver counts them and peak traced memory (from a separate run, since
+tracemalloc slows everything down), all written to JSON.
+
+Pass --baseline to compare against an earlier JSON file. Node counts are
+deterministic so any increase is a regression, time and memory are flagged
+past --tolerance. The exit code is 1 when something regressed, so this can
+gate a solver change. Timings only compare on the same machine, regenerate
+the baseline with --out when moving to a new one.
+
+    python -m src.performance.solver_benchmarks --quick --out bench.json
+    python -m src.performance.solver_benchmarks --baseline src/performance/solver_baseline.json
+"""
+import argparse
+import contextlib
+import gc
+import io
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from src.algo import cannibals_missionaries as cannibals_v1
+from src.algo import cannibals_missionaries_v2 as cannibals_v2
+from src.algo import water_jug_problem as legacy_jugs
+from src.algo.missionaries_cannibals_problem import MissionariesCannibalsProblem
+from src.algo.multi_jug_problem import MultiJugProblem
+from src.algo.water_jug_closed_form import solve_closed_form
+from src.algo.water_jug_problem import WaterJugProblem
+from src.algo.water_jug_tables import ReachabilityTable
+from src.core.anytime_search import anytime_astar
+from src.core.external_search import external_bfs
+from src.core.search import (astar, bfs, bidirectional_bfs, dfs, greedy_best_first, iterative_deepening,
+                             mirror_bfs, packed_bfs, symmetry_reduced_bfs)
+
+# (cap1, cap2, goal), goal 1 needs the longest chain of pours
+JUG_SIZES = [(3, 5, 4), (31, 97, 1), (301, 997, 1), (3001, 9973, 1)]
+# (missionaries, cannibals, boat seats)
+CANNIBAL_SIZES = [(3, 3, 2), (20, 20, 4), (100, 100, 6), (300, 300, 8)]
+# extra jugs for the N-jug problem
+MULTI_JUG_SIZES = [(3, 5, 8), (7, 11, 13), (7, 11, 13, 17), (13, 17, 19, 23)]
+QUICK_SIZES = 2
+
+# generous, best-of-N timings on a shared box still swing by a third
+DEFAULT_TOLERANCE = 0.5
+# differences below these are noise whatever the tolerance says
+TIME_SLACK_S = 0.005
+MEMORY_SLACK_BYTES = 64 * 1024
+
+
+@dataclass
+class Measurement:
+    suite: str
+    solver: str
+    size: str
+    wall_time_s: float
+    nodes_expanded: Optional[int]
+    memory_peak_bytes: int
+    found: Optional[bool]
+    depth: Optional[int]
+
+    @property
+    def key(self) -> Tuple[str, str, str]:
+        return self.suite, self.solver, self.size
+
+
+@dataclass
+class Case:
+    suite: str
+    solver: str
+    # sizes past this index are too slow for the solver and are skipped
+    max_size: int
+    run: Callable[[tuple], object]
+
+
+def _quiet(run: Callable[[tuple], object]) -> Callable[[tuple], object]:
+    # the legacy scripts print their answers, keep that out of the timings
+    def wrapper(params):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return run(params)
+    return wrapper
+
+
+def _legacy_jugs(params):
+    cap1, cap2, goal = params
+    trace, legacy_jugs.TRACE = legacy_jugs.TRACE, False
+    try:
+        return legacy_jugs.solve(0, 0, cap1, cap2, goal, [])
+    finally:
+        legacy_jugs.TRACE = trace
+
+
+def _cannibals_v1(params):
+    missionaries, cannibals, _ = params
+    cannibals_v1.solve(cannibals_v1.Side(missionaries, cannibals), cannibals_v1.Side(0, 0), [],
+                       cannibals_v1.BoatSide.LEFT)
+
+
+def _cannibals_v2(params):
+    missionaries, cannibals, seats = params
+    trace, capacity = cannibals_v2.TRACE, cannibals_v2.max_capacity
+    cannibals_v2.TRACE, cannibals_v2.max_capacity = False, seats
+    try:
+        cannibals_v2.solve(cannibals_v2.GameState(
+            left=cannibals_v2.Side(cannibals=cannibals, missionaries=missionaries),
+            right=cannibals_v2.Side(0, 0), boat_side=cannibals_v2.BoatSide.LEFT,
+            total_cannibals=cannibals, total_missionaries=missionaries))
+    finally:
+        cannibals_v2.TRACE, cannibals_v2.max_capacity = trace, capacity
+
+
+def _vectorized(params):
+    from src.algo.cannibals_vectorized import solve_vectorized
+    return solve_vectorized(*params)
+
+
+def _goal_index(params):
+    from src.core.state_graph import GoalIndex, compile_graph
+    cap1, cap2, goal = params
+    graph = compile_graph(WaterJugProblem(cap1, cap2, None))
+    return GoalIndex.where(graph, lambda levels: (levels == goal).any(axis=1)).path(0)
+
+
+def _engine(solver, make_problem, *args):
+    return lambda params: solver(make_problem(params), *args)
+
+
+def _jugs(params):
+    return WaterJugProblem(*params)
+
+
+def _cannibals(params):
+    return MissionariesCannibalsProblem(*params)
+
+
+def _packed(make_problem):
+    def run(params):
+        problem = make_problem(params)
+        return packed_bfs(problem, problem.codec())
+    return run
+
+
+def build_cases() -> List[Case]:
+    cases = [
+        Case("water_jug", "legacy_recursive", 1, _quiet(_legacy_jugs)),
+        Case("water_jug", "closed_form", 3, lambda params: solve_closed_form(*params)),
+        Case("water_jug", "reachability_table", 3, lambda params: ReachabilityTable.build(*params[:2]).solve(params[2])),
+        Case("water_jug", "state_graph_goal_index", 3, _goal_index),
+        Case("cannibals", "legacy_v1", 0, _quiet(_cannibals_v1)),
+        Case("cannibals", "legacy_v2", 0, _quiet(_cannibals_v2)),
+        Case("cannibals", "vectorized", 3, _vectorized),
+        Case("cannibals", "bidirectional_bfs", 3, _engine(bidirectional_bfs, _cannibals)),
+        Case("cannibals", "mirror_bfs", 3, _engine(mirror_bfs, _cannibals)),
+        Case("multi_jug", "bfs", 3, _engine(bfs, lambda params: MultiJugProblem(params, -1))),
+        Case("multi_jug", "packed_bfs", 3, _packed(lambda params: MultiJugProblem(params, -1))),
+    ]
+    # the generic engines run on both puzzles
+    for suite, make_problem in [("water_jug", _jugs), ("cannibals", _cannibals)]:
+        cases += [
+            Case(suite, "bfs", 3, _engine(bfs, make_problem)),
+            Case(suite, "dfs", 3, _engine(dfs, make_problem)),
+            Case(suite, "iterative_deepening", 1, _engine(iterative_deepening, make_problem)),
+            Case(suite, "astar", 3, _engine(astar, make_problem)),
+            Case(suite, "greedy_best_first", 3, _engine(greedy_best_first, make_problem)),
+            Case(suite, "symmetry_reduced_bfs", 3, _engine(symmetry_reduced_bfs, make_problem)),
+            Case(suite, "packed_bfs", 3, _packed(make_problem)),
+            Case(suite, "external_bfs", 2, _engine(external_bfs, make_problem)),
+            Case(suite, "anytime_astar", 3, _engine(anytime_astar, make_problem)),
+        ]
+    return cases
+
+
+SIZES = {"water_jug": JUG_SIZES, "cannibals": CANNIBAL_SIZES, "multi_jug": MULTI_JUG_SIZES}
+
+
+def _size_label(params: tuple) -> str:
+    return "x".join(str(p) for p in params)
+
+
+def measure(case: Case, params: tuple, repeat: int = 3) -> Measurement:
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        # like timeit, a collection landing in one run but not another is noise
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            result = case.run(params)
+            best = min(best, time.perf_counter() - start)
+        finally:
+            gc.enable()
+
+    started_tracing = not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    try:
+        case.run(params)
+        memory_peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        if started_tracing:
+            tracemalloc.stop()
+
+    # legacy solvers return a bool or nothing, the rest a result object
+    found = getattr(result, "found", result if isinstance(result, bool) else None)
+    depth = getattr(result, "depth", None) if found else None
+    if depth is None and found and getattr(result, "crossings", None) is not None:
+        depth = result.crossings
+    return Measurement(case.suite, case.solver, _size_label(params), best,
+                       getattr(result, "nodes_expanded", None), memory_peak, found, depth)
+
+
+def run_suite(quick: bool = False, repeat: int = 3, solvers: Optional[Sequence[str]] = None,
+              progress=None) -> Iterator[Measurement]:
+    for case in build_cases():
+        if solvers and case.solver not in solvers:
+            continue
+        sizes = SIZES[case.suite][:case.max_size + 1]
+        if quick:
+            sizes = sizes[:QUICK_SIZES]
+        for params in sizes:
+            try:
+                measurement = measure(case, params, repeat)
+            except ImportError as exc:
+                # numpy backed solvers are optional
+                if progress is not None:
+                    progress.write(f"skip {case.suite}/{case.solver}: {exc}\n")
+                break
+            if progress is not None:
+                progress.write(f"{case.suite:10} {case.solver:24} {measurement.size:14} "
+                               f"{measurement.wall_time_s * 1000:10.2f} ms\n")
+            yield measurement
+
+
+def to_json(measurements: Sequence[Measurement]) -> dict:
+    return {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": [asdict(m) for m in measurements],
+    }
+
+
+def find_regressions(current: Sequence[Measurement], baseline: dict,
+                     tolerance: float = DEFAULT_TOLERANCE) -> List[str]:
+    """One line per metric that got worse than the baseline JSON allows."""
+    previous: Dict[Tuple[str, str, str], dict] = {
+        (r["suite"], r["solver"], r["size"]): r for r in baseline.get("results", [])}
+    problems = []
+    for m in current:
+        old = previous.get(m.key)
+        if old is None:
+            continue
+        name = "/".join(m.key)
+        if m.nodes_expanded is not None and old.get("nodes_expanded") is not None \
+                and m.nodes_expanded > old["nodes_expanded"]:
+            problems.append(f"{name}: nodes_expanded {old['nodes_expanded']} -> {m.nodes_expanded}")
+        if old.get("found") is not None and m.found != old["found"]:
+            problems.append(f"{name}: found {old['found']} -> {m.found}")
+        if m.depth is not None and old.get("depth") is not None and m.depth > old["depth"]:
+            problems.append(f"{name}: depth {old['depth']} -> {m.depth}")
+        if m.wall_time_s > max(old["wall_time_s"] * (1 + tolerance), old["wall_time_s"] + TIME_SLACK_S):
+            problems.append(f"{name}: wall_time_s {old['wall_time_s']:.4f} -> {m.wall_time_s:.4f}")
+        if m.memory_peak_bytes > max(old["memory_peak_bytes"] * (1 + tolerance),
+                                     old["memory_peak_bytes"] + MEMORY_SLACK_BYTES):
+            problems.append(f"{name}: memory_peak_bytes {old['memory_peak_bytes']} -> {m.memory_peak_bytes}")
+    return problems
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Time every puzzle solver over a sweep of sizes.")
+    parser.add_argument("--quick", action="store_true", help=f"only the first {QUICK_SIZES} sizes of each sweep")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per size, the best one is kept")
+    parser.add_argument("--solver", action="append", help="only this solver, can be given more than once")
+    parser.add_argument("--out", help="write results JSON here")
+    parser.add_argument("--baseline", help="results JSON to check for regressions against")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="allowed fractional slowdown / memory growth")
+    args = parser.parse_args(argv)
+
+    measurements = list(run_suite(args.quick, args.repeat, args.solver, progress=sys.stderr))
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(to_json(measurements), f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            problems = find_regressions(measurements, json.load(f), args.tolerance)
+        for line in problems:
+            print(f"REGRESSION {line}")
+        if problems:
+            return 1
+        print("no regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,65 @@
+from src.algo.missionaries_cannibals_problem import MissionariesCannibalsProblem
+from src.algo.water_jug_problem import WaterJugProblem
+from src.core.anytime_search import CHECK_EVERY, MEMORY, NODES, TIME, Checkpoint, SearchBudget, anytime_astar
+from src.core.search import astar
+
+
+def test_unbounded_matches_astar():
+    problem = MissionariesCannibalsProblem(20, 20, 4)
+    result = anytime_astar(problem)
+    assert result.complete and result.checkpoint is None
+    assert result.depth == astar(problem).depth
+
+
+def test_node_budget_returns_best_partial():
+    problem = MissionariesCannibalsProblem(50, 50, 4)
+    result = anytime_astar(problem, SearchBudget(max_nodes=10))
+    assert result.exhausted == NODES
+    assert not result.found
+    assert result.partial_states[0] == problem.initial_state()
+    assert result.best_heuristic < problem.heuristic(problem.initial_state())
+    assert result.best_heuristic == problem.heuristic(result.partial_states[-1])
+    for prev, action, nxt in zip(result.partial_states, result.partial_actions, result.partial_states[1:]):
+        assert (nxt, action) in problem.successors(prev)
+
+
+def test_resume_from_serialized_checkpoint(tmp_path):
+    problem = MissionariesCannibalsProblem(50, 50, 4)
+    expected = astar(problem)
+    result = anytime_astar(problem, SearchBudget(max_nodes=7))
+    rounds = 1
+    while not result.complete:
+        path = tmp_path / "checkpoint.bin"
+        result.checkpoint.save(str(path))
+        result = anytime_astar(problem, SearchBudget(max_nodes=7), Checkpoint.load(str(path)))
+        rounds += 1
+    assert rounds > 2
+    assert result.depth == expected.depth
+    # resuming doesn't redo work, the total matches one uninterrupted run
+    assert result.nodes_expanded == anytime_astar(problem).nodes_expanded
+
+
+def test_time_budget():
+    result = anytime_astar(WaterJugProblem(2999, 4001, 1), SearchBudget(max_seconds=0))
+    assert result.exhausted == TIME
+    assert result.checkpoint is not None
+
+
+def test_no_solution_is_complete():
+    result = anytime_astar(WaterJugProblem(2, 4, 3))
+    assert result.complete and not result.found
+
+
+def test_memory_budget_counts_a_resumed_checkpoint(tmp_path):
+    # goal -1 is never reached, the search only stops on a budget
+    problem = WaterJugProblem(2999, 4001, -1)
+    first = anytime_astar(problem, SearchBudget(max_nodes=5000))
+    size = first.checkpoint.memory_bytes()
+    assert size > anytime_astar(problem, SearchBudget(max_nodes=500)).checkpoint.memory_bytes()
+
+    path = tmp_path / "checkpoint.bin"
+    first.checkpoint.save(str(path))
+    # already over budget when loaded, so it stops at the first check
+    resumed = anytime_astar(problem, SearchBudget(max_memory_bytes=size // 2), Checkpoint.load(str(path)))
+    assert resumed.exhausted == MEMORY
+    assert resumed.nodes_expanded == first.nodes_expanded + CHECK_EVERY
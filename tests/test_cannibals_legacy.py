@@ -0,0 +1,54 @@
+from src.algo import cannibals_missionaries as v1
+from src.algo import cannibals_missionaries_v2 as v2
+
+
+def test_v1_move_leaves_inputs_alone():
+    left, right = v1.Side(missionaries=3, cannibals=3), v1.Side(missionaries=0, cannibals=0)
+    new_left, new_right, side = v1.move(left, right, 1, 1, v1.BoatSide.LEFT, [])
+    assert (new_left, new_right, side) == (v1.Side(2, 2), v1.Side(1, 1), v1.BoatSide.RIGHT)
+    assert left == v1.Side(3, 3) and right == v1.Side(0, 0)
+
+
+def test_v2_moves_share_the_path():
+    start = v2.GameState(left=v2.Side(cannibals=3, missionaries=3),
+                         right=v2.Side(cannibals=0, missionaries=0),
+                         boat_side=v2.BoatSide.LEFT,
+                         total_cannibals=3,
+                         total_missionaries=3)
+    first = v2.move(start, v2.BoatContents(cannibals=1, missionaries=1))
+    second = v2.move(first, v2.BoatContents(cannibals=0, missionaries=1))
+
+    assert start.path == []
+    assert first.left == v2.Side(cannibals=2, missionaries=2)
+    assert second.right == v2.Side(cannibals=1, missionaries=0)
+    # the child links to the parent's node instead of copying it
+    assert second.path_node.parent is first.path_node
+    assert second.path == [first.path_node.step, second.path_node.step]
+
+
+def test_v2_detects_cycles():
+    start = v2.GameState(left=v2.Side(3, 3), right=v2.Side(0, 0), boat_side=v2.BoatSide.LEFT,
+                         total_cannibals=3, total_missionaries=3)
+    there = v2.move(start, v2.BoatContents(cannibals=1, missionaries=1))
+    back = v2.move(there, v2.BoatContents(cannibals=1, missionaries=1))
+    again = v2.move(back, v2.BoatContents(cannibals=1, missionaries=1))
+    assert again.has_more is False
+
+
+def test_v2_on_path_set_is_popped_on_backtrack(capsys, monkeypatch):
+    monkeypatch.setattr(v2, "TRACE", False)
+    start = v2.GameState(left=v2.Side(3, 3), right=v2.Side(0, 0), boat_side=v2.BoatSide.LEFT,
+                         total_cannibals=3, total_missionaries=3)
+    on_path = set()
+    v2.solve(start, on_path)
+    assert on_path == set()
+    # v2 never puts the starting state on the path, so it also reports the
+    # solutions that pass back through it, same 9 as before the set
+    assert capsys.readouterr().out.count("SOLUTION FOUND") == 9
+
+
+def test_v1_seen_set_matches_path(capsys):
+    path, seen = [], set()
+    v1.solve(v1.Side(3, 3), v1.Side(0, 0), path, v1.BoatSide.LEFT, seen)
+    assert seen == set(path)
+    assert "Found result" in capsys.readouterr().out
@@ -0,0 +1,31 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.algo.cannibals_vectorized import boat_loads, solve_vectorized, sweep
+from src.algo.missionaries_cannibals_problem import MissionariesCannibalsProblem
+from src.core.search import bfs
+
+
+def test_classic_puzzle():
+    result = solve_vectorized(3, 3, 2)
+    assert result.crossings == 11
+    assert result.states[0] == (3, 3, 0)
+    assert result.states[-1] == (0, 0, 1)
+
+
+def test_boat_loads():
+    assert sorted(map(tuple, boat_loads(2))) == [(0, 1), (0, 2), (1, 0), (1, 1), (2, 0)]
+
+
+def test_matches_scalar_bfs():
+    for n, m, k, crossings in sweep(range(1, 8), range(1, 8), range(1, 4)):
+        expected = bfs(MissionariesCannibalsProblem(n, m, k))
+        assert crossings == (expected.depth if expected.found else None), (n, m, k)
+
+
+def test_path_is_legal():
+    problem = MissionariesCannibalsProblem(40, 40, 5)
+    result = solve_vectorized(40, 40, 5)
+    for prev, nxt in zip(result.states, result.states[1:]):
+        assert nxt in [state for state, _ in problem.successors(prev)]
@@ -0,0 +1,30 @@
+import pytest
+
+from src.performance.Benchmarks.compression_codecs import CODECS, available_codecs, get_codec
+
+DATA = b'{"data": {"feed": [' + b", ".join(b'{"id": %d, "name": "group %d"}' % (i, i % 7) for i in range(500)) + b"]}}"
+
+
+def test_every_codec_round_trips_at_its_end_levels():
+    for codec in available_codecs():
+        for level in (codec.levels[0], codec.levels[-1]):
+            assert codec.decompress(codec.compress(DATA, level)) == DATA, codec.name
+
+
+def test_streams_decode_after_every_flush():
+    for codec in available_codecs():
+        if codec.stream is None:
+            continue
+        stream = codec.stream(codec.levels[0])
+        out = b""
+        for i in range(0, len(DATA), 1000):
+            out += stream.compress(DATA[i:i + 1000]) + stream.flush()
+        out += stream.finish()
+        assert codec.decompress(out) == DATA, codec.name
+
+
+def test_registry_always_has_the_stdlib_codecs():
+    assert {"gzip", "deflate", "lzma", "bz2"} <= set(CODECS)
+    assert [c.name for c in available_codecs(["bz2", "gzip"])] == ["bz2", "gzip"]
+    with pytest.raises(KeyError):
+        get_codec("snappy")
@@ -0,0 +1,42 @@
+import json
+import os
+import sys
+
+# the benchmark scripts import their siblings by plain name, like when run from that folder
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src", "performance", "Benchmarks"))
+
+from compression_dictionary import (run_dictionary_stage, size_bucket, split_corpus, summarize_by_bucket,
+                                    train_zlib_dict)
+
+
+def _payload(seed, items):
+    return json.dumps({"data": {"feedGroupNestedClients": [
+        {"clientId": seed * 1000 + i, "displayName": f"client {i}", "groupMembershipStatus": "ACTIVE",
+         "lastInteractionTimestamp": 1700000000 + i * seed} for i in range(items)]}}).encode()
+
+
+def test_dictionary_helps_small_payloads():
+    train = {f"t{i}": _payload(i, 200) for i in range(4)}
+    held_out = {"small": _payload(9, 3), "large": _payload(11, 2000)}
+    rows = run_dictionary_stage(train, held_out, runs=1)
+    by_name = {row["payload_name"]: row for row in rows if row["algo"] == "deflate"}
+    assert all(row["integrity"] == "PASS" for row in rows)
+    assert by_name["small"]["dict_bytes"] < by_name["small"]["plain_bytes"]
+    assert by_name["small"]["ratio_gain_pct"] > by_name["large"]["ratio_gain_pct"]
+
+    summary = summarize_by_bucket(rows)
+    assert [row["size_bucket"] for row in summary if row["algo"] == "deflate"] == ["<4KB", "64-256KB"]
+
+
+def test_zlib_dict_stays_within_the_window():
+    dictionary = train_zlib_dict([_payload(i, 500) for i in range(3)])
+    assert 0 < len(dictionary) <= 32 * 1024
+    assert b'"groupMembershipStatus":' in dictionary
+
+
+def test_split_and_buckets():
+    train, held_out = split_corpus([f"p{i}" for i in range(6)], 0.5)
+    assert len(train) == len(held_out) == 3 and not set(train) & set(held_out)
+    # something is always held out
+    assert len(split_corpus(["a", "b"], 0.99)[1]) == 1
+    assert size_bucket(100) == "<4KB" and size_bucket(10 ** 6) == ">=256KB"
@@ -0,0 +1,61 @@
+import dataclasses
+import os
+import sys
+import tracemalloc
+
+# the benchmark scripts import their siblings by plain name, like when run from that folder
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src", "performance", "Benchmarks"))
+
+from compression_codecs import get_codec
+from compression_streaming import stream_and_report, stream_once
+
+DATA = b"".join(b'{"id": %d, "title": "item %d", "tags": ["a", "b"]},' % (i, i * 7 % 13) for i in range(2000))
+
+
+def test_stream_output_decodes_and_counts_flushes():
+    codec = get_codec("gzip")
+    output, ttfb, total, flushes, _ = stream_once(codec, 6, DATA, 4096, flush_every=2)
+    assert codec.decompress(output) == DATA
+    chunks = -(-len(DATA) // 4096)
+    assert flushes == chunks // 2
+    assert 0 < ttfb <= total
+
+
+def test_small_chunks_cost_ratio():
+    codec = get_codec("deflate")
+    small = stream_and_report(codec, 6, DATA, 512, warmup=0, min_runs=2, max_runs=2)
+    large = stream_and_report(codec, 6, DATA, len(DATA), warmup=0, min_runs=2, max_runs=2)
+    assert small["integrity"] == large["integrity"] == "PASS"
+    assert small["flushes"] > large["flushes"]
+    assert small["ratio_loss_pct"] > large["ratio_loss_pct"] >= 0
+    assert small["peak_mem_kb"] > 0
+
+
+def test_stream_rows_get_timing_columns():
+    calls = []
+    codec = get_codec("gzip")
+    counted = dataclasses.replace(codec, stream=lambda level: calls.append(level) or codec.stream(level))
+    row = stream_and_report(counted, 6, DATA, 4096, warmup=3, min_runs=5, max_runs=50, target_rel_ci=1.0)
+    assert row["integrity"] == "PASS"
+    assert 5 <= row["runs"] <= 50
+    # warmup streams run but aren't timed, the last one is the tracemalloc run
+    assert len(calls) == 3 + row["runs"] + 1
+    # avg_wall_time_ms is rounded to 2 places, the bounds to 4
+    assert row["ci95_low_ms"] - 0.005 <= row["avg_wall_time_ms"] <= row["ci95_high_ms"] + 0.005
+    assert row["p50_ms"] <= row["p99_ms"]
+    assert row["ttfb_ms"] > 0
+
+
+def test_caller_tracemalloc_peak_survives():
+    tracemalloc.start()
+    try:
+        big = bytearray(8 * 1024 * 1024)
+        del big
+        caller_peak = tracemalloc.get_traced_memory()[1]
+        row = stream_and_report(get_codec("gzip"), 6, DATA, 4096, warmup=0, min_runs=2, max_runs=2)
+        assert tracemalloc.is_tracing()
+        assert tracemalloc.get_traced_memory()[1] >= caller_peak
+        # the stream stays well under the 8MB the caller already hit
+        assert row["peak_mem_kb"] == 0
+    finally:
+        tracemalloc.stop()
@@ -0,0 +1,49 @@
+import itertools
+
+from src.performance.Benchmarks.compression_timing import TimingStats, measure, percentile, reject_outliers
+
+
+def test_percentile_interpolates():
+    values = [1.0, 2.0, 3.0, 4.0, 5.0]
+    assert percentile(values, 0) == 1.0
+    assert percentile(values, 50) == 3.0
+    assert percentile(values, 90) == 4.6
+    assert percentile(values, 100) == 5.0
+    assert percentile([7.0], 99) == 7.0
+
+
+def test_mad_drops_the_spike_only():
+    values = [1.0, 1.1, 0.9, 1.05, 0.95, 1.0, 50.0]
+    assert reject_outliers(values) == values[:-1]
+    # all equal, MAD is 0, nothing to judge by
+    assert reject_outliers([2.0] * 5) == [2.0] * 5
+
+
+def test_stats_columns():
+    stats = TimingStats(samples=[0.001, 0.002, 0.003], runs=4, outliers_rejected=1)
+    columns = stats.to_ms_columns()
+    assert columns["p50_ms"] == 2.0
+    assert columns["ci95_low_ms"] < 2.0 < columns["ci95_high_ms"]
+    assert columns["stddev_ms"] == 1.0
+    assert (columns["runs"], columns["outliers_rejected"]) == (4, 1)
+
+
+def test_measure_warms_up_and_stops_at_the_target():
+    calls = itertools.count()
+
+    def work():
+        next(calls)
+        return sum(range(2000))
+
+    stats = measure(work, warmup=2, min_runs=5, max_runs=500, target_rel_ci=1.0)
+    assert stats.result == sum(range(2000))
+    assert next(calls) == 2 + stats.runs
+    assert 5 <= stats.runs < 500
+    assert stats.relative_ci <= 1.0
+    assert len(stats.samples) + stats.outliers_rejected == stats.runs
+
+
+def test_measure_gives_up_at_max_runs():
+    # a target of 0 can never be met
+    stats = measure(lambda: None, warmup=0, min_runs=3, max_runs=12, target_rel_ci=0.0)
+    assert stats.runs == 12
@@ -0,0 +1,269 @@
+import gc
+import weakref
+
+import pytest
+
+from src.algo.libs.decorator import (COW, FROZEN, REGISTRY, ReadOnlyError, fast_copy, pass_by_value, read_only,
+                                    register_copier)
+
+
+class Box:
+    def __init__(self, items, inner=None):
+        self.items = items
+        self.inner = inner
+
+
+class Stack:
+    def __init__(self, items):
+        self.items = items
+
+    def push(self, item):
+        self.items.append(item)
+
+    @read_only
+    def top(self):
+        return self.items[-1]
+
+
+def mutate(box):
+    box.items.append("modified")
+    return box.items
+
+
+@pytest.mark.parametrize("strategy", ["deepcopy", REGISTRY, COW])
+def test_caller_is_unchanged(strategy):
+    func = pass_by_value(strategy=strategy)(mutate)
+    original = Box([1, 2, 3])
+    assert func(original) == [1, 2, 3, "modified"]
+    assert original.items == [1, 2, 3]
+    assert func.copy_stats.calls == 1
+    assert func.copy_stats.copies == 1
+    # byte counting is opt in
+    assert func.copy_stats.bytes_copied == 0
+
+    counted = pass_by_value(strategy=strategy, count_bytes=True)(mutate)
+    counted(original)
+    assert counted.copy_stats.bytes_copied > 0
+
+
+def test_bare_decorator_still_works():
+    @pass_by_value
+    def append(my_list):
+        my_list.append("modified")
+        return my_list
+
+    original = [1, 2, 3]
+    assert append(original) == [1, 2, 3, "modified"]
+    assert original == [1, 2, 3]
+
+
+def test_cow_only_copies_on_write():
+    @pass_by_value(strategy=COW)
+    def read(box):
+        return len(box.items) + box.inner.items[0]
+
+    original = Box([1, 2], inner=Box([10]))
+    assert read(original) == 12
+    assert read.copy_stats.copies == 0
+
+    @pass_by_value(strategy=COW)
+    def nested_write(box):
+        box.inner.items[0] = 99
+        box.items += [3]
+        return box.inner.items[0], len(box.items)
+
+    assert nested_write(original) == (99, 3)
+    assert original.inner.items == [10] and original.items == [1, 2]
+    assert nested_write.copy_stats.copies == 1
+
+
+def test_frozen_raises_on_mutation():
+    func = pass_by_value(strategy=FROZEN)(mutate)
+    original = Box([1])
+    with pytest.raises(ReadOnlyError):
+        func(original)
+    assert original.items == [1]
+
+    @pass_by_value(strategy=FROZEN)
+    def read(box):
+        return box.items[0]
+
+    assert read(original) == 1
+
+
+def test_registry_uses_registered_copier():
+    calls = []
+
+    def copy_box(box, memo):
+        calls.append(box)
+        return Box(fast_copy(box.items, memo))
+
+    register_copier(Box, copy_box)
+    func = pass_by_value(strategy=REGISTRY)(mutate)
+    original = Box([1])
+    func(original)
+    assert calls == [original]
+    assert original.items == [1]
+
+
+def test_immutable_args_are_not_copied():
+    func = pass_by_value(lambda a, b: a + b)
+    assert func(1, b=2) == 3
+    assert func.copy_stats.copies == 0
+
+
+def test_unknown_strategy():
+    with pytest.raises(ValueError):
+        pass_by_value(strategy="nope")
+
+
+def test_unknown_methods_count_as_writes():
+    original = Stack([1])
+
+    @pass_by_value(strategy=FROZEN)
+    def push_frozen(stack):
+        stack.push(5)
+
+    with pytest.raises(ReadOnlyError):
+        push_frozen(original)
+    assert original.items == [1]
+
+    @pass_by_value(strategy=COW)
+    def push_cow(stack):
+        stack.push(5)
+        return stack.top()
+
+    assert push_cow(original) == 5
+    assert original.items == [1]
+    assert push_cow.copy_stats.copies == 1
+
+    @pass_by_value(strategy=FROZEN)
+    def peek(stack):
+        return stack.top(), stack.items.count(1), stack.items.index(1)
+
+    assert peek(original) == (1, 1, 0)
+
+
+def test_operators_match_the_plain_object():
+    @pass_by_value(strategy=COW)
+    def ops(items, tags):
+        before = (items + [9], [0] + items, items * 2, tags | {"b"}, items < [2], bool(items))
+        tags |= {"c"}
+        items *= 2
+        return before, sorted(tags), list(items)
+
+    items, tags = [1], {"a"}
+    assert ops(items, tags) == (([1, 9], [0, 1], [1, 1], {"a", "b"}, True, True), ["a", "c"], [1, 1])
+    assert tags == {"a"} and items == [1]
+
+    @pass_by_value(strategy=FROZEN)
+    def key(value):
+        return hash(value)
+
+    box = Box([1])
+    assert key(box) == hash(box)
+    with pytest.raises(TypeError):
+        key([1])
+
+
+def test_deepcopy_memo_is_per_call():
+    @pass_by_value
+    def alias(a, b):
+        a.items.append(2)
+        return b.items, weakref.ref(a)
+
+    shared = Box([1])
+    items, copy_ref = alias(shared, shared)
+    assert items == [1, 2] and shared.items == [1]
+    # the copy isn't kept alive by the decorator once the call is over
+    gc.collect()
+    assert copy_ref() is None
+
+
+@pytest.mark.parametrize("strategy", [FROZEN, COW])
+def test_read_only_methods_dont_leak_nested_objects(strategy):
+    def through_get(d):
+        d.get("a").append(99)
+
+    def through_values(d):
+        for value in d.values():
+            value.append(99)
+
+    def through_items(d):
+        for _, value in d.items():
+            value.append(99)
+
+    def through_copy(d):
+        d["a"].copy()
+        d.copy()["a"].append(99)
+
+    def through_list_copy(d):
+        d["nested"].copy()[0].append(99)
+
+    for func in [through_get, through_values, through_items, through_copy, through_list_copy]:
+        original = {"a": [1, 2], "nested": [[3]]}
+        wrapped = pass_by_value(strategy=strategy)(func)
+        if strategy == FROZEN:
+            with pytest.raises(ReadOnlyError):
+                wrapped(original)
+        else:
+            wrapped(original)
+        assert original == {"a": [1, 2], "nested": [[3]]}, func.__name__
+
+
+def test_cow_get_reads_its_own_writes():
+    @pass_by_value(strategy=COW)
+    def add(d):
+        d.get("a").append(3)
+        return d["a"], d.get("missing", "default"), sorted(d.get("a")), d["a"].count(3)
+
+    original = {"a": [1, 2]}
+    assert add(original) == ([1, 2, 3], "default", [1, 2, 3], 1)
+    assert original == {"a": [1, 2]}
+
+
+def test_read_only_user_method_results_are_proxied():
+    class Holder:
+        def __init__(self):
+            self.items = [[1]]
+
+        @read_only
+        def first(self):
+            return self.items[0]
+
+    @pass_by_value(strategy=FROZEN)
+    def poke(holder):
+        holder.first().append(2)
+
+    original = Holder()
+    with pytest.raises(ReadOnlyError):
+        poke(original)
+    assert original.items == [[1]]
+
+
+def test_fast_copy_keeps_shared_and_self_references():
+    loop = [1]
+    loop.append(loop)
+    copied = fast_copy(loop)
+    assert copied is not loop and copied[1] is copied
+
+    table = {"self": None}
+    table["self"] = table
+    copied_table = fast_copy(table)
+    assert copied_table is not table and copied_table["self"] is copied_table
+
+    shared = [1, 2]
+    pair = fast_copy([shared, shared, {"again": shared}])
+    assert pair[0] is pair[1] is pair[2]["again"]
+    assert pair[0] is not shared
+
+
+def test_registry_keeps_aliasing_between_arguments():
+    @pass_by_value(strategy=REGISTRY)
+    def alias(a, b):
+        a.append(3)
+        return b, a is b
+
+    shared = [1, 2]
+    assert alias(shared, shared) == ([1, 2, 3], True)
+    assert shared == [1, 2]
@@ -0,0 +1,101 @@
+import random
+import tracemalloc
+from array import array
+
+from src.algo.missionaries_cannibals_problem import MissionariesCannibalsProblem
+from src.algo.water_jug_problem import WaterJugProblem
+from src.core import external_search
+from src.core.external_search import Layer, MmapBitmap, external_bfs
+from src.core.search import bfs
+
+
+def test_mmap_bitmap(tmp_path):
+    bitmap = MmapBitmap(str(tmp_path / "bits"), 1000)
+    assert bitmap.add(999)
+    assert not bitmap.add(999)
+    assert 999 in bitmap and 998 not in bitmap
+    bitmap.close()
+
+
+def test_matches_bfs_with_tiny_budget(tmp_path):
+    for problem in [WaterJugProblem(3, 5, 4), WaterJugProblem(37, 91, 5), WaterJugProblem(2, 4, 3),
+                    MissionariesCannibalsProblem(), MissionariesCannibalsProblem(50, 50, 5)]:
+        expected = bfs(problem)
+        # 16 bytes of budget = two codes per run, forces lots of spilling
+        result = external_bfs(problem, memory_budget=16, work_dir=str(tmp_path))
+        assert result.found == expected.found
+        assert result.depth == expected.depth
+        if result.found:
+            assert result.states[0] == problem.initial_state()
+            assert problem.is_goal(result.states[-1])
+            for prev, action, nxt in zip(result.states, result.actions, result.states[1:]):
+                assert (nxt, action) in problem.successors(prev)
+        assert result.runs_spilled >= result.layers
+    # temp files are cleaned up
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_spills_more_with_smaller_budget(tmp_path):
+    problem = WaterJugProblem(301, 997, 1)
+    small = external_bfs(problem, memory_budget=8, work_dir=str(tmp_path))
+    large = external_bfs(problem, work_dir=str(tmp_path))
+    assert small.depth == large.depth
+    assert small.runs_spilled > large.runs_spilled
+
+
+def test_layer_merges_with_bounded_fan_in(tmp_path, monkeypatch):
+    rng = random.Random(0)
+    codes = rng.sample(range(10 ** 6), 2000)
+    runs = []
+    for i in range(0, len(codes), 7):
+        path = str(tmp_path / f"run_{i:06d}.bin")
+        with open(path, "wb") as f:
+            array("Q", sorted(codes[i:i + 7])).tofile(f)
+        runs.append(path)
+
+    open_runs = [0]
+    peak = [0]
+    read_run = external_search._read_run
+
+    def counting_read(path):
+        open_runs[0] += 1
+        peak[0] = max(peak[0], open_runs[0])
+        try:
+            yield from read_run(path)
+        finally:
+            open_runs[0] -= 1
+
+    monkeypatch.setattr(external_search, "_read_run", counting_read)
+    layer = Layer(runs, len(codes), fan_in=4)
+    assert list(layer.codes()) == sorted(codes)
+    assert peak[0] <= 4
+    assert len(layer.runs) <= 4
+    # merged runs replaced the originals, reading again gives the same layer
+    assert list(layer.codes()) == sorted(codes)
+    assert len(list(tmp_path.iterdir())) == len(layer.runs)
+
+
+def test_spill_stays_within_the_budget(tmp_path):
+    budget = 800_000
+    writer = external_search.LayerWriter(str(tmp_path), 0, budget // external_search.BYTES_PER_CODE)
+    rng = random.Random(1)
+    for _ in range(writer.max_buffered - 1):
+        writer.add(rng.getrandbits(48))
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        layer = writer.close()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    # the buffer itself is already counted in before
+    assert peak - before < budget
+    codes = list(layer.codes())
+    assert codes == sorted(codes) and len(codes) == writer.max_buffered - 1
+
+
+def test_spills_without_numpy(tmp_path, monkeypatch):
+    monkeypatch.setattr(external_search, "np", None)
+    problem = WaterJugProblem(37, 91, 5)
+    result = external_bfs(problem, memory_budget=64, work_dir=str(tmp_path))
+    assert result.depth == bfs(problem).depth
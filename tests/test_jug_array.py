@@ -0,0 +1,45 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.algo.jug import Jug
+from src.algo.jug_array import JugArray, random_policy
+from src.algo.water_jug_problem import WaterJugProblem
+from src.core.search import bfs
+
+
+def test_bulk_ops_match_jug():
+    big, small = JugArray.of(4, 4), JugArray.of(4, 3)
+    big.fill(np.array([True, True, False, True]))
+    small.fill([3])
+    moved = big.pour_into(small)
+    assert big.levels.tolist() == [1, 1, 0, 4]
+    assert small.levels.tolist() == [3, 3, 0, 3]
+    assert moved.tolist() == [3, 3, 0, 0]
+
+    jug4, jug3 = Jug(4), Jug(3)
+    jug4.fill()
+    jug4.pour_into(jug3)
+    assert (jug4.current, jug3.current) == (big.levels[0], small.levels[0])
+
+    small.empty()
+    assert not small.levels.any()
+
+
+def test_pour_within_one_array():
+    jugs = JugArray([8, 5, 3, 7], levels=[8, 0, 0, 7])
+    assert jugs.pour([0, 3], [1, 2]).tolist() == [5, 3]
+    assert jugs.levels.tolist() == [3, 5, 3, 4]
+    with pytest.raises(ValueError):
+        jugs.pour([0, 1], [1, 2])
+    with pytest.raises(ValueError):
+        JugArray([3], levels=[4])
+
+
+def test_random_policy_never_beats_bfs():
+    hits = random_policy(3, 5, 4, runs=20000, max_steps=60, rng=np.random.default_rng(1))
+    solved = hits[hits >= 0]
+    assert len(solved)
+    assert solved.min() >= bfs(WaterJugProblem(3, 5, 4)).depth
+    # 3 litres is never in a jug with 4 and 6 litre jugs
+    assert (random_policy(4, 6, 3, runs=1000, max_steps=50) == -1).all()
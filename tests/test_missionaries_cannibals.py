@@ -0,0 +1,81 @@
+from src.algo.missionaries_cannibals_problem import LEFT, MissionariesCannibalsProblem, RIGHT
+from src.algo.water_jug_problem import WaterJugProblem
+from src.core.search import astar, bfs, bidirectional_bfs, greedy_best_first
+
+
+def test_classic_puzzle():
+    result = bfs(MissionariesCannibalsProblem())
+    assert result.depth == 11
+    assert result.states[-1] == (0, 0, RIGHT)
+
+
+def test_boat_loads_include_two_people():
+    assert (1, 1) in MissionariesCannibalsProblem().loads
+    assert (0, 2) in MissionariesCannibalsProblem().loads
+
+
+def test_unsolvable():
+    # 4/4 with a two seat boat has no solution
+    assert not bfs(MissionariesCannibalsProblem(4, 4, 2)).found
+
+
+def test_astar_is_optimal_and_expands_less():
+    for n, k in [(3, 2), (5, 3), (20, 4)]:
+        problem = MissionariesCannibalsProblem(n, n, k)
+        plain = bfs(problem)
+        informed = astar(problem)
+        assert informed.depth == plain.depth
+        assert informed.cost == plain.depth
+        assert informed.nodes_expanded <= plain.nodes_expanded + 1
+
+
+def test_heuristic_is_admissible():
+    problem = MissionariesCannibalsProblem(10, 10, 4)
+    for state in [(10, 10, 0), (6, 6, 1), (2, 2, 0), (0, 1, 1)]:
+        sub = MissionariesCannibalsProblem(10, 10, 4)
+        sub.initial_state = lambda state=state: state
+        remaining = bfs(sub)
+        if remaining.found:
+            assert problem.heuristic(state) <= remaining.depth
+
+
+def test_water_jug_astar():
+    assert astar(WaterJugProblem(3, 5, 4)).depth == bfs(WaterJugProblem(3, 5, 4)).depth
+    assert greedy_best_first(WaterJugProblem(3, 5, 4)).found
+
+
+def test_bidirectional_matches_bfs():
+    for n, k in [(3, 2), (4, 2), (5, 3), (20, 4), (50, 5)]:
+        problem = MissionariesCannibalsProblem(n, n, k)
+        plain = bfs(problem)
+        both = bidirectional_bfs(problem)
+        assert both.found == plain.found
+        assert both.depth == plain.depth
+        if both.found:
+            assert both.states[0] == problem.initial_state()
+            assert problem.is_goal(both.states[-1])
+            for prev, action, nxt in zip(both.states, both.actions, both.states[1:]):
+                assert (nxt, action) in problem.successors(prev)
+        assert both.forward_frontier_peak >= 1
+        assert both.backward_frontier_peak >= 1
+
+
+def test_bidirectional_matches_bfs_with_uneven_banks():
+    for m, c, k in [(4, 5, 4), (5, 4, 3), (2, 6, 3), (6, 2, 2), (7, 3, 4)]:
+        problem = MissionariesCannibalsProblem(m, c, k)
+        plain = bfs(problem)
+        both = bidirectional_bfs(problem)
+        assert both.found == plain.found
+        assert both.depth == plain.depth
+        for prev, action, nxt in zip(both.states, both.actions, both.states[1:]):
+            assert (nxt, action) in problem.successors(prev)
+
+
+def test_unsafe_goal_and_start_have_no_fake_moves():
+    problem = MissionariesCannibalsProblem(4, 5, 4)
+    assert problem.goal_states() == []
+    # the start has 4 missionaries with 5 cannibals, nothing leads back to it
+    assert problem.predecessors(problem.initial_state()) == []
+    for state in [(2, 2, RIGHT), (4, 1, RIGHT), (0, 3, LEFT)]:
+        for prev, load in problem.predecessors(state):
+            assert (state, load) in problem.successors(prev)
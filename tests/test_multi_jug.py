@@ -0,0 +1,46 @@
+from src.algo.multi_jug_problem import MultiJugProblem, solve_multi_jug
+from src.algo.water_jug_problem import WaterJugProblem
+from src.core.external_search import external_bfs
+from src.core.search import astar, bfs, packed_bfs, symmetry_reduced_bfs
+
+
+def test_two_jugs_match_water_jug_problem():
+    for goal in range(13):
+        multi = solve_multi_jug((7, 11), goal)
+        expected = bfs(WaterJugProblem(7, 11, goal))
+        assert multi.found == expected.found
+        assert multi.depth == expected.depth
+
+
+def test_successors_match_tuple_moves():
+    problem = MultiJugProblem((3, 5, 8), None)
+    state = problem.state_of((2, 5, 1))
+    moves = {action: problem.levels(next_state) for next_state, action in problem.successors(state)}
+    # jug 2 is full, so no fill 2 and nothing pours into it
+    assert moves == {
+        "fill 1": (3, 5, 1), "empty 1": (0, 5, 1), "pour 1->3": (0, 5, 3),
+        "empty 2": (2, 0, 1), "pour 2->1": (3, 4, 1), "pour 2->3": (2, 0, 6),
+        "fill 3": (2, 5, 8), "empty 3": (2, 5, 0), "pour 3->1": (3, 5, 0),
+    }
+
+
+def test_every_solver_agrees():
+    problem = MultiJugProblem((3, 5, 8), 4)
+    depth = bfs(problem).depth
+    assert astar(problem).depth == depth
+    assert packed_bfs(problem, problem.codec()).depth == depth
+    assert external_bfs(problem).depth == depth
+    assert symmetry_reduced_bfs(problem).depth == depth
+
+
+def test_large_capacities():
+    result = solve_multi_jug((1000, 1001, 1002, 1003), 999)
+    assert result.found
+    assert 999 in result.states[-1]
+
+
+def test_equal_jugs_share_a_canonical_state():
+    problem = MultiJugProblem((4, 4, 9), None)
+    assert problem.canonical_state(problem.state_of((1, 3, 2))) == problem.canonical_state(problem.state_of((3, 1, 2)))
+    full = bfs(MultiJugProblem((4, 4, 9), -1)).visited_count
+    assert symmetry_reduced_bfs(MultiJugProblem((4, 4, 9), -1)).visited_count < full
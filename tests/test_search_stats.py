@@ -0,0 +1,60 @@
+import json
+
+from src.algo.missionaries_cannibals_problem import MissionariesCannibalsProblem
+from src.algo.water_jug_problem import WaterJugProblem
+from src.core.search import astar, bfs, bidirectional_bfs, dfs, mirror_bfs, packed_bfs, symmetry_reduced_bfs
+from src.core.search_stats import SearchObserver, profile_search
+
+
+def test_counters_without_instrumentation():
+    result = bfs(WaterJugProblem(3, 5, 4))
+    assert result.stats is None
+    assert result.frontier_peak >= 1
+    assert result.visited_count > result.depth
+    assert result.duplicates_pruned > 0
+    assert result.nodes_generated >= result.duplicates_pruned
+
+
+def test_profile_search_fills_stats(tmp_path):
+    result = profile_search(astar, MissionariesCannibalsProblem(20, 20, 4))
+    stats = result.stats
+    assert stats.solver == "astar"
+    assert stats.found and stats.depth == result.depth
+    assert stats.successor_calls == result.nodes_expanded
+    assert stats.goal_tests > 0
+    assert stats.successor_time_s > 0
+    assert stats.memory_peak_bytes > 0
+
+    assert json.loads(stats.to_json())["nodes_expanded"] == result.nodes_expanded
+    stats.dump(tmp_path / "stats.json")
+    assert json.loads((tmp_path / "stats.json").read_text())["visited_peak"] == result.visited_count
+
+
+def test_profile_passes_extra_args_through():
+    problem = WaterJugProblem(3, 5, 4)
+    result = profile_search(packed_bfs, problem, problem.codec(), track_memory=False)
+    assert result.found
+    assert result.stats.memory_peak_bytes is None
+    assert profile_search(bidirectional_bfs, MissionariesCannibalsProblem()).depth == 11
+
+
+def test_observer_and_trace(capsys):
+    seen = []
+
+    class Recorder(SearchObserver):
+        def on_expand(self, state):
+            seen.append(state)
+
+    result = profile_search(dfs, WaterJugProblem(4, 3, 2), observer=Recorder())
+    assert len(seen) == result.nodes_expanded
+
+    profile_search(bfs, WaterJugProblem(3, 5, 4), trace=True)
+    assert "visiting (0, 0)" in capsys.readouterr().out
+
+
+def test_profile_keeps_symmetry_hooks():
+    reduced = profile_search(symmetry_reduced_bfs, WaterJugProblem(6, 6, 3))
+    assert reduced.symmetric_pruned == symmetry_reduced_bfs(WaterJugProblem(6, 6, 3)).symmetric_pruned > 0
+    mirrored = profile_search(mirror_bfs, MissionariesCannibalsProblem())
+    assert mirrored.depth == 11
+    assert mirrored.stats.successor_calls > 0
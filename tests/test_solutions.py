@@ -0,0 +1,55 @@
+from src.algo.missionaries_cannibals_problem import MissionariesCannibalsProblem
+from src.algo.water_jug_problem import WaterJugProblem
+from src.core.search import bfs
+from src.core.solutions import iter_solutions
+
+
+class CountingJugs(WaterJugProblem):
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.expanded = 0
+
+    def successors(self, state):
+        self.expanded += 1
+        return super().successors(state)
+
+
+def _is_path(problem, result):
+    assert problem.is_goal(result.states[-1])
+    assert len({problem.hashable_state(s) for s in result.states}) == len(result.states)
+    for state, action, next_state in zip(result.states, result.actions, result.states[1:]):
+        assert (next_state, action) in problem.successors(state)
+    return True
+
+
+def test_every_cannibals_solution():
+    problem = MissionariesCannibalsProblem()
+    solutions = list(iter_solutions(problem))
+    # the classic puzzle has exactly four 11 crossing solutions and no longer simple ones
+    assert [s.depth for s in solutions] == [11] * 4
+    assert len({tuple(s.actions) for s in solutions}) == 4
+    assert all(_is_path(problem, s) for s in solutions)
+
+
+def test_shortest_first_and_limits():
+    problem = WaterJugProblem(3, 5, 4)
+    depths = [s.depth for s in iter_solutions(problem, shortest_first=True)]
+    assert depths == sorted(depths)
+    assert depths[0] == bfs(problem).depth
+    assert len(depths) == len(list(iter_solutions(problem)))
+    assert all(s.depth <= 8 for s in iter_solutions(problem, max_length=8))
+    assert len(list(iter_solutions(problem, max_count=3))) == 3
+
+
+def test_stopping_early_stops_the_search():
+    problem = CountingJugs(7, 11, 6)
+    first = next(iter_solutions(problem))
+    assert _is_path(problem, first)
+    after_first = problem.expanded
+    for _ in iter_solutions(problem, max_count=50):
+        pass
+    assert after_first < problem.expanded
+
+
+def test_start_is_goal():
+    assert [s.states for s in iter_solutions(WaterJugProblem(3, 5, 0))] == [[(0, 0)]]
@@ -0,0 +1,50 @@
+import json
+import os
+
+from src.performance import solver_benchmarks as bench
+
+
+def test_quick_sweep_records_every_metric():
+    results = list(bench.run_suite(quick=True, repeat=1, solvers=["bfs", "legacy_v1"]))
+    suites = {(m.suite, m.solver) for m in results}
+    assert suites == {("water_jug", "bfs"), ("cannibals", "bfs"), ("multi_jug", "bfs"), ("cannibals", "legacy_v1")}
+    for m in results:
+        assert m.wall_time_s > 0
+        assert m.memory_peak_bytes > 0
+        if m.solver == "bfs":
+            assert m.nodes_expanded > 0
+    json.dumps(bench.to_json(results))
+
+
+def test_regressions_are_flagged():
+    results = list(bench.run_suite(quick=True, repeat=1, solvers=["astar"]))
+    baseline = bench.to_json(results)
+    assert bench.find_regressions(results, baseline) == []
+
+    worse = baseline["results"][0]
+    worse["nodes_expanded"] -= 1
+    worse["wall_time_s"] /= 1000
+    problems = bench.find_regressions(results, baseline)
+    assert any("nodes_expanded" in p for p in problems)
+    name = "/".join((worse["suite"], worse["solver"], worse["size"]))
+    assert all(p.startswith(name) for p in problems)
+
+
+BASELINE = os.path.join(os.path.dirname(bench.__file__), "solver_baseline.json")
+
+
+def test_stored_baseline_covers_every_case():
+    with open(BASELINE) as f:
+        stored = {(r["suite"], r["solver"]) for r in json.load(f)["results"]}
+    assert {(case.suite, case.solver) for case in bench.build_cases()} <= stored
+
+
+def test_stored_baseline_matches_the_solvers():
+    # timings are machine dependent, but what the solvers find and how much
+    # they expand isn't. a change there means the baseline needs regenerating
+    with open(BASELINE) as f:
+        stored = {(r["suite"], r["solver"], r["size"]): r for r in json.load(f)["results"]}
+    for m in bench.run_suite(quick=True, repeat=1):
+        expected = stored[(m.suite, m.solver, m.size)]
+        for field in ("found", "depth", "nodes_expanded"):
+            assert getattr(m, field) == expected[field], (m.suite, m.solver, m.size, field)
@@ -0,0 +1,41 @@
+from src.algo.missionaries_cannibals_problem import MissionariesCannibalsProblem
+from src.algo.water_jug_problem import WaterJugProblem
+from src.core.search import bfs, packed_bfs
+from src.core.state_codec import BitmapVisited, BitPackedCodec, CannibalsCodec, JugCodec
+
+
+def test_round_trip():
+    codec = BitPackedCodec([5, 1000, 1])
+    for state in [(0, 0, 0), (5, 1000, 1), (3, 17, 0)]:
+        assert codec.decode(codec.encode(state)) == state
+    assert codec.bits == 3 + 10 + 1
+
+
+def test_codes_are_unique_and_in_range():
+    codec = JugCodec(7, 11)
+    codes = {codec.encode((x, y)) for x in range(8) for y in range(12)}
+    assert len(codes) == 8 * 12
+    assert max(codes) < codec.size
+
+
+def test_scaled_bitmaps_stay_small():
+    assert BitmapVisited(JugCodec(4000, 4000).size).nbytes <= 2 * 1024 * 1024
+    assert BitmapVisited(CannibalsCodec(500, 500).size).nbytes <= 64 * 1024
+
+
+def test_bitmap_visited():
+    visited = BitmapVisited(100)
+    assert visited.add(42)
+    assert not visited.add(42)
+    assert 42 in visited and 41 not in visited
+    assert len(visited) == 1
+
+
+def test_packed_bfs_matches_bfs():
+    for problem in [WaterJugProblem(3, 5, 4), WaterJugProblem(2, 4, 3),
+                    MissionariesCannibalsProblem(), MissionariesCannibalsProblem(30, 30, 4)]:
+        plain = bfs(problem)
+        packed = packed_bfs(problem, problem.codec())
+        assert packed.found == plain.found
+        assert packed.depth == plain.depth
+        assert packed.states == plain.states
@@ -0,0 +1,69 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.algo.missionaries_cannibals_problem import MissionariesCannibalsProblem
+from src.algo.multi_jug_problem import MultiJugProblem
+from src.algo.water_jug_problem import WaterJugProblem
+from src.core.search import bfs
+from src.core.state_graph import GoalIndex, StateGraph, all_pairs_distances, bfs_distances, compile_graph
+
+
+def test_compile_counts_reachable_states():
+    graph = compile_graph(WaterJugProblem(3, 5, None))
+    assert graph.state(0) == (0, 0)
+    assert graph.num_states == bfs(WaterJugProblem(3, 5, -1)).visited_count
+    assert graph.indptr[-1] == graph.num_edges
+
+
+def test_goal_index_matches_bfs_for_every_goal():
+    graph = compile_graph(WaterJugProblem(7, 11, None))
+    for goal in range(13):
+        index = GoalIndex.where(graph, lambda s: (s == goal).any(axis=1))
+        expected = bfs(WaterJugProblem(7, 11, goal))
+        path = index.path(0)
+        assert path.found == expected.found
+        assert path.depth == expected.depth
+        problem = WaterJugProblem(7, 11, goal)
+        for prev, action, nxt in zip(path.states, path.actions, path.states[1:]):
+            assert (nxt, action) in problem.successors(prev)
+
+
+def test_forward_distances_and_all_pairs():
+    problem = MissionariesCannibalsProblem(10, 10, 4)
+    graph = compile_graph(problem)
+    distance, _ = bfs_distances(graph, [0])
+    pairs = all_pairs_distances(graph)
+    assert (pairs[0] == distance).all()
+    assert (np.diag(pairs) == 0).all()
+    goal = graph.node_of(problem.codec().encode((0, 0, 1)))
+    assert pairs[0, goal] == bfs(problem).depth
+
+
+def test_save_and_load(tmp_path):
+    problem = MissionariesCannibalsProblem(5, 5, 3)
+    graph = compile_graph(problem)
+    graph.save(str(tmp_path / "graph.npz"))
+    loaded = StateGraph.load(str(tmp_path / "graph.npz"))
+    assert (loaded.codes == graph.codes).all()
+    index = GoalIndex.for_problem(loaded, problem)
+    assert index.path(0).depth == bfs(problem).depth
+    assert index.path(0).actions[0] in {str(a) for a in graph.action_labels}
+
+
+def test_packed_int_states_come_back_as_ints(tmp_path):
+    problem = MultiJugProblem([3, 5, 8], 4)
+    graph = compile_graph(problem)
+    assert graph.state(0) == problem.initial_state() == 0
+    index = GoalIndex.for_problem(graph, problem)
+    path = index.path(0)
+    expected = bfs(problem)
+    assert path.depth == expected.depth
+    assert problem.is_goal(path.states[-1])
+    for prev, action, nxt in zip(path.states, path.actions, path.states[1:]):
+        assert (nxt, action) in problem.successors(prev)
+
+    # a loaded graph has no codec of its own, for_problem uses the problem's
+    graph.save(str(tmp_path / "jugs.npz"))
+    loaded = StateGraph.load(str(tmp_path / "jugs.npz"))
+    assert (GoalIndex.for_problem(loaded, problem).distance == index.distance).all()
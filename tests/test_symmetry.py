@@ -0,0 +1,88 @@
+from src.algo.missionaries_cannibals_problem import MissionariesCannibalsProblem
+from src.algo.water_jug_problem import WaterJugProblem
+from src.algo.water_jug_tables import TableCache
+from src.core.search import bfs, mirror_bfs, symmetry_reduced_bfs
+
+
+def assert_legal(problem, result):
+    assert result.states[0] == problem.initial_state()
+    assert problem.is_goal(result.states[-1])
+    for prev, action, nxt in zip(result.states, result.actions, result.states[1:]):
+        assert (nxt, action) in problem.successors(prev)
+
+
+def test_equal_jugs_are_deduped():
+    for cap, goal in [(5, 5), (6, 3), (9, 0)]:
+        problem = WaterJugProblem(cap, cap, goal)
+        plain = bfs(problem)
+        reduced = symmetry_reduced_bfs(problem)
+        assert reduced.found == plain.found
+        assert reduced.depth == plain.depth
+        if reduced.found:
+            assert_legal(problem, reduced)
+    assert symmetry_reduced_bfs(WaterJugProblem(6, 6, 3)).symmetric_pruned > 0
+
+
+def test_canonical_defaults_to_identity():
+    problem = WaterJugProblem(3, 5, 4)
+    assert symmetry_reduced_bfs(problem).depth == bfs(problem).depth
+    assert symmetry_reduced_bfs(problem).symmetric_pruned == 0
+
+
+def test_mirror_bfs_matches_bfs():
+    for n, m, k in [(3, 3, 2), (4, 4, 2), (5, 5, 3), (6, 4, 2), (20, 20, 4), (60, 60, 5)]:
+        problem = MissionariesCannibalsProblem(n, m, k)
+        plain = bfs(problem)
+        mirrored = mirror_bfs(problem)
+        assert mirrored.found == plain.found, (n, m, k)
+        assert mirrored.depth == plain.depth, (n, m, k)
+        if mirrored.found:
+            assert_legal(problem, mirrored)
+
+
+def test_mirror_bfs_with_an_unsafe_start():
+    # missionaries already outnumbered on the start bank means the goal bank
+    # is unsafe too. that's known before searching, it used to die with
+    # StopIteration half way through
+    for m, c, k in [(4, 5, 4), (2, 3, 2), (3, 5, 3), (1, 4, 4)]:
+        problem = MissionariesCannibalsProblem(m, c, k)
+        mirrored = mirror_bfs(problem)
+        assert not mirrored.found and not bfs(problem).found
+        assert mirrored.nodes_expanded == 0
+
+
+def test_mirror_bfs_with_uneven_but_safe_banks():
+    for m, c, k in [(5, 4, 3), (6, 2, 2), (7, 3, 4)]:
+        problem = MissionariesCannibalsProblem(m, c, k)
+        plain = bfs(problem)
+        mirrored = mirror_bfs(problem)
+        assert (mirrored.found, mirrored.depth) == (plain.found, plain.depth), (m, c, k)
+        if mirrored.found:
+            assert_legal(problem, mirrored)
+
+
+class UnlistedGoals(MissionariesCannibalsProblem):
+    def goal_states(self):
+        raise NotImplementedError
+
+
+def test_mirror_bfs_falls_back_without_goal_states():
+    problem = UnlistedGoals(4, 5, 4)
+    mirrored = mirror_bfs(problem)
+    assert not mirrored.found
+    # the mirror search gave up on a mirrored step and a plain bfs answered
+    assert mirrored.nodes_expanded > bfs(problem).nodes_expanded
+
+
+def test_mirror_bfs_explores_less():
+    problem = MissionariesCannibalsProblem(100, 100, 6)
+    assert mirror_bfs(problem).nodes_expanded < bfs(problem).nodes_expanded
+
+
+def test_swapped_capacities_share_a_table(tmp_path):
+    cache = TableCache(str(tmp_path))
+    forward = cache.get(3, 5).solve(4)
+    swapped = cache.get(5, 3).solve(4)
+    assert cache.misses == 1
+    assert swapped.depth == forward.depth == bfs(WaterJugProblem(5, 3, 4)).depth
+    assert_legal(WaterJugProblem(5, 3, 4), swapped)
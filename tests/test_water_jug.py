@@ -1,4 +1,33 @@
-# from src.algo.water_jug_problem import solve_water_jug
-#
-# def test_basic(): pass
-#     # assert solve_water_jug(3, 5,4) is not None
+from src.algo.water_jug_problem import WaterJugProblem, solve_water_jug
+from src.core.search import bfs, dfs, iterative_deepening
+
+
+def test_basic():
+    assert solve_water_jug(3, 5, 4) is not None
+
+
+def test_bfs_is_shortest():
+    result = bfs(WaterJugProblem(3, 5, 4))
+    assert result.found
+    assert result.depth == 6
+    assert 4 in result.states[-1]
+    assert len(result.states) == len(result.actions) + 1
+
+
+def test_unreachable():
+    assert solve_water_jug(2, 4, 3) is None
+    assert not dfs(WaterJugProblem(2, 4, 3)).found
+
+
+def test_dfs_finds_a_valid_path():
+    problem = WaterJugProblem(4, 3, 2)
+    result = dfs(problem)
+    assert result.found
+    # every step has to be a legal move from the previous state
+    for prev, action, nxt in zip(result.states, result.actions, result.states[1:]):
+        assert (nxt, action) in problem.successors(prev)
+
+
+def test_iterative_deepening_matches_bfs_depth():
+    for caps in [(3, 5, 4), (4, 3, 2), (7, 11, 6)]:
+        assert iterative_deepening(WaterJugProblem(*caps)).depth == bfs(WaterJugProblem(*caps)).depth
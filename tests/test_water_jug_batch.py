@@ -0,0 +1,76 @@
+import io
+import json
+
+from src.algo.water_jug_batch import main, read_instances, solve_batch, solve_group
+from src.algo.water_jug_problem import WaterJugProblem
+from src.core.search import bfs
+
+
+def test_read_csv_with_and_without_header():
+    plain = list(read_instances(io.StringIO("3,5,4\n2,4,3\n")))
+    headed = list(read_instances(io.StringIO("goal,cap1,cap2\n4,3,5\n\n3,2,4\n")))
+    assert [i[2:] for i in plain] == [(3, 5, 4), (2, 4, 3)]
+    assert [i[2:] for i in headed] == [(3, 5, 4), (2, 4, 3)]
+    assert [i[0] for i in headed] == [0, 1]
+
+
+def test_read_jsonl_keeps_extra_fields():
+    instances = list(read_instances(io.StringIO('{"id": "a", "cap1": 3, "cap2": 5, "goal": 4}\n')))
+    assert instances[0][1]["id"] == "a"
+
+
+def test_ordered_batch_matches_bfs():
+    rows = [(cap1, cap2, goal) for cap1, cap2 in [(3, 5), (4, 3), (6, 9)] for goal in range(7)]
+    instances = [(i, {}, *row) for i, row in enumerate(rows)]
+    answers = list(solve_batch(instances, workers=2, ordered=True))
+    assert len(answers) == len(rows)
+    for row, answer in zip(rows, answers):
+        expected = bfs(WaterJugProblem(*row))
+        assert (answer["cap1"], answer["cap2"], answer["goal"]) == row
+        assert answer["solvable"] == expected.found
+        assert answer["moves"] == (expected.depth if expected.found else None)
+
+
+def test_unordered_in_process():
+    instances = [(0, {}, 3, 5, 4), (1, {}, 4, 3, 2), (2, {}, 3, 5, 1)]
+    answers = list(solve_batch(instances, workers=1))
+    assert sorted(a["goal"] for a in answers) == [1, 2, 4]
+
+
+def test_cli_writes_jsonl():
+    out = io.StringIO()
+    main(["--workers", "1", "--ordered"], stdin=io.StringIO("3,5,4\n2,4,3\n"), stdout=out)
+    lines = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert [line["solvable"] for line in lines] == [True, False]
+    assert lines[0]["moves"] == 6
+
+
+def test_bad_rows_get_error_lines_and_the_rest_is_solved():
+    stdin = io.StringIO(
+        '{"id": "ok", "cap1": 3, "cap2": 5, "goal": 4}\n'
+        '{"id": "broken", "cap1": 3\n'
+        '{"id": "missing", "cap1": 3, "cap2": 5}\n'
+        '{"id": "negative", "cap1": -1, "cap2": 5, "goal": 4}\n'
+        '{"id": "text", "cap1": "x", "cap2": 5, "goal": 4}\n'
+        '{"id": "also ok", "cap1": 5, "cap2": 3, "goal": 4}\n')
+    out = io.StringIO()
+    main(["--workers", "1", "--ordered"], stdin=stdin, stdout=out)
+    lines = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert [line["id"] for line in lines] == ["ok", 1, "missing", "negative", "text", "also ok"]
+    assert [("error" in line) for line in lines] == [False, True, True, True, True, False]
+    assert lines[0]["moves"] == lines[-1]["moves"] == 6
+    assert "capacities can't be negative" in lines[3]["error"]
+
+
+def test_bad_csv_rows_in_a_pool():
+    rows = "cap1,cap2,goal\n3,5,4\n3,five,4\n2,4\n4,3,2\n"
+    answers = list(solve_batch(read_instances(io.StringIO(rows)), workers=2, ordered=True))
+    assert [answer.get("id") for answer in answers] == [None, 1, 2, None]
+    assert answers[0]["solvable"] and answers[3]["solvable"]
+
+
+def test_group_that_fails_to_build_answers_with_errors():
+    answers = solve_group(-1, 5, [(0, {"id": "a"}, -1, 5, 4), (1, {}, 5, -1, 2)])
+    assert [index for index, _ in answers] == [0, 1]
+    assert [answer["id"] for _, answer in answers] == ["a", 1]
+    assert all("error" in answer for _, answer in answers)
@@ -0,0 +1,33 @@
+from src.algo.water_jug_closed_form import cross_check, extended_gcd, is_solvable, min_moves, solve_closed_form
+from src.algo.water_jug_problem import WaterJugProblem
+from src.core.search import astar
+
+
+def test_extended_gcd():
+    for a, b in [(3, 5), (12, 18), (1000003, 2999999), (7, 0)]:
+        g, x, y = extended_gcd(a, b)
+        assert a * x + b * y == g
+
+
+def test_matches_search_for_every_small_instance():
+    for cap1 in range(11):
+        for cap2 in range(11):
+            for goal in range(12):
+                assert cross_check(cap1, cap2, goal), (cap1, cap2, goal)
+
+
+def test_moves_are_legal():
+    problem = WaterJugProblem(7, 11, 6)
+    result = solve_closed_form(7, 11, 6)
+    assert 6 in result.states[-1]
+    for state, action, next_state in zip(result.states, result.actions, result.states[1:]):
+        assert (next_state, action) in problem.successors(state)
+    assert cross_check(7, 11, 6, solver=astar)
+
+
+def test_huge_capacities():
+    assert not is_solvable(2000000, 3000000, 1)
+    assert min_moves(1000003, 2999999, 17) == 800012
+    result = solve_closed_form(100003, 299999, 17)
+    assert result.depth == min_moves(100003, 299999, 17)
+    assert 17 in result.states[-1]
@@ -0,0 +1,55 @@
+import os
+
+from src.algo.water_jug_problem import WaterJugProblem
+from src.algo.water_jug_tables import ReachabilityTable, TableCache, solve_water_jug_cached
+from src.core.search import bfs
+
+
+def test_table_matches_bfs_for_every_goal():
+    for cap1, cap2 in [(3, 5), (4, 3), (6, 9), (7, 11)]:
+        table = ReachabilityTable.build(cap1, cap2)
+        for goal in range(max(cap1, cap2) + 2):
+            expected = bfs(WaterJugProblem(cap1, cap2, goal))
+            result = table.solve(goal)
+            assert result.found == expected.found, (cap1, cap2, goal)
+            assert result.depth == expected.depth
+            assert table.distance_to(goal) == (expected.depth if expected.found else None)
+
+
+def test_path_replays():
+    table = ReachabilityTable.build(7, 11)
+    problem = WaterJugProblem(7, 11, 6)
+    result = table.solve(6)
+    for prev, action, nxt in zip(result.states, result.actions, result.states[1:]):
+        assert (nxt, action) in problem.successors(prev)
+
+
+def test_round_trip_bytes():
+    table = ReachabilityTable.build(5, 8)
+    loaded = ReachabilityTable.from_bytes(table.to_bytes())
+    assert loaded.distance == table.distance
+    assert loaded.solve(4).states == table.solve(4).states
+
+
+def test_disk_cache_and_eviction(tmp_path):
+    cache = TableCache(str(tmp_path), max_files=2, max_in_memory=1)
+    cache.get(3, 5)
+    cache.get(3, 5)
+    assert (cache.misses, cache.hits) == (1, 1)
+
+    cache.get(4, 9)
+    # (3, 5) fell out of memory but is still on disk
+    cache.get(3, 5)
+    assert cache.disk_hits == 1
+
+    cache.get(5, 7)
+    assert len(os.listdir(tmp_path)) == 2
+
+    fresh = TableCache(str(tmp_path))
+    assert fresh.get(5, 7).solve(4).found
+    assert fresh.misses == 0
+
+
+def test_default_cache():
+    assert solve_water_jug_cached(3, 5, 4).depth == 6
+    assert not solve_water_jug_cached(2, 4, 3).found